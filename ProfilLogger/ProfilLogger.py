@@ -1,52 +1,719 @@
+import abc
+import asyncio
+import atexit
+import collections
+import concurrent.futures
 import inspect
 import datetime
+import functools
 import json
+import locale
+import os
+import re
+import socket
+import struct
+import threading
+import time
+import weakref
+
+
+LEVELS = {
+    "debug": 10,
+    "info": 20,
+    "warning": 30,
+    "error": 40,
+    "critical": 50
+}
+
+MONTHS = {"Jan": "01", "Feb": "02", "Mar": "03", "Apr": "04", "May": "05", "Jun": "06",
+          "Jul": "07", "Aug": "08", "Sep": "09", "Oct": "10", "Nov": "11", "Dec": "12"}
+
+
+def _iso_date(date):
+    """Converts date saved by handlers ("%d %b %Y %H:%M:%S") to iso format string without creating datetime,
+    iso strings can be compared with each other and with datetime.isoformat() like dates
+
+    Args:
+        date (str): Date in "%d %b %Y %H:%M:%S" format
+    """
+    try:
+        day, month, year, time = date.split(" ")
+        return f"{year}-{MONTHS[month]}-{day}T{time}"
+    except (ValueError, KeyError):
+        return datetime.datetime.strptime(date, "%d %b %Y %H:%M:%S").isoformat()
+
+
+def _validate_dates(start_date, end_date):
+    """Validates start_date and end_date passed to ProfilLoggerReader methods, returns them as datetime
+
+    Args:
+        start_date Optional([str]): Date in iso format or datetime
+        end_date Optional([str]): Date in iso format or datetime
+    """
+    # start_date validation
+    if start_date:
+        if isinstance(start_date, datetime.datetime):
+            pass
+        else:
+            if isinstance(start_date, str):
+                try:
+                    start_date = datetime.datetime.fromisoformat(start_date)
+                except ValueError:
+                    raise ValueError("Please use iso format")
+            else:
+                raise TypeError("start_date needs to be a string")
+
+    # end_date validation
+    if end_date:
+        if isinstance(end_date, datetime.datetime):
+            pass
+        else:
+            if isinstance(end_date, str):
+                try:
+                    end_date = datetime.datetime.fromisoformat(end_date)
+                except ValueError:
+                    raise ValueError("Please use iso format")
+            else:
+                raise TypeError("end_date needs to be a string")
+        if start_date:
+            if end_date < start_date:
+                raise ValueError("end_date needs to be past start_date")
+    return start_date, end_date
+
+
+# encoding used by handlers' files opened in text mode, needed when files are read as bytes
+ENCODING = locale.getpreferredencoding(False)
+
+
+def _bisect_date(probe, size, start):
+    """Returns position of the first record with date not before start using binary search,
+    records need to be in time order
+
+    Args:
+        probe (callable): Returns (position, date) of the first record at or after given position, or None
+        size (int): Position after the last record
+        start (str): Date in iso format
+    """
+    low, high = 0, size
+    while low < high:
+        middle = (low + high) // 2
+        record = probe(middle)
+        if record is None or record[0] >= high or _iso_date(record[1]) >= start:
+            high = middle
+        else:
+            low = record[0] + 1
+    record = probe(low)
+    return record[0] if record else size
+
+
+def _seek_date(handler, date):
+    """Returns byte offset of the first record of handler's file with date not before date, records need to be
+    in time order and take one line each. Only O(log n) lines of the file are read
+
+    Args:
+        handler (Handler): FileHandler or JsonHandler
+        date (datetime): Minimal date of the record
+    """
+    SharedWriter.flush_file(handler.file_name)
+    with open(handler.file_name, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+
+        def probe(position):
+            if position > 0:
+                file.seek(position - 1)
+                file.readline()
+                position = file.tell()
+            if position >= size:
+                return None
+            records = handler._records(file, position)
+            offset, record_date, level, msg = next(records)
+            records.close()
+            return offset, record_date
+
+        return _bisect_date(probe, size, date.isoformat())
+
+
+class SharedWriter:
+    """Appending writer of a file, shared by all handlers of the same file in the process.
+    Writers are registered by real path of the file and counted by references, the file is closed
+    when the last handler releases it. Writes are serialized by the writer's lock and every write is a single
+    write to the file opened without python's buffer, so logs are not interleaved. When buffer_size is set,
+    logs are buffered and written at once when the buffer is full, by a timer flush_interval seconds after
+    the first buffered log, before the file is read in this process, at fork and at exit. The file is opened again when it was
+    removed or replaced, which is checked when another handler acquires the writer, by flush method and at most
+    once per flush_interval, not on every write
+
+    Attributes:
+        path (str): Real path of the file
+        references (int): Number of handlers using the writer
+        keep_open (bool): False on Windows, where open files cannot be removed, the file is closed after every write
+        buffer_size (int): Number of bytes buffered before they are written, 0 by default, so saved logs are
+            in the file at once for readers in other processes
+        flush_interval (float): Maximal number of seconds logs are buffered, and between checks if the file
+            was removed or replaced
+    """
+    keep_open = os.name != "nt"
+    buffer_size = 0
+    flush_interval = 1.0
+    _writers = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, path):
+        """SharedWriter initializer, use acquire method to get writer of a file
+
+        Args:
+            path (str): Initializes the path attribute
+        """
+        self.path = path
+        self.references = 0
+        self._file = None
+        self._buffer = bytearray()
+        self._checked_at = time.monotonic()
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"SharedWriter({self.path}, references={self.references})"
+
+    def __reduce__(self):
+        """Handlers sent to other process, like LogCollector, acquire writer of the file in that process"""
+        return SharedWriter.acquire, (self.path,)
+
+    @classmethod
+    def flush_all(cls):
+        """Writes buffered logs of all writers, called at exit and before fork, so the child doesn't write them again"""
+        for writer in list(cls._writers.values()):
+            writer.flush()
+
+    @classmethod
+    def flush_file(cls, file_name):
+        """Writes logs buffered by writer of the file in this process, called before the file is read
+
+        Args:
+            file_name (str): Name of the file
+        """
+        writer = cls._writers.get(os.path.realpath(file_name))
+        if writer is not None and writer._buffer:
+            with writer._lock:
+                writer._flush()
+
+    @classmethod
+    def _after_fork(cls):
+        """Replaces locks in child process, they could be held by other thread of the parent during fork.
+        Files are kept open, they are flushed before fork and opened in append mode"""
+        cls._registry_lock = threading.Lock()
+        for writer in cls._writers.values():
+            writer._lock = threading.Lock()
+            writer._buffer = bytearray()
+            writer._timer = None
+
+    @classmethod
+    def acquire(cls, file_name):
+        """Returns writer of the file, shared with other handlers of the same file
+
+        Args:
+            file_name (str): Name of the file
+        """
+        path = os.path.realpath(file_name)
+        with cls._registry_lock:
+            writer = cls._writers.get(path)
+            if writer is None:
+                writer = cls._writers[path] = cls(path)
+            writer.references += 1
+        if writer.references > 1:
+            # another handler opens the file, which could be replaced since the writer opened it
+            writer.flush()
+        return writer
+
+    def release(self):
+        """Releases the writer, the file is closed when no handler uses it"""
+        with SharedWriter._registry_lock:
+            self.references -= 1
+            if self.references > 0:
+                return
+            if SharedWriter._writers.get(self.path) is self:
+                del SharedWriter._writers[self.path]
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def write(self, data):
+        """Appends data to the file, or to the buffer when buffer_size is set, the buffer is written
+        when it's full or by a timer flush_interval seconds after the first buffered data
+
+        Args:
+            data (bytes): Data to append
+        """
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "ab", buffering=0)
+            self._buffer += data
+            if len(self._buffer) >= self.buffer_size or not self.keep_open:
+                self._flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Writes buffered data to the file, the file is opened again when it was removed or replaced"""
+        with self._lock:
+            self._checked_at = None
+            self._flush()
+
+    def _timed_flush(self):
+        """Writes data buffered for flush_interval seconds, called by the timer"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """Writes buffered data to the file with a single write, called with the lock held. Checks if the file
+        was removed or replaced at most once per flush_interval and opens it again"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        if self._file is not None and (self._checked_at is None or now - self._checked_at >= self.flush_interval):
+            self._checked_at = now
+            try:
+                replaced = os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+            except OSError:
+                replaced = True
+            if replaced:
+                self._file.close()
+                self._file = None
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._file = open(self.path, "ab", buffering=0)
+        with memoryview(self._buffer) as data:
+            written = 0
+            while written < len(data):
+                written += self._file.write(data[written:])
+        self._buffer.clear()
+        if not self.keep_open:
+            self._file.close()
+            self._file = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=SharedWriter.flush_all, after_in_child=SharedWriter._after_fork)
+atexit.register(SharedWriter.flush_all)
+
+
+# tokens of messages stored in TokenIndex
+TOKEN = re.compile(r"\w+")
+
+
+def _whole_tokens(text):
+    """Returns tokens of text, that are whole tokens of every message containing the text,
+    tokens at the start or at the end of the text can be parts of longer tokens in the message
+
+    Args:
+        text (str): Text searched for in messages
+    """
+    return [match.group() for match in TOKEN.finditer(text) if match.start() > 0 and match.end() < len(text)]
+
+
+def _edge_tokens(text):
+    """Returns list of (token, extends_left, extends_right) tuples of tokens at the start and at the end of text,
+    which can be parts of longer tokens in the message, extends_left is True if the message token can continue
+    before the token and extends_right if it can continue after it
+
+    Args:
+        text (str): Text searched for in messages
+    """
+    return [(match.group(), match.start() == 0, match.end() == len(text)) for match in TOKEN.finditer(text)
+            if match.start() == 0 or match.end() == len(text)]
+
+
+def _encode_varints(numbers):
+    """Encodes non negative integers as bytes, 7 bits per byte, highest bit marks following byte
+
+    Args:
+        numbers (list): List of non negative integers
+    """
+    data = bytearray()
+    for number in numbers:
+        while number > 0x7f:
+            data.append((number & 0x7f) | 0x80)
+            number >>= 7
+        data.append(number)
+    return bytes(data)
+
+
+def _decode_varints(data):
+    """Decodes list of integers encoded by _encode_varints
+
+    Args:
+        data (bytes): Encoded integers
+    """
+    numbers = []
+    number = shift = 0
+    for byte in data:
+        number |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            numbers.append(number)
+            number = shift = 0
+    return numbers
+
+
+def _log_entry(date, level, msg):
+    """Creates LogEntry from raw record with date in iso format
+
+    Args:
+        date (str): Date in iso format
+        level (str): Level of the log
+        msg (str): Message of the log
+    """
+    return LogEntry(msg=msg, level=level, date=datetime.datetime.fromisoformat(date))
+
+
+# functions used by ProfilLoggerReader.groupby to get key of a group from raw record with date in iso format
+GROUPBY_KEYS = {
+    "level": lambda date, level, msg: level,
+    "minute": lambda date, level, msg: date[:16],
+    "hour": lambda date, level, msg: date[:13],
+    "day": lambda date, level, msg: date[:10],
+    "year_month": lambda date, level, msg: date[:7],
+    "month": lambda date, level, msg: int(date[5:7])
+}
+
+AGGREGATES = ["count", "first", "last", "list", "sample"]
+
+
+def _grouping(key="level", aggregate="list", k=1):
+    """Validates arguments of groupby, returns function receiving raw record with date in iso format
+    and returning key of the group
+
+    Args:
+        key Optional([str]): One of GROUPBY_KEYS or callable receiving LogEntry and returning key of the group
+        aggregate Optional([str]): One of AGGREGATES
+        k Optional([int]): Size of the sample, used only by sample aggregate
+    """
+    if callable(key):
+        key_function = lambda date, level, msg: key(_log_entry(date, level, msg))
+    elif key in GROUPBY_KEYS:
+        key_function = GROUPBY_KEYS[key]
+    else:
+        raise ValueError(f"key needs to be callable or one of {list(GROUPBY_KEYS)}")
+    if aggregate not in AGGREGATES:
+        raise ValueError(f"aggregate needs to be one of {AGGREGATES}")
+    if aggregate == "sample" and (not isinstance(k, int) or k < 1):
+        raise ValueError("k needs to be a positive integer")
+    return key_function
+
+
+def _group_records(records, key_function, aggregate="list", k=1):
+    """Groups raw records with dates in iso format in a single pass, returns dict of groups
+
+    Args:
+        records (iterable): Raw (date, level, msg) tuples with date in iso format
+        key_function (function): Function returned by _grouping
+        aggregate Optional([str]): One of AGGREGATES
+        k Optional([int]): Size of the sample, used only by sample aggregate
+    """
+    import random
+    groups = {}
+    if aggregate == "count":
+        for record in records:
+            group = key_function(*record)
+            groups[group] = groups.get(group, 0) + 1
+        return groups
+
+    if aggregate == "first":
+        for record in records:
+            group = key_function(*record)
+            if group not in groups:
+                groups[group] = record
+    elif aggregate == "last":
+        for record in records:
+            groups[key_function(*record)] = record
+    elif aggregate == "list":
+        for record in records:
+            group = key_function(*record)
+            if group not in groups:
+                groups[group] = []
+            groups[group].append(record)
+    else:
+        # reservoir sampling, keeps k records and number of seen records per group
+        seen = {}
+        for record in records:
+            group = key_function(*record)
+            count = seen.get(group, 0) + 1
+            seen[group] = count
+            if count <= k:
+                groups.setdefault(group, []).append(record)
+            else:
+                index = random.randrange(count)
+                if index < k:
+                    groups[group][index] = record
+
+    if aggregate in ("first", "last"):
+        return {group: _log_entry(*record) for group, record in groups.items()}
+    return {group: LogEntryList(_log_entry(*record) for record in group_records)
+            for group, group_records in groups.items()}
+
+
+def _build_arrays(dates, levels, msgs):
+    """Builds dict of numpy arrays from columns of logs, raises ImportError if numpy is not installed
+
+    Args:
+        dates (list): Dates of logs, iso format strings or datetime instances
+        levels (list): Levels of logs
+        msgs (list): Messages of logs
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy needs to be installed to export logs to arrays")
+    categories = [level for level in LEVELS if level in set(levels)]
+    categories += sorted(set(levels) - set(categories))
+    codes = {level: code for code, level in enumerate(categories)}
+    return {
+        "date": numpy.array(dates, dtype="datetime64[s]"),
+        "level": numpy.array([codes[level] for level in levels], dtype=numpy.int8),
+        "level_categories": categories,
+        "msg": numpy.array(msgs, dtype=object)
+    }
+
+
+def _build_dataframe(arrays):
+    """Builds pandas DataFrame from arrays created by _build_arrays, raises ImportError if pandas is not installed
+
+    Args:
+        arrays (dict): Dict of arrays returned by _build_arrays
+    """
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError("pandas needs to be installed to export logs to DataFrame")
+    return pandas.DataFrame({
+        "date": arrays["date"],
+        "level": pandas.Categorical.from_codes(arrays["level"], categories=arrays["level_categories"]),
+        "msg": arrays["msg"]
+    })
+
+
+def _disabled_level(*args, **kwargs):
+    """No-op replacing ProfilLogger methods of levels below log_level"""
+
+
+class RateLimiter:
+    """Token bucket rate limiter of ProfilLogger, logs are limited per message template, the message or format
+    string before formatting, and per level. Bucket of rate logs per second holds up to burst logs, so short bursts
+    are saved whole and a message repeated in a loop is reduced to rate logs per second. Logs over the limit are
+    suppressed, or kept with probability sample, the first log saved after suppression is preceded by a summary
+    LogEntry of the same level, "suppressed 49,812 similar messages". Counts are approximate when many threads
+    log the same template, buckets are not locked
+
+    Example:
+        limiter = RateLimiter(rate=10, level_rates={"debug": 1000})
+        my_logger = ProfilLogger(handlers=[FileHandler("app.txt")], rate_limiter=limiter)
+
+    Attributes:
+        rate (float, dict): Logs per second of a template, or dict of rates by level, templates of levels
+            missing in the dict are not limited, templates are not limited if None
+        burst (float): Maximal number of logs of a template saved at once, one second of logs if None
+        level_rates (dict): Logs per second of all templates of a level
+        sample (float): Probability of keeping a log over the limit, if no rate is passed every template is sampled
+            after it's first log
+        max_templates (int): Maximal number of remembered templates, templates without suppressed logs are
+            forgotten first
+        suppressed (int): Number of suppressed logs
+    """
+
+    def __init__(self, rate=None, burst=None, level_rates=None, sample=None, max_templates=10000):
+        """RateLimiter initializer, at least one of rate, level_rates and sample needs to be passed
+
+        Args:
+            rate (Optional[float, dict]): Initializes the rate attribute
+            burst (Optional[float]): Initializes the burst attribute
+            level_rates (Optional[dict]): Initializes the level_rates attribute
+            sample (Optional[float]): Initializes the sample attribute
+            max_templates (Optional[int]): Initializes the max_templates attribute
+        """
+        import random
+        if rate is None and level_rates is None and sample is None:
+            raise ValueError("rate, level_rates or sample needs to be passed")
+        if level_rates is not None and not isinstance(level_rates, dict):
+            raise TypeError("level_rates needs to be a dict")
+        rates = list(rate.values()) if isinstance(rate, dict) else [] if rate is None else [rate]
+        for value in rates + list((level_rates or {}).values()):
+            # bucket of rate 0 would never be refilled and summary of it's suppressed logs never saved
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError("rates need to be positive numbers")
+        if burst is not None and (isinstance(burst, bool) or not isinstance(burst, (int, float)) or burst < 1):
+            raise ValueError("burst needs to be a number not lower than 1")
+        if sample is not None and (isinstance(sample, bool) or not isinstance(sample, (int, float))
+                                   or not 0 <= sample <= 1):
+            raise ValueError("sample needs to be a number between 0 and 1")
+        if isinstance(max_templates, bool) or not isinstance(max_templates, int) or max_templates < 1:
+            raise ValueError("max_templates needs to be a positive integer")
+        self.rate = rate
+        self.burst = burst
+        self.level_rates = level_rates or {}
+        self.sample = sample
+        self.max_templates = max_templates
+        self.suppressed = 0
+        # rate of templates of levels missing in the rate dict, with only sample passed templates get empty buckets,
+        # so the first log of a template is kept and the next ones are sampled
+        self._default_rate = None if isinstance(rate, dict) else rate
+        if rate is None and level_rates is None:
+            self._default_rate = 0
+        self._rates = rate if isinstance(rate, dict) else {}
+        self._random = random.random
+        # buckets are [tokens, refill time, rate, capacity, suppressed logs, time of the next token] lists
+        self._templates = {}
+        self._levels = {level: [max(1.0, value), time.monotonic(), value, max(1.0, value), 0, 0]
+                        for level, value in self.level_rates.items()}
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"RateLimiter(rate={self.rate}, level_rates={self.level_rates}, sample={self.sample})"
+
+    def acquire(self, level, template):
+        """Takes token of the template and level, returns None if the log is suppressed, otherwise tuple
+        of summary LogEntries of logs suppressed before it, which is empty unless the log resumes suppressed logs.
+        Buckets are refilled only when they run out of tokens, so a log with tokens left costs a dict lookup
+        and a suppressed log a dict lookup and reading the clock. Unhashable messages, like dicts, are limited
+        by their type
+
+        Args:
+            level (str): Level of the log
+            template (str, callable): Message or format string before formatting, or callable returning the message
+        """
+        limited = None
+        try:
+            template_bucket = self._templates.get((level, template))
+        except TypeError:
+            template = template.__class__
+            template_bucket = self._templates.get((level, template))
+        level_bucket = self._levels.get(level)
+        # template or level without tokens is suppressed until the time of the next token, without refilling
+        if template_bucket is not None and template_bucket[0] < 1 and time.monotonic() < template_bucket[5] \
+                and not self.sample:
+            template_bucket[4] += 1
+            self.suppressed += 1
+            return None
+        if level_bucket is not None and level_bucket[0] < 1 and time.monotonic() < level_bucket[5] \
+                and not self.sample:
+            level_bucket[4] += 1
+            self.suppressed += 1
+            return None
+        if template_bucket is None and self._rates.get(level, self._default_rate) is not None:
+            template_bucket = self._remember(level, template)
+        if template_bucket is not None and template_bucket[0] < 1 and not self._refill(template_bucket):
+            limited = template_bucket
+        if level_bucket is not None and limited is None and level_bucket[0] < 1 and not self._refill(level_bucket):
+            limited = level_bucket
+        if limited is not None:
+            if not (self.sample and self._random() < self.sample):
+                limited[4] += 1
+                self.suppressed += 1
+                return None
+        else:
+            if template_bucket is not None:
+                template_bucket[0] -= 1
+            if level_bucket is not None:
+                level_bucket[0] -= 1
+        if (template_bucket is None or not template_bucket[4]) and (level_bucket is None or not level_bucket[4]):
+            return ()
+        summaries = ()
+        if template_bucket is not None and template_bucket[4]:
+            summaries += (LogEntry(f"suppressed {template_bucket[4]:,} similar messages", level),)
+            template_bucket[4] = 0
+        if level_bucket is not None and level_bucket[4]:
+            summaries += (LogEntry(f"suppressed {level_bucket[4]:,} {level} messages", level),)
+            level_bucket[4] = 0
+        return summaries
+
+    @staticmethod
+    def _refill(bucket):
+        """Adds tokens for the time since the last refill, returns True if the bucket has a token, otherwise
+        sets time of the next token
+
+        Args:
+            bucket (list): Bucket of a template or level
+        """
+        now = time.monotonic()
+        tokens = bucket[0] + (now - bucket[1]) * bucket[2]
+        bucket[0] = tokens if tokens < bucket[3] else bucket[3]
+        bucket[1] = now
+        if bucket[0] >= 1:
+            return True
+        bucket[5] = now + (1 - bucket[0]) / bucket[2] if bucket[2] else float("inf")
+        return False
+
+    def _remember(self, level, template):
+        """Returns bucket of a template, callable templates are identified by their code. New bucket is full,
+        templates without suppressed logs are forgotten when max_templates templates are remembered, and all
+        templates if most of them have suppressed logs
+
+        Args:
+            level (str): Level of the log
+            template (str, callable): Message or format string before formatting, or callable returning the message
+        """
+        if template.__class__ is not str:
+            template = getattr(template, "__code__", template)
+            if (level, template) in self._templates:
+                return self._templates[(level, template)]
+        if len(self._templates) >= self.max_templates:
+            self._templates = {key: bucket for key, bucket in self._templates.items() if bucket[4]}
+            if len(self._templates) >= self.max_templates // 2:
+                self._templates = {}
+        rate = self._rates.get(level, self._default_rate)
+        capacity = self.burst if self.burst is not None else max(1.0, rate)
+        bucket = self._templates[(level, template)] = [capacity, time.monotonic(), rate, capacity, 0, 0]
+        return bucket
 
 
 class ProfilLogger:
     """Class to save logs to the handlers
 
     Attributes:
-        handlers (list): List of Handlers, viable Handlers are: FileHandler, CSVHandler, JsonHandler, SQLLiteHandler
+        handlers (list): List of Handlers, viable Handlers are: FileHandler, CSVHandler, JsonHandler, SQLLiteHandler,
+            BufferingHandler, RingBufferHandler
         levels (dict): Dict of levels and it's values, the values are used to determine the order of levels
         log_level (str): One of levels keys, only logs with level equal or greater than levels[log_level] will be saved
+        rate_limiter (RateLimiter): Limiter of logs per level and message template, logs are not limited if None
     """
 
-    def __new__(cls, handlers):
+    def __new__(cls, handlers, rate_limiter=None):
         """ProfilLogger constructor, implemented to avoid creation of Logger with wrong Type Handlers
 
         Args:
-            handlers (list): List of Handlers, viable Handlers are: FileHandler, CSVHandler, JsonHandler, SQLLiteHandler
+            handlers (list): List of Handlers, viable Handlers are: FileHandler, CSVHandler, JsonHandler,
+                SQLLiteHandler, BufferingHandler, RingBufferHandler
+            rate_limiter (Optional[RateLimiter]): Not used by constructor
         """
         if not isinstance(handlers, list):
             raise TypeError("Passed argument must be a list")
         if len(handlers) == 0:
             raise TypeError("Passed list cannot be empty")
-        viable_handlers = [FileHandler, CSVHandler, JsonHandler, SQLLiteHandler]
         for handler in handlers:
-            for viable_handler in viable_handlers:
-                if isinstance(handler, viable_handler):
-                    break
-            else:
+            if not isinstance(handler, tuple(HANDLERS)):
                 raise TypeError("Unsupported type passed as Handler")
-        else:
-            return super(ProfilLogger, cls).__new__(cls)
+        return super(ProfilLogger, cls).__new__(cls)
 
-    def __init__(self, handlers):
+    def __init__(self, handlers, rate_limiter=None):
         """ProfilLogger initializer
 
         Args:
             handlers (list): Initializes the handlers attribute
+            rate_limiter (Optional[RateLimiter]): Initializes the rate_limiter attribute
          """
-        self.levels = {
-            "debug": 10,
-            "info": 20,
-            "warning": 30,
-            "error": 40,
-            "critical": 50
-        }
-        self.log_level = "warning"
+        if rate_limiter is not None and not isinstance(rate_limiter, RateLimiter):
+            raise TypeError("rate_limiter needs to be a RateLimiter")
+        self.levels = dict(LEVELS)
         self.handlers = handlers
+        self.log_level = "warning"
+        self.rate_limiter = rate_limiter
 
     def __repr__(self):
         """repr used for developers"""
@@ -56,6 +723,29 @@ class ProfilLogger:
         """str used for users"""
         return self.handlers
 
+    @property
+    def log_level(self):
+        """One of levels keys, only logs with level equal or greater than levels[log_level] will be saved"""
+        return self._log_level
+
+    @log_level.setter
+    def log_level(self, level):
+        """Sets log_level and caches it's value as int, methods of levels below log_level are replaced
+        with no-op function, so disabled logs cost as much as an empty function call
+
+        Args:
+            level (str): level from a levels keys
+        """
+        if level not in self.levels:
+            raise ValueError(f"Level needs to be one of {list(self.levels)}")
+        self._log_level = level
+        self._threshold = self.levels[level]
+        for name in LEVELS:
+            if self.levels[name] < self._threshold:
+                self.__dict__[name] = _disabled_level
+            else:
+                self.__dict__.pop(name, None)
+
     def set_log_level(self, level):
         """Method used to change log_level of a ProfilLogger
         Args:
@@ -65,221 +755,1080 @@ class ProfilLogger:
         if level in self.levels.keys():
             self.log_level = level
 
-    def debug(self, msg):
+    def _log(self, level, msg, args, kwargs):
+        """Creates LogEntry with current date, if level is not below log_level, and saves it with every Handler.
+        msg is formatted with args and kwargs, or called if it is callable, only when the log is saved
+        and not suppressed by rate_limiter. LogEntry is serialized once for all handlers of the same type
+
+        Args:
+            level (str): Level of the log
+            msg (str, callable): Message, format string or callable returning the message
+            args (tuple): Positional arguments of str.format
+            kwargs (dict): Keyword arguments of str.format
+        """
+        if self.levels[level] < self._threshold:
+            return
+        summaries = None
+        if self.rate_limiter is not None:
+            summaries = self.rate_limiter.acquire(level, msg)
+            if summaries is None:
+                return
+        if callable(msg):
+            msg = msg()
+        elif args or kwargs:
+            msg = msg.format(*args, **kwargs)
+        log_entry = LogEntry(msg, level)
+        if summaries:
+            self._save_batch(list(summaries) + [log_entry])
+            return
+        # handlers of the same type share serialized log
+        serialized = {}
+        for handler in self.handlers:
+            handler_type = type(handler)
+            if not _serializes(handler_type):
+                handler.save(log_entry)
+                continue
+            if handler_type not in serialized:
+                serialized[handler_type] = handler.serialize(log_entry)
+            handler.write(serialized[handler_type])
+
+    def log_many(self, records):
+        """Method used to save many logs at once, logs with level below log_level are filtered out
+        and every Handler saves remaining logs with a single write. Logs are serialized once for all handlers
+        of the same type
+
+        Args:
+            records (iterable): (level, msg) or (level, msg, date) tuples, level is one of levels keys,
+            msg is a message or callable returning the message, date is datetime, date is current date if not passed
+        """
+        log_entries = self._entries(records)
+        if log_entries:
+            self._save_batch(log_entries)
+
+    def _entries(self, records):
+        """Returns list of LogEntry of records with level not below log_level and not suppressed by rate_limiter,
+        with summaries of suppressed logs
+
+        Args:
+            records (iterable): (level, msg) or (level, msg, date) tuples
+        """
+        log_entries = []
+        for record in records:
+            if not isinstance(record, tuple) or len(record) not in (2, 3):
+                raise TypeError("Record needs to be a (level, msg) or (level, msg, date) tuple")
+            level, msg, date = record if len(record) == 3 else record + (None,)
+            if level not in self.levels:
+                raise ValueError(f"Level needs to be one of {list(self.levels)}")
+            if self.levels[level] < self._threshold:
+                continue
+            if self.rate_limiter is not None:
+                summaries = self.rate_limiter.acquire(level, msg)
+                if summaries is None:
+                    continue
+                log_entries.extend(summaries)
+            log_entries.append(LogEntry(msg() if callable(msg) else msg, level, date))
+        return log_entries
+
+    def _save_batch(self, log_entries):
+        """Saves list of LogEntry with every Handler using a single write, logs are serialized once for all
+        handlers of the same type
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        serialized = {}
+        for handler in self.handlers:
+            handler_type = type(handler)
+            if not _serializes(handler_type):
+                handler.save_batch(log_entries)
+                continue
+            if handler_type not in serialized:
+                serialized[handler_type] = handler.serialize_batch(log_entries)
+            handler.write_batch(serialized[handler_type], len(log_entries))
+
+    def debug(self, msg, *args, **kwargs):
         """Method used to create LogEntry with current date and message and debug level for every Handler,
-        if the log_level is set below debug the LogEntry will not be created
+        if the log_level is set above debug the LogEntry will not be created and msg will not be formatted
 
         Args:
-            msg (str): Message that will be saved in LogEntry
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
         """
-        method_name = inspect.currentframe().f_code.co_name
-        if self.levels[method_name] >= self.levels[self.log_level]:
-            for handler in self.handlers:
-                handler.save(LogEntry(msg, method_name))
+        self._log("debug", msg, args, kwargs)
 
-    def info(self, msg):
+    def info(self, msg, *args, **kwargs):
         """Method used to create LogEntry with current date and message and info level for every Handler,
-        if the log_level is set below info the LogEntry will not be created
+        if the log_level is set above info the LogEntry will not be created and msg will not be formatted
 
         Args:
-            msg (str): Message that will be saved in LogEntry
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
         """
-        method_name = inspect.currentframe().f_code.co_name
-        if self.levels[method_name] >= self.levels[self.log_level]:
-            for handler in self.handlers:
-                handler.save(LogEntry(msg, method_name))
+        self._log("info", msg, args, kwargs)
 
-    def warning(self, msg):
+    def warning(self, msg, *args, **kwargs):
         """Method used to create LogEntry with current date and message and warning level for every Handler,
-        if the log_level is set below warning the LogEntry will not be created
+        if the log_level is set above warning the LogEntry will not be created and msg will not be formatted
 
         Args:
-            msg (str): Message that will be saved in LogEntry
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
         """
-        method_name = inspect.currentframe().f_code.co_name
-        if self.levels[method_name] >= self.levels[self.log_level]:
-            for handler in self.handlers:
-                handler.save(LogEntry(msg, method_name))
+        self._log("warning", msg, args, kwargs)
 
-    def error(self, msg):
+    def error(self, msg, *args, **kwargs):
         """Method used to create LogEntry with current date and message and error level for every Handler,
-        if the log_level is set below error the LogEntry will not be created
+        if the log_level is set above error the LogEntry will not be created and msg will not be formatted
 
         Args:
-            msg (str): Message that will be saved in LogEntry
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
         """
-        method_name = inspect.currentframe().f_code.co_name
-        if self.levels[method_name] >= self.levels[self.log_level]:
-            for handler in self.handlers:
-                handler.save(LogEntry(msg, method_name))
+        self._log("error", msg, args, kwargs)
 
-    def critical(self, msg):
+    def critical(self, msg, *args, **kwargs):
         """Method used to create LogEntry with current date and message and critical level for every Handler,
-        if the log_level is set below critical the LogEntry will not be created
+        if the log_level is set above critical the LogEntry will not be created and msg will not be formatted
 
         Args:
-            msg (str): Message that will be saved in LogEntry
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
         """
-        method_name = inspect.currentframe().f_code.co_name
-        if self.levels[method_name] >= self.levels[self.log_level]:
-            for handler in self.handlers:
-                handler.save(LogEntry(msg, method_name))
+        self._log("critical", msg, args, kwargs)
 
 
-class FileHandler:
-    """Class used to save and read LogEntry to and from .txt file
+OVERLOAD_POLICIES = ["block", "drop_newest", "drop_oldest", "shed_levels"]
+
+
+class OverloadPolicy:
+    """Policy of a bounded queue or buffer of logs, applied when logs do not fit in it:
+        block - caller waits up to block_timeout seconds for free space, newest logs are dropped after timeout
+        drop_newest - logs which do not fit are dropped
+        drop_oldest - the oldest queued logs are dropped
+        shed_levels - logs of the lowest levels are dropped first, the oldest first within a level, at least
+            capacity // 16 logs are shed at once, so the queue is not rebuilt for every log
+    Dropped logs are counted and summarized by a warning LogEntry saved with the next logs
 
     Attributes:
-        file_name (str): Name of a file to save to, or to read from. It works in current working directory.
+        capacity (int): Maximal number of queued logs, queue is unbounded if None
+        policy (str): One of OVERLOAD_POLICIES
+        block_timeout (float): Maximal number of seconds block policy waits, waits until there is space if None
+        dropped (int): Number of dropped logs
+        dropped_levels (dict): Number of dropped logs by level
     """
 
-    def __new__(cls, entry="log.txt"):
-        """FileHandler constructor creates instance only if entry is viable file name in all OS
+    def __init__(self, capacity=None, policy="block", block_timeout=None):
+        """OverloadPolicy initializer
 
         Args:
-        entry (Optional[str]): name of a file to save to or read from, will default to log.txt if not specified
+            capacity (Optional[int]): Initializes the capacity attribute
+            policy (Optional[str]): Initializes the policy attribute
+            block_timeout (Optional[float]): Initializes the block_timeout attribute
         """
+        if capacity is not None and (isinstance(capacity, bool) or not isinstance(capacity, int) or capacity < 1):
+            raise ValueError("capacity needs to be a positive integer")
+        if policy not in OVERLOAD_POLICIES:
+            raise ValueError(f"policy needs to be one of {OVERLOAD_POLICIES}")
+        if block_timeout is not None and (isinstance(block_timeout, bool)
+                                          or not isinstance(block_timeout, (int, float)) or block_timeout < 0):
+            raise ValueError("block_timeout needs to be a non negative number")
+        self.capacity = capacity
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.dropped_levels = {}
+        self._unreported = {}
 
-        if entry == "log.txt":
-            return super(FileHandler, cls).__new__(cls)
+    def __repr__(self):
+        """repr for developers"""
+        return f"OverloadPolicy(capacity={self.capacity}, policy={self.policy}, dropped={self.dropped})"
 
-        if not isinstance(entry, str):
-            raise TypeError("Input should be a string")
+    def admit(self, queue, log_entries, policy=None):
+        """Returns logs which fit in the queue, applying drop policy if they do not fit, drop_oldest and shed_levels
+        remove logs from the queue. Block policy is applied as drop_newest, after the caller waited for space
 
-        if len(entry) <= 4:
-            raise ValueError("File name must be at least 5 characters long and include .txt at the end")
+        Args:
+            queue (collections.deque): Queue of logs
+            log_entries (list): List of LogEntry instances to append to the queue
+            policy (Optional[str]): Used instead of policy attribute
+        """
+        overflow = len(queue) + len(log_entries) - self.capacity if self.capacity is not None else 0
+        if overflow <= 0:
+            return log_entries
+        policy = policy or self.policy
+        if policy in ("block", "drop_newest"):
+            kept = max(0, len(log_entries) - overflow)
+            self.drop(log_entries[kept:])
+            return log_entries[:kept]
+        if policy == "drop_oldest":
+            self.drop([queue.popleft() for _ in range(min(overflow, len(queue)))])
+            if len(log_entries) > self.capacity:
+                self.drop(log_entries[:-self.capacity])
+                return log_entries[-self.capacity:]
+            return log_entries
+        pool = list(queue) + list(log_entries)
+        shed = min(len(pool), max(overflow, self.capacity // 16))
+        counts = {}
+        for log_entry in pool:
+            value = LEVELS.get(log_entry.level, 0)
+            counts[value] = counts.get(value, 0) + 1
+        quota = {}
+        for value in sorted(counts):
+            quota[value] = min(counts[value], shed)
+            shed -= quota[value]
+            if not shed:
+                break
+        kept, dropped = [], []
+        for log_entry in pool:
+            value = LEVELS.get(log_entry.level, 0)
+            if quota.get(value):
+                quota[value] -= 1
+                dropped.append(log_entry)
+            else:
+                kept.append(log_entry)
+        queue.clear()
+        queue.extend(kept)
+        self.drop(dropped)
+        return []
 
-        if len(entry) >= 60:
-            raise ValueError("Length of file name cannot get past 60 characters")
+    def drop(self, log_entries):
+        """Counts dropped logs
 
-        if entry[-4:] != ".txt":
-            raise ValueError("Passed file name does not end with '.txt'")
+        Args:
+            log_entries (list): List of dropped LogEntry instances
+        """
+        self.dropped += len(log_entries)
+        for log_entry in log_entries:
+            self.dropped_levels[log_entry.level] = self.dropped_levels.get(log_entry.level, 0) + 1
+            self._unreported[log_entry.level] = self._unreported.get(log_entry.level, 0) + 1
+
+    def summary(self):
+        """Returns warning LogEntry summarizing logs dropped since the last reported summary, None if no log
+        was dropped"""
+        if not self._unreported:
+            return None
+        levels = ", ".join(f"{level}: {count}" for level, count in self._unreported.items())
+        return LogEntry(f"dropped {sum(self._unreported.values())} logs because of overload ({levels})", "warning")
+
+    def reported(self):
+        """Marks summary as saved, next summary counts only logs dropped after it"""
+        self._unreported = {}
+
+
+class AsyncProfilLogger(ProfilLogger):
+    """ProfilLogger for asyncio applications. adebug, ainfo, awarning, aerror and acritical coroutines only create
+    LogEntry and put it in a queue, a writer task running on the event loop saves queued logs in batches
+    with save_batch of every Handler in a thread pool, so file writes and SQLite commits do not block the event loop.
+    Methods of ProfilLogger, like info, still save logs directly. Queue is unbounded, unless max_queue is passed,
+    then overload policy decides what happens with logs which do not fit in it
 
-        if entry[-5] in [" ", "."]:
-            raise ValueError("It is not possible to have space or dot before .txt in file name")
+    Attributes:
+        handlers (list): List of registered Handlers
+        levels (dict): Dict of levels and it's values, the values are used to determine the order of levels
+        log_level (str): One of levels keys, only logs with level equal or greater than levels[log_level] will be saved
+        max_batch (int): Maximal number of logs saved by the writer task at once
+        executor (concurrent.futures.Executor): Executor running writes of the Handlers
+        overload (OverloadPolicy): Policy of the queue, counts dropped logs
+        rate_limiter (RateLimiter): Limiter of logs per level and message template, logs are not limited if None
+    """
 
-        invalid_characters = ["\\", "/", ":", "*", '"', "<", ">", "|"]
-        for character in entry[:-4]:
-            if character in invalid_characters:
-                raise ValueError(f"Any of the following are not allowed in a file name {invalid_characters}")
-        return super(FileHandler, cls).__new__(cls)
+    def __new__(cls, handlers, max_batch=1000, executor=None, max_queue=None, overload="block", block_timeout=None,
+                rate_limiter=None):
+        """AsyncProfilLogger constructor, implemented to avoid creation of Logger with wrong Type Handlers
 
-    def __init__(self, file_name="log.txt"):
-        """FileHandler initializer
+        Args:
+            handlers (list): List of registered Handlers
+            max_batch (Optional[int]): Not used by constructor
+            executor (Optional[concurrent.futures.Executor]): Not used by constructor
+            max_queue (Optional[int]): Not used by constructor
+            overload (Optional[str]): Not used by constructor
+            block_timeout (Optional[float]): Not used by constructor
+            rate_limiter (Optional[RateLimiter]): Not used by constructor
+        """
+        return super(AsyncProfilLogger, cls).__new__(cls, handlers)
+
+    def __init__(self, handlers, max_batch=1000, executor=None, max_queue=None, overload="block", block_timeout=None,
+                 rate_limiter=None):
+        """AsyncProfilLogger initializer
 
         Args:
-            file_name (Optional[str]): Initializes the file_name attribute
+            handlers (list): Initializes the handlers attribute
+            max_batch (Optional[int]): Initializes the max_batch attribute
+            executor (Optional[concurrent.futures.Executor]): Initializes the executor attribute, single thread
+                ThreadPoolExecutor owned and shut down by aclose is used if not passed, single thread keeps
+                handlers used by one thread at a time
+            max_queue (Optional[int]): Maximal number of queued logs, queue is unbounded if not passed
+            overload (Optional[str]): One of OVERLOAD_POLICIES, applied when logs do not fit in the queue
+            block_timeout (Optional[float]): Maximal number of seconds coroutines wait for space in the queue
+                with block policy, they wait until there is space if not passed
+            rate_limiter (Optional[RateLimiter]): Initializes the rate_limiter attribute
         """
-        self.file_name = file_name
+        self.overload = OverloadPolicy(max_queue, overload, block_timeout)
+        if isinstance(max_batch, bool) or not isinstance(max_batch, int):
+            raise TypeError("max_batch needs to be an int")
+        if max_batch < 1:
+            raise ValueError("max_batch needs to be greater than 0")
+        if executor is not None and not isinstance(executor, concurrent.futures.Executor):
+            raise TypeError("executor needs to be a concurrent.futures.Executor")
+        super().__init__(handlers, rate_limiter)
+        self.max_batch = max_batch
+        self._owns_executor = executor is None
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncProfilLogger")
+        self.executor = executor
+        self._queue = collections.deque()
+        self._loop = None
+        self._writer_task = None
+        self._error = None
+        self._closed = False
 
     def __repr__(self):
         """repr used for developers"""
-        return f"FileHandler({self.file_name})"
+        return f"AsyncProfilLogger(handlers={self.handlers})"
 
-    def __str__(self):
-        """str used for users"""
-        return self.file_name
+    async def __aenter__(self):
+        return self
 
-    def save(self, log_entry):
-        """Saves LogEntry to a txt file specified in file_name
-        separates date, level, msg with ;
-        if LogEntry.msg contains ; it is replaced with :
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def __len__(self):
+        """Returns number of queued logs, which are not saved yet"""
+        return len(self._queue)
+
+    def _enqueue(self, log_entries):
+        """Puts LogEntry list in the queue and wakes up the writer task, the task is started on the running
+        event loop with the first log. Returns log_entries if they do not fit in the queue, they are passed
+        to _overloaded then
 
         Args:
-            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+            log_entries (list): List of LogEntry instances
         """
-        log_entry.msg.replace(";", ":")
-        with open (self.file_name, "a", newline="\n") as file:
-            file.write(f"{log_entry.date.strftime('%d %b %Y %H:%M:%S')} ; {log_entry.level} ; {log_entry.msg}\n")
+        if self._closed:
+            raise ValueError("AsyncProfilLogger is closed")
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._start(loop)
+        capacity = self.overload.capacity
+        if capacity is not None and len(self._queue) + len(log_entries) > capacity:
+            return log_entries
+        self._queue.extend(log_entries)
+        self._idle.clear()
+        self._wakeup.set()
+        return None
+
+    async def _overloaded(self, log_entries):
+        """Applies overload policy to logs which do not fit in the queue, with block policy waits for space
+        up to block_timeout seconds
 
-    def read(self):
-        """Yields LogEntry from file specified in file_name"""
-        with open(self.file_name, "r", newline="\n") as file:
-            whole_file = file.read()
-            lines = whole_file.splitlines()
-            lines = [line.split(";") for line in lines]
-            for date, level, msg in tuple(lines):
-                yield LogEntry(msg=msg.strip(), level=level.strip(), date=date.strip())
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        if self.overload.policy == "block":
+            timeout = self.overload.block_timeout
+            deadline = None if timeout is None else self._loop.time() + timeout
+            while self._queue and len(self._queue) + len(log_entries) > self.overload.capacity and not self._closed:
+                self._space.clear()
+                try:
+                    await asyncio.wait_for(self._space.wait(), None if deadline is None
+                                           else max(0, deadline - self._loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            if self._closed:
+                raise ValueError("AsyncProfilLogger is closed")
+        log_entries = self.overload.admit(self._queue, log_entries)
+        if log_entries:
+            self._queue.extend(log_entries)
+        self._idle.clear()
+        self._wakeup.set()
 
+    def _start(self, loop):
+        """Starts writer task on the loop, logs queued on a previous loop are saved by the new task
 
-class CSVHandler:
-    """Class used to save and read LogEntry to and from .csv file
+        Args:
+            loop (asyncio.AbstractEventLoop): Running event loop
+        """
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        # set when the writer task takes logs from the queue, wakes up coroutines waiting with block policy
+        self._space = asyncio.Event()
+        self._writer_task = loop.create_task(self._write_queued())
+
+    async def _write_queued(self):
+        """Writer task, saves queued logs in batches of up to max_batch logs in the executor, an exception
+        raised by a Handler is kept and raised by aflush or aclose"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.max_batch))]
+                self._space.set()
+                summary = self.overload.summary()
+                if summary is not None:
+                    batch.append(summary)
+                    self.overload.reported()
+                error = await self._loop.run_in_executor(self.executor, self._save_queued, batch)
+                if error is not None and self._error is None:
+                    self._error = error
+            self._idle.set()
+
+    def _save_queued(self, log_entries):
+        """Saves list of LogEntry in the executor, returns exception raised by a Handler instead of raising it,
+        so traceback of the exception does not contain frame of the writer task
 
-    Attributes:
-        file_name (str): Name of a file to save to, or to read from. It works in current working directory.
-    """
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        try:
+            self._save_batch(log_entries)
+        except Exception as error:
+            return error
 
-    def __new__(cls, entry="log.csv"):
-        """CSVHandler constructor creates instance only if entry is viable file name in all OS
+    def _alog(self, level, msg, args, kwargs):
+        """Creates LogEntry with current date, if level is not below log_level and it is not suppressed
+        by rate_limiter, and puts it in the queue with summaries of suppressed logs, returns the logs in a tuple
+        if they do not fit in the queue
 
-            Args:
-                entry (Optional[str]): name of a file to save to or read from, will default to log.csv if not specified
+        Args:
+            level (str): Level of the log
+            msg (str, callable): Message, format string or callable returning the message
+            args (tuple): Positional arguments of str.format
+            kwargs (dict): Keyword arguments of str.format
         """
-        if entry == "log.csv":
-            return super(CSVHandler, cls).__new__(cls)
+        if self.levels[level] < self._threshold:
+            return
+        summaries = ()
+        if self.rate_limiter is not None:
+            summaries = self.rate_limiter.acquire(level, msg)
+            if summaries is None:
+                return
+        if callable(msg):
+            msg = msg()
+        elif args or kwargs:
+            msg = msg.format(*args, **kwargs)
+        return self._enqueue(summaries + (LogEntry(msg, level),))
+
+    async def alog_many(self, records):
+        """Puts many logs in the queue at once, see log_many
 
-        if not isinstance(entry, str):
-            raise TypeError("Input should be a string")
+        Args:
+            records (iterable): (level, msg) or (level, msg, date) tuples
+        """
+        log_entries = self._entries(records)
+        if log_entries and self._enqueue(log_entries):
+            await self._overloaded(log_entries)
 
-        if len(entry) <= 4:
-            raise ValueError("File name must be at least 5 characters long and include .csv at the end")
+    async def adebug(self, msg, *args, **kwargs):
+        """Puts LogEntry with current date, message and debug level in the queue, see debug
 
-        if len(entry) >= 60:
-            raise ValueError("Length of file name cannot get past 60 characters")
+        Args:
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
+        """
+        overflow = self._alog("debug", msg, args, kwargs)
+        if overflow:
+            await self._overloaded(overflow)
 
-        if entry[-4:] != ".csv":
-            raise ValueError("Passed file name does not end with '.csv'")
+    async def ainfo(self, msg, *args, **kwargs):
+        """Puts LogEntry with current date, message and info level in the queue, see info
 
-        if entry[-5] in [" ", "."]:
-            raise ValueError("It is not possible to have space or dot before .csv in file name")
+        Args:
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
+        """
+        overflow = self._alog("info", msg, args, kwargs)
+        if overflow:
+            await self._overloaded(overflow)
 
-        invalid_characters = ["\\", "/", ":", "*", '"', "<", ">", "|"]
-        for character in entry[:-4]:
-            if character in invalid_characters:
-                raise ValueError(f"Any of the following are not allowed in a file name {invalid_characters}")
-        return super(CSVHandler, cls).__new__(cls)
+    async def awarning(self, msg, *args, **kwargs):
+        """Puts LogEntry with current date, message and warning level in the queue, see warning
 
-    def __init__(self, file_name="log.csv"):
-        """CSVHandler initializer
+        Args:
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
+        """
+        overflow = self._alog("warning", msg, args, kwargs)
+        if overflow:
+            await self._overloaded(overflow)
 
-            Args:
-                file_name (Optional[str]): Initializes the file_name attribute
+    async def aerror(self, msg, *args, **kwargs):
+        """Puts LogEntry with current date, message and error level in the queue, see error
+
+        Args:
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
         """
-        self.file_name = file_name
+        overflow = self._alog("error", msg, args, kwargs)
+        if overflow:
+            await self._overloaded(overflow)
 
-    def __repr__(self):
-        """repr for developers"""
-        return f"CSVHandler({self.file_name})"
+    async def acritical(self, msg, *args, **kwargs):
+        """Puts LogEntry with current date, message and critical level in the queue, see critical
 
-    def __str__(self):
-        """str for users"""
-        return self.file_name
+        Args:
+            msg (str, callable): Message that will be saved in LogEntry, format string when args or kwargs are
+            passed, or callable returning the message
+            args: Positional arguments used to format msg with str.format
+            kwargs: Keyword arguments used to format msg with str.format
+        """
+        overflow = self._alog("critical", msg, args, kwargs)
+        if overflow:
+            await self._overloaded(overflow)
+
+    async def aflush(self):
+        """Waits until all queued logs are saved, raises exception raised by a Handler since the last aflush"""
+        if self._writer_task is not None and self._loop is asyncio.get_running_loop():
+            await self._idle.wait()
+        elif self._queue:
+            # the writer task was started on another, now stopped, event loop
+            batch = list(self._queue)
+            self._queue.clear()
+            error = await asyncio.get_running_loop().run_in_executor(self.executor, self._save_queued, batch)
+            if error is not None and self._error is None:
+                self._error = error
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    async def aclose(self):
+        """Saves queued logs, flushes BufferingHandlers, stops the writer task and shuts down the executor
+        if it was created by AsyncProfilLogger, logging with coroutines after aclose raises ValueError"""
+        if self._closed:
+            return
+        try:
+            await self.aflush()
+        finally:
+            self._closed = True
+            if self._loop is asyncio.get_running_loop():
+                self._space.set()
+            if self._writer_task is not None and self._loop is asyncio.get_running_loop():
+                self._writer_task.cancel()
+                try:
+                    await self._writer_task
+                except asyncio.CancelledError:
+                    pass
+            flushes = [handler.flush for handler in self.handlers if isinstance(handler, BufferingHandler)]
+            for flush in flushes:
+                await asyncio.get_running_loop().run_in_executor(self.executor, flush)
+            if self._owns_executor:
+                self.executor.shutdown(wait=False)
+
+
+class Handler(abc.ABC):
+    """Base class of handlers accepted by ProfilLogger and ProfilLoggerReader, handlers need to subclass it
+    and be registered with register_handler. Only save method is required, other methods are optional
+    capabilities discovered by handler_capabilities and used by ProfilLogger and ProfilLoggerReader
+    to choose the fastest way of saving and reading logs:
+        read_raw() - yields (date, level, msg) tuples of strings, date in "%d %b %Y %H:%M:%S" format,
+            needed by ProfilLoggerReader
+        save_batch(log_entries) - saves list of LogEntry at once, saves logs one by one if not implemented
+        read_range(start=0, end=None) - yields (position, date, level, msg) tuples of logs from position start
+            until position end, used to read only part of the logs
+        seek_date(date) - returns position of the first log not before date, used by time ordered handlers
+        version() and grown_from(version) - version of saved logs and check if logs were only appended since it,
+            needed by ResultCache
+        count(text, regex, level, start_date, end_date) - returns number of matching logs
+        serialize(log_entry), write(data), serialize_batch(log_entries) and write_batch(data, count) - encode logs
+            and write encoded logs, save and save_batch need to do the same. ProfilLogger then encodes a log once
+            for all handlers of the same type. Not used when save or save_batch is overridden in a subclass
+            of the class defining write or write_batch, so the overridden method is called
+        supports_pushdown - True if handler filters logs itself with select, count, exists and count_by_level
+            methods, like SQLLiteHandler
+
+    Attributes:
+        supports_pushdown (bool): True if handler filters logs itself
+        time_ordered (bool): False by default, set it to True when logs are known to be saved in time order.
+            ProfilLoggerReader then starts reading at the first log past start_date, found with seek_date
+            when handler has it, and stops after end_date. Order is not assumed, because log_many accepts dates
+            and the file can be appended by other writers, it is set back to False when logs out of time order
+            are found in read logs
+    """
+    supports_pushdown = False
+    time_ordered = False
 
+    @abc.abstractmethod
     def save(self, log_entry):
-        """Saves LogEntry to a csv file specified in file_name
+        """Saves LogEntry
 
         Args:
             log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
         """
-        import csv
-        with open(self.file_name, "a", newline='') as csv_file:
-            csv_writer = csv.writer(csv_file, delimiter=',')
-            csv_writer.writerow([log_entry.date.strftime('%d %b %Y %H:%M:%S'), log_entry.level, log_entry.msg])
 
-    def read(self):
-        """Yields LogEntry from file specified in file_name"""
-        import csv
+    def save_batch(self, log_entries):
+        """Saves list of LogEntry one by one
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        for log_entry in log_entries:
+            self.save(log_entry)
+
+    def read_raw(self):
+        """Yields (date, level, msg) tuples of strings, handlers that can be read need to implement it"""
+        raise NotImplementedError(f"{type(self).__name__} cannot be read")
+
+    def read(self):
+        """Yields LogEntry of saved logs"""
+        for date, level, msg in self.read_raw():
+            yield LogEntry(msg=msg, level=level, date=date)
+
+
+# registered Handler subclasses accepted by ProfilLogger and ProfilLoggerReader
+HANDLERS = []
+
+
+def register_handler(handler_class):
+    """Registers Handler subclass, so ProfilLogger and ProfilLoggerReader accept it's instances,
+    can be used as class decorator
+
+    Args:
+        handler_class (type): Subclass of Handler
+    """
+    if not isinstance(handler_class, type) or not issubclass(handler_class, Handler):
+        raise TypeError("Handler needs to be a subclass of Handler")
+    if handler_class not in HANDLERS:
+        HANDLERS.append(handler_class)
+    return handler_class
+
+
+@functools.lru_cache(maxsize=None)
+def _serializes(handler_type):
+    """Returns True if handlers of handler_type have serialize capability, see Handler
+
+    Args:
+        handler_type (type): Subclass of Handler
+    """
+    names = ("serialize", "write", "serialize_batch", "write_batch")
+    if not all(callable(getattr(handler_type, name, None)) for name in names):
+        return False
+    defined_in = {name: next(cls for cls in handler_type.__mro__ if name in vars(cls))
+                  for name in names + ("save", "save_batch")}
+    return issubclass(defined_in["write"], defined_in["save"]) \
+        and issubclass(defined_in["write_batch"], defined_in["save_batch"])
+
+
+def handler_capabilities(handler):
+    """Returns frozenset of optional capabilities of handler: read, save_batch, read_range, seek_date, version,
+    count, serialize and supports_pushdown, see Handler
+
+    Args:
+        handler (Handler): Instance of registered Handler
+    """
+    capabilities = set()
+    if type(handler).read_raw is not Handler.read_raw:
+        capabilities.add("read")
+    if type(handler).save_batch is not Handler.save_batch:
+        capabilities.add("save_batch")
+    for name in ("read_range", "seek_date", "count"):
+        if callable(getattr(handler, name, None)):
+            capabilities.add(name)
+    if callable(getattr(handler, "version", None)) and callable(getattr(handler, "grown_from", None)):
+        capabilities.add("version")
+    if _serializes(type(handler)):
+        capabilities.add("serialize")
+    if getattr(handler, "supports_pushdown", False):
+        capabilities.add("supports_pushdown")
+    return frozenset(capabilities)
+
+
+class _FileBackedHandler(Handler):
+    """Base class of FileHandler, CSVHandler and JsonHandler, which append logs to a file through SharedWriter
+    shared by all handlers of the file and read records of the file by byte offsets. Subclasses encode logs
+    with serialize and serialize_batch methods and decode them with read_raw and _records methods
+
+    Attributes:
+        file_name (str): Name of a file to save to, or to read from. It works in current working directory.
+        index (Optional[TokenIndex]): Token index of the file, updated when logs are written
+        summaries (Optional[SegmentSummaries]): Segment summaries of the file, updated when logs are written
+        time_ordered (bool): False by default, see Handler
+    """
+
+    def __init__(self, file_name):
+        """_FileBackedHandler initializer
+
+        Args:
+            file_name (str): Initializes the file_name attribute
+        """
+        self.file_name = file_name
+        self.index = None
+        self.summaries = None
+        self.time_ordered = False
+        self._writer = None
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"{type(self).__name__}({self.file_name})"
+
+    def __str__(self):
+        """str for users"""
+        return self.file_name
+
+    def save(self, log_entry):
+        """Saves LogEntry to file specified in file_name
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        self.write(self.serialize(log_entry))
+
+    @abc.abstractmethod
+    def serialize(self, log_entry):
+        """Returns LogEntry encoded as a record of the file
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+
+    def write(self, data, count=1):
+        """Appends serialized logs to file specified in file_name, the file is written by SharedWriter
+        shared by all handlers of the file
+
+        Args:
+            data (bytes): Logs returned by serialize or serialize_batch method
+            count (Optional[int]): Number of logs in data
+        """
+        if self._writer is None:
+            self._writer = SharedWriter.acquire(self.file_name)
+        self._writer.write(data)
+        if self.index:
+            self.index.appended(count)
+        if self.summaries:
+            self.summaries.appended(count)
+
+    def save_batch(self, log_entries):
+        """Saves list of LogEntry to file specified in file_name with a single write
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        self.write_batch(self.serialize_batch(log_entries), len(log_entries))
+
+    def serialize_batch(self, log_entries):
+        """Returns list of LogEntry encoded as records of the file
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        return b"".join(self.serialize(log_entry) for log_entry in log_entries)
+
+    def write_batch(self, data, count):
+        """Appends serialized logs to file specified in file_name
+
+        Args:
+            data (bytes): Logs returned by serialize_batch method
+            count (int): Number of logs in data
+        """
+        self.write(data, count)
+
+    def flush(self):
+        """Writes logs buffered by writer of the file, the file is opened again when it was removed or replaced,
+        for example after log rotation"""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        """Releases writer of the file shared with other handlers, the file is closed by the last handler"""
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.release()
+
+    def __del__(self):
+        """Releases writer of the file when handler is removed"""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @abc.abstractmethod
+    def _records(self, file, start):
+        """Yields (offset, date, level, msg) tuples of records from binary file, starting at byte offset start
+
+        Args:
+            file (file): File specified in file_name opened in binary mode
+            start (int): Byte offset of the first record
+        """
+
+    def read_range(self, start=0, end=None):
+        """Yields (offset, date, level, msg) tuples of records from file specified in file_name,
+        starting at byte offset start, until record starting at byte offset end
+
+        Args:
+            start Optional([int]): Byte offset of the first record, needs to be the start of a record
+            end Optional([int]): Byte offset after the last record, reads to the end of the file if not specified
+        """
+        SharedWriter.flush_file(self.file_name)
+        with open(self.file_name, "rb") as file:
+            for record in self._records(file, start):
+                if end is not None and record[0] >= end:
+                    break
+                yield record
+
+    def read_at(self, offsets):
+        """Yields (offset, date, level, msg) tuples of records starting at given byte offsets,
+        the file is opened once
+
+        Args:
+            offsets (list): Sorted byte offsets of records
+        """
+        SharedWriter.flush_file(self.file_name)
+        with open(self.file_name, "rb") as file:
+            for offset in offsets:
+                records = self._records(file, offset)
+                yield next(records)
+                records.close()
+
+    def version(self):
+        """Returns version of file specified in file_name: (inode, size, modification time, last bytes),
+        or None if the file doesn't exist"""
+        SharedWriter.flush_file(self.file_name)
+        try:
+            with open(self.file_name, "rb") as file:
+                stat = os.fstat(file.fileno())
+                file.seek(max(0, stat.st_size - 32))
+                return stat.st_ino, stat.st_size, stat.st_mtime_ns, file.read(32)
+        except OSError:
+            return None
+
+    def grown_from(self, version):
+        """Returns True if logs were only appended to file specified in file_name since version was taken,
+        the file needs to be the same file with the same bytes before the previous end
+
+        Args:
+            version (tuple): Version returned by version method
+        """
+        inode, size, modification_time, last_bytes = version
+        try:
+            with open(self.file_name, "rb") as file:
+                stat = os.fstat(file.fileno())
+                if stat.st_ino != inode or stat.st_size <= size:
+                    return False
+                file.seek(max(0, size - 32))
+                return file.read(len(last_bytes)) == last_bytes
+        except OSError:
+            return False
+
+
+@register_handler
+class FileHandler(_FileBackedHandler):
+    """Class used to save and read LogEntry to and from .txt file
+
+    Attributes:
+        file_name (str): Name of a file to save to, or to read from. It works in current working directory.
+        time_ordered (bool): False by default, see Handler
+    """
+
+    def __new__(cls, entry="log.txt"):
+        """FileHandler constructor creates instance only if entry is viable file name in all OS
+
+        Args:
+        entry (Optional[str]): name of a file to save to or read from, will default to log.txt if not specified
+        """
+
+        if entry == "log.txt":
+            return super(FileHandler, cls).__new__(cls)
+
+        if not isinstance(entry, str):
+            raise TypeError("Input should be a string")
+
+        if len(entry) <= 4:
+            raise ValueError("File name must be at least 5 characters long and include .txt at the end")
+
+        if len(entry) >= 60:
+            raise ValueError("Length of file name cannot get past 60 characters")
+
+        if entry[-4:] != ".txt":
+            raise ValueError("Passed file name does not end with '.txt'")
+
+        if entry[-5] in [" ", "."]:
+            raise ValueError("It is not possible to have space or dot before .txt in file name")
+
+        invalid_characters = ["\\", "/", ":", "*", '"', "<", ">", "|"]
+        for character in entry[:-4]:
+            if character in invalid_characters:
+                raise ValueError(f"Any of the following are not allowed in a file name {invalid_characters}")
+        return super(FileHandler, cls).__new__(cls)
+
+    def __init__(self, file_name="log.txt"):
+        """FileHandler initializer
+
+        Args:
+            file_name (Optional[str]): Initializes the file_name attribute
+        """
+        super().__init__(file_name)
+
+    def serialize(self, log_entry):
+        """Returns LogEntry encoded as a line of txt file
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        return f"{log_entry.formatted_date()} ; {log_entry.level} ; {log_entry.msg}\n".encode(ENCODING)
+
+    def read_raw(self):
+        """Yields (date, level, msg) tuples of strings from file specified in file_name, without creating LogEntry"""
+        SharedWriter.flush_file(self.file_name)
+        with open(self.file_name, "r", newline="\n") as file:
+            for line in file:
+                date, level, msg = line.split(";", 2)
+                yield date.strip(), level.strip(), msg.strip()
+
+    def _records(self, file, start):
+        """Yields (offset, date, level, msg) tuples of records from binary file, starting at byte offset start
+
+        Args:
+            file (file): File specified in file_name opened in binary mode
+            start (int): Byte offset of the first record
+        """
+        file.seek(start)
+        offset = start
+        for line in file:
+            date, level, msg = line.decode(ENCODING).split(";", 2)
+            yield offset, date.strip(), level.strip(), msg.strip()
+            offset += len(line)
+
+    def seek_date(self, date):
+        """Returns byte offset of the first log with date not before date using binary search,
+        logs need to be in time order
+
+        Args:
+            date (datetime): Minimal date of the log
+        """
+        return _seek_date(self, date)
+
+
+@register_handler
+class CSVHandler(_FileBackedHandler):
+    """Class used to save and read LogEntry to and from .csv file
+
+    Attributes:
+        file_name (str): Name of a file to save to, or to read from. It works in current working directory.
+        time_ordered (bool): False by default, see Handler. CSVHandler has no seek_date, because quoted messages
+            can contain new lines, so reading starts at the beginning of the file and stops after end_date
+    """
+
+    def __new__(cls, entry="log.csv"):
+        """CSVHandler constructor creates instance only if entry is viable file name in all OS
+
+            Args:
+                entry (Optional[str]): name of a file to save to or read from, will default to log.csv if not specified
+        """
+        if entry == "log.csv":
+            return super(CSVHandler, cls).__new__(cls)
+
+        if not isinstance(entry, str):
+            raise TypeError("Input should be a string")
+
+        if len(entry) <= 4:
+            raise ValueError("File name must be at least 5 characters long and include .csv at the end")
+
+        if len(entry) >= 60:
+            raise ValueError("Length of file name cannot get past 60 characters")
+
+        if entry[-4:] != ".csv":
+            raise ValueError("Passed file name does not end with '.csv'")
+
+        if entry[-5] in [" ", "."]:
+            raise ValueError("It is not possible to have space or dot before .csv in file name")
+
+        invalid_characters = ["\\", "/", ":", "*", '"', "<", ">", "|"]
+        for character in entry[:-4]:
+            if character in invalid_characters:
+                raise ValueError(f"Any of the following are not allowed in a file name {invalid_characters}")
+        return super(CSVHandler, cls).__new__(cls)
+
+    def __init__(self, file_name="log.csv"):
+        """CSVHandler initializer
+
+        Args:
+            file_name (Optional[str]): Initializes the file_name attribute
+        """
+        super().__init__(file_name)
+
+    def serialize(self, log_entry):
+        """Returns LogEntry encoded as a row of csv file
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        import csv
+        import io
+        row = io.StringIO()
+        csv.writer(row, delimiter=',').writerow([log_entry.formatted_date(), log_entry.level, log_entry.msg])
+        return row.getvalue().encode(ENCODING)
+
+    def serialize_batch(self, log_entries):
+        """Returns list of LogEntry encoded as rows of csv file
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        import csv
+        import io
+        rows = io.StringIO()
+        csv.writer(rows, delimiter=',').writerows([log_entry.formatted_date(), log_entry.level, log_entry.msg]
+                                                  for log_entry in log_entries)
+        return rows.getvalue().encode(ENCODING)
+
+    def read_raw(self):
+        """Yields (date, level, msg) tuples of strings from file specified in file_name, without creating LogEntry"""
+        import csv
+        SharedWriter.flush_file(self.file_name)
         with open(self.file_name, "r") as csv_file:
             csv_reader = csv.reader(csv_file, delimiter=',')
             for row in csv_reader:
-                yield LogEntry(date=row[0], level=row[1], msg=row[2])
+                yield row[0], row[1], row[2]
+
+    def _records(self, file, start):
+        """Yields (offset, date, level, msg) tuples of records from binary file, starting at byte offset start,
+        records with quoted new lines can take many lines of the file
+
+        Args:
+            file (file): File specified in file_name opened in binary mode
+            start (int): Byte offset of the first record
+        """
+        import csv
+        file.seek(start)
+        position = [start]
+
+        def lines():
+            for line in file:
+                position[0] += len(line)
+                yield line.decode(ENCODING)
 
+        offset = start
+        for row in csv.reader(lines(), delimiter=','):
+            if row:
+                yield offset, row[0], row[1], row[2]
+            offset = position[0]
 
-class JsonHandler:
+
+@register_handler
+class JsonHandler(_FileBackedHandler):
     """Class used to save and read LogEntry to and from .json file
 
     Attributes:
         file_name (str): Name of a file to save to, or to read from. It works in current working directory.
+        time_ordered (bool): False by default, see Handler
     """
 
     def __new__(cls, entry="log.json"):
@@ -291,220 +1840,3286 @@ class JsonHandler:
         if entry == "log.json":
             return super(JsonHandler, cls).__new__(cls)
 
-        if not isinstance(entry, str):
-            raise TypeError("Input should be a string")
+        if not isinstance(entry, str):
+            raise TypeError("Input should be a string")
+
+        if len(entry) <= 5:
+            raise ValueError("File name must be at least 6 characters long and include .json at the end")
+
+        if len(entry) >= 60:
+            raise ValueError("Length of file name cannot get past 60 characters")
+
+        if entry[-5:] != ".json":
+            raise ValueError("Passed file name does not end with '.json'")
+
+        if entry[-6] in [" ", "."]:
+            raise ValueError("It is not possible to have space or dot before .json in file name")
+
+        invalid_characters = ["\\", "/", ":", "*", '"', "<", ">", "|"]
+        for character in entry[:-5]:
+            if character in invalid_characters:
+                raise ValueError(f"Any of the following are not allowed in a file name {invalid_characters}")
+        return super(JsonHandler, cls).__new__(cls)
+
+    def __init__(self, file_name="log.json"):
+        """JsonHandler initializer
+
+        Args:
+            file_name (Optional[str]): Initializes the file_name attribute
+        """
+        super().__init__(file_name)
+
+    def serialize(self, log_entry):
+        """Returns LogEntry encoded as a line of json file, LogEntry is not modified
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        log = {"date": log_entry.formatted_date(), "level": log_entry.level, "msg": log_entry.msg}
+        return (json.dumps(log) + "\n").encode(ENCODING)
+
+    def read_raw(self):
+        """Yields (date, level, msg) tuples of strings from file specified in file_name, without creating LogEntry"""
+        SharedWriter.flush_file(self.file_name)
+        with open(self.file_name, 'r') as json_file:
+            for line in json_file:
+                row = json.loads(line)
+                yield row["date"], row["level"], row["msg"]
+
+    def _records(self, file, start):
+        """Yields (offset, date, level, msg) tuples of records from binary file, starting at byte offset start
+
+        Args:
+            file (file): File specified in file_name opened in binary mode
+            start (int): Byte offset of the first record
+        """
+        file.seek(start)
+        offset = start
+        for line in file:
+            row = json.loads(line)
+            yield offset, row["date"], row["level"], row["msg"]
+            offset += len(line)
+
+    def seek_date(self, date):
+        """Returns byte offset of the first log with date not before date using binary search,
+        logs need to be in time order
+
+        Args:
+            date (datetime): Minimal date of the log
+        """
+        return _seek_date(self, date)
+
+
+@register_handler
+class SQLLiteHandler(Handler):
+    """Class used to save and read LogEntry to and from .sqlite file
+
+    Attributes:
+        file_name (str): Name of a file to save to, or to read from. It works in current working directory.
+        time_ordered (bool): False by default, see Handler
+    """
+    supports_pushdown = True
+
+    def __new__(cls, entry="log.sqlite"):
+        """SQLLiteHandler constructor creates instance only if entry is viable file name in all OS
+
+            Args:
+                entry (Optional[str]): name of a file to save to or read from, will default to log.sqlite if not specified
+        """
+
+        if entry == "log.sqlite":
+            return super(SQLLiteHandler, cls).__new__(cls)
+
+        if not isinstance(entry, str):
+            raise TypeError("Input should be a string")
+
+        if len(entry) <= 7:
+            raise ValueError("File name must be at least 8 characters long and include .sqlite at the end")
+
+        if len(entry) >= 60:
+            raise ValueError("Length of file name cannot get past 60 characters")
+
+        if entry[-7:] != ".sqlite":
+            raise ValueError("Passed file name does not end with '.sqlite'")
+
+        if entry[-8] in [" ", "."]:
+            raise ValueError("It is not possible to have space or dot before .sqlite in file name")
+
+        invalid_characters = ["\\", "/", ":", "*", '"', "<", ">", "|"]
+        for character in entry[:-7]:
+            if character in invalid_characters:
+                raise ValueError(f"Any of the following are not allowed in a file name {invalid_characters}")
+        return super(SQLLiteHandler, cls).__new__(cls)
+
+    def __init__(self, file_name="log.sqlite"):
+        """SQLLiteHandler initializer
+
+            Args:
+                file_name (Optional[str]): Initializes the file_name attribute
+        """
+        self.file_name = file_name
+        self.time_ordered = False
+
+    def save(self, log_entry):
+        """Saves LogEntry to a sqlite file specified in file_name
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        self.write(self.serialize(log_entry))
+
+    def serialize(self, log_entry):
+        """Returns LogEntry as parameters of sql INSERT
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        return log_entry.formatted_date(), log_entry.level, log_entry.msg
+
+    def write(self, data):
+        """Inserts serialized log to a sqlite file specified in file_name
+
+        Args:
+            data (tuple): Log returned by serialize method
+        """
+        self.write_batch([data], 1)
+
+    def save_batch(self, log_entries):
+        """Saves list of LogEntry to a sqlite file specified in file_name in a single transaction
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        self.write_batch(self.serialize_batch(log_entries), len(log_entries))
+
+    def serialize_batch(self, log_entries):
+        """Returns list of LogEntry as list of parameters of sql INSERT
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        return [self.serialize(log_entry) for log_entry in log_entries]
+
+    def write_batch(self, data, count):
+        """Inserts serialized logs to a sqlite file specified in file_name with executemany in a single transaction
+
+        Args:
+            data (list): Logs returned by serialize_batch method
+            count (int): Number of logs in data
+        """
+        import sqlite3
+        connection = sqlite3.connect(self.file_name)
+        try:
+            connection.execute("CREATE TABLE IF NOT EXISTS logs (date VARCHAR, level VARCHAR, msg VARCHAR);")
+            connection.executemany("INSERT INTO logs (date, level, msg) VALUES (?, ?, ?)", data)
+            connection.commit()
+        finally:
+            connection.close()
+
+    def read(self):
+        """Yields LogEntry from file specified in file_name"""
+        for date, level, msg in self.read_raw():
+            yield LogEntry(date=date, level=level, msg=msg)
+
+    def read_raw(self):
+        """Yields (date, level, msg) tuples of strings from file specified in file_name, without creating LogEntry"""
+        import sqlite3
+        connection = sqlite3.connect(self.file_name)
+        try:
+            cursor = connection.cursor()
+            for row in cursor.execute("SELECT date, level, msg FROM logs"):
+                yield row
+        finally:
+            connection.close()
+
+    def read_range(self, start=0, end=None):
+        """Yields (rowid, date, level, msg) tuples of logs with rowid from start, until rowid end
+
+        Args:
+            start Optional([int]): Rowid of the first log
+            end Optional([int]): Rowid after the last log, reads to the last log if not specified
+        """
+        import sqlite3
+        connection = sqlite3.connect(self.file_name)
+        try:
+            if end is None:
+                rows = connection.execute("SELECT rowid, date, level, msg FROM logs WHERE rowid >= ? ORDER BY rowid",
+                                          (start,))
+            else:
+                rows = connection.execute("SELECT rowid, date, level, msg FROM logs WHERE rowid >= ? AND rowid < ? "
+                                          "ORDER BY rowid", (start, end))
+            for row in rows:
+                yield row
+        finally:
+            connection.close()
+
+    def seek_date(self, date):
+        """Returns rowid of the first log with date not before date using binary search,
+        logs need to be in time order
+
+        Args:
+            date (datetime): Minimal date of the log
+        """
+        import sqlite3
+        connection = sqlite3.connect(self.file_name)
+        try:
+            size = (connection.execute("SELECT MAX(rowid) FROM logs").fetchone()[0] or 0) + 1
+
+            def probe(position):
+                return connection.execute("SELECT rowid, date FROM logs WHERE rowid >= ? ORDER BY rowid LIMIT 1",
+                                          (position,)).fetchone()
+
+            return _bisect_date(probe, size, date.isoformat())
+        finally:
+            connection.close()
+
+    def version(self):
+        """Returns version of file specified in file_name: (inode, rowid after the last log, number of logs),
+        or None if the file or logs table doesn't exist"""
+        import sqlite3
+        if not os.path.exists(self.file_name):
+            return None
+        connection = sqlite3.connect(self.file_name)
+        try:
+            max_rowid, count = connection.execute("SELECT MAX(rowid), COUNT(*) FROM logs").fetchone()
+            return os.stat(self.file_name).st_ino, (max_rowid or 0) + 1, count
+        except sqlite3.OperationalError:
+            return None
+        finally:
+            connection.close()
+
+    def grown_from(self, version):
+        """Returns True if logs were only appended to file specified in file_name since version was taken
+
+        Args:
+            version (tuple): Version returned by version method
+        """
+        import sqlite3
+        current = self.version()
+        if current is None or current[0] != version[0] or current[1] <= version[1]:
+            return False
+        connection = sqlite3.connect(self.file_name)
+        try:
+            return connection.execute("SELECT COUNT(*) FROM logs WHERE rowid < ?", (version[1],)).fetchone()[0] \
+                == version[2]
+        finally:
+            connection.close()
+
+    def _connect(self):
+        """Returns connection to file specified in file_name with log_iso and regexp sql functions,
+        log_iso converts saved date to iso format, so it can be compared in sql"""
+        import sqlite3
+        connection = sqlite3.connect(self.file_name)
+        connection.create_function("log_iso", 1, _iso_date, deterministic=True)
+        connection.create_function("regexp", 2, lambda regex, msg: re.search(regex, msg) is not None,
+                                   deterministic=True)
+        return connection
+
+    @staticmethod
+    def _where(text=None, regex=None, level=None, start_date=None, end_date=None):
+        """Returns sql WHERE clause and it's parameters filtering logs by passed arguments,
+        cheap conditions are placed before expensive ones
+
+        Args:
+            text Optional([str, tuple]): Text that msg must contain, or tuple of texts
+            regex Optional([str, tuple]): Regular expression that will be searched for in msg, or tuple of them
+            level Optional([str, tuple]): Level of the logs, or tuple of allowed levels
+            start_date Optional([datetime]): If passed will filter logs with date past the start_date
+            end_date Optional([datetime]): If passed will filter logs with date before the end_date
+        """
+        conditions, parameters = [], []
+        if isinstance(level, str):
+            conditions.append("level = ?")
+            parameters.append(level)
+        elif level is not None:
+            conditions.append(f"level IN ({', '.join('?' * len(level))})")
+            parameters.extend(level)
+        if start_date:
+            conditions.append("log_iso(date) >= ?")
+            parameters.append(start_date.isoformat())
+        if end_date:
+            conditions.append("log_iso(date) <= ?")
+            parameters.append(end_date.isoformat())
+        for text in [text] if isinstance(text, str) else text or ():
+            conditions.append("instr(msg, ?) > 0")
+            parameters.append(text)
+        for regex in [regex] if isinstance(regex, str) else regex or ():
+            conditions.append("msg REGEXP ?")
+            parameters.append(regex)
+        if not conditions:
+            return "", parameters
+        return " WHERE " + " AND ".join(conditions), parameters
+
+    def count(self, text=None, regex=None, level=None, start_date=None, end_date=None):
+        """Returns number of logs in file specified in file_name matching passed arguments using SELECT COUNT(*)
+
+        Args:
+            text Optional([str]): Text that msg must contain
+            regex Optional([str]): Regular expression that will be searched for in msg
+            level Optional([str]): Level of the logs
+            start_date Optional([datetime]): If passed will count logs with date past the start_date
+            end_date Optional([datetime]): If passed will count logs with date before the end_date
+        """
+        where, parameters = self._where(text, regex, level, start_date, end_date)
+        connection = self._connect()
+        try:
+            return connection.execute("SELECT COUNT(*) FROM logs" + where, parameters).fetchone()[0]
+        finally:
+            connection.close()
+
+    def select(self, text=None, regex=None, level=None, start_date=None, end_date=None):
+        """Yields (date, level, msg) tuples of logs in file specified in file_name matching passed arguments
+
+        Args:
+            text Optional([str, tuple]): Text that msg must contain, or tuple of texts
+            regex Optional([str, tuple]): Regular expression that will be searched for in msg, or tuple of them
+            level Optional([str, tuple]): Level of the logs, or tuple of allowed levels
+            start_date Optional([datetime]): If passed will filter logs with date past the start_date
+            end_date Optional([datetime]): If passed will filter logs with date before the end_date
+        """
+        where, parameters = self._where(text, regex, level, start_date, end_date)
+        connection = self._connect()
+        try:
+            for row in connection.execute("SELECT date, level, msg FROM logs" + where + " ORDER BY rowid", parameters):
+                yield row
+        finally:
+            connection.close()
+
+    def count_by_level(self, start_date=None, end_date=None, text=None, regex=None, level=None):
+        """Returns dict of levels and number of logs with given level in file specified in file_name
+
+        Args:
+            start_date Optional([datetime]): If passed will count logs with date past the start_date
+            end_date Optional([datetime]): If passed will count logs with date before the end_date
+            text Optional([str, tuple]): Text that msg must contain, or tuple of texts
+            regex Optional([str, tuple]): Regular expression that will be searched for in msg, or tuple of them
+            level Optional([str, tuple]): Level of the logs, or tuple of allowed levels
+        """
+        where, parameters = self._where(text, regex, level, start_date, end_date)
+        connection = self._connect()
+        try:
+            return dict(connection.execute("SELECT level, COUNT(*) FROM logs" + where + " GROUP BY level",
+                                           parameters))
+        finally:
+            connection.close()
+
+    def exists(self, text=None, regex=None, level=None, start_date=None, end_date=None):
+        """Returns True if any log in file specified in file_name matches passed arguments, stops on first match
+
+        Args:
+            text Optional([str]): Text that msg must contain
+            regex Optional([str]): Regular expression that will be searched for in msg
+            level Optional([str]): Level of the logs
+            start_date Optional([datetime]): If passed will look for logs with date past the start_date
+            end_date Optional([datetime]): If passed will look for logs with date before the end_date
+        """
+        where, parameters = self._where(text, regex, level, start_date, end_date)
+        connection = self._connect()
+        try:
+            return connection.execute("SELECT 1 FROM logs" + where + " LIMIT 1", parameters).fetchone() is not None
+        finally:
+            connection.close()
+
+
+# BufferingHandler and SocketHandler instances flushed at exit
+_buffering_handlers = None
+
+
+def _flush_buffering_handlers():
+    """Flushes all BufferingHandler and SocketHandler instances, registered with atexit"""
+    for handler in list(_buffering_handlers):
+        handler.flush()
+
+
+def _flush_at_exit(handler):
+    """Adds handler to handlers flushed at exit and reset in child process after fork
+
+    Args:
+        handler (Handler): BufferingHandler or SocketHandler
+    """
+    global _buffering_handlers
+    if _buffering_handlers is None:
+        _buffering_handlers = weakref.WeakSet()
+        atexit.register(_flush_buffering_handlers)
+    _buffering_handlers.add(handler)
+
+
+def _clear_buffering_handlers():
+    """Resets BufferingHandler and SocketHandler instances in child process after fork, buffered logs are saved
+    by the parent"""
+    for handler in list(_buffering_handlers or ()):
+        handler._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clear_buffering_handlers)
+
+
+@register_handler
+class BufferingHandler(Handler):
+    """Handler keeping logs in memory and saving them to the wrapped handler in a single batch,
+    when capacity logs are buffered, when log with level equal or greater than flush_level is saved,
+    or flush_interval seconds after the first buffered log. Buffered logs are also saved at exit
+
+    Attributes:
+        handler (Handler): Wrapped FileHandler, CSVHandler, JsonHandler or SQLLiteHandler
+        capacity (int): Maximal number of buffered logs
+        flush_level (str): One of LEVELS, logs with this level or greater are saved immediately with buffered logs
+        flush_interval (float): Maximal number of seconds logs are kept in memory, logs are kept until
+            one of the other conditions if not specified
+    """
+
+    def __init__(self, handler, capacity=1000, flush_level="error", flush_interval=None):
+        """BufferingHandler initializer
+
+        Args:
+            handler (Handler): Initializes the handler attribute
+            capacity (Optional[int]): Initializes the capacity attribute
+            flush_level (Optional[str]): Initializes the flush_level attribute
+            flush_interval (Optional[float]): Initializes the flush_interval attribute
+        """
+        if not isinstance(handler, Handler):
+            raise TypeError("Unsupported type passed as Handler")
+        if not isinstance(capacity, int) or capacity < 1:
+            raise ValueError("capacity needs to be a positive integer")
+        if flush_level not in LEVELS:
+            raise ValueError(f"flush_level needs to be one of {list(LEVELS)}")
+        if flush_interval is not None and (not isinstance(flush_interval, (int, float)) or flush_interval <= 0):
+            raise ValueError("flush_interval needs to be a positive number")
+        self.handler = handler
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self.flush_interval = flush_interval
+        self._flush_value = LEVELS[flush_level]
+        self._buffer = []
+        self._timer = None
+        self._lock = threading.RLock()
+        _flush_at_exit(self)
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"BufferingHandler({self.handler!r}, capacity={self.capacity}, flush_level={self.flush_level})"
+
+    def __str__(self):
+        """str for users"""
+        return str(self.handler)
+
+    def __len__(self):
+        """Returns number of buffered logs"""
+        return len(self._buffer)
+
+    def save(self, log_entry):
+        """Buffers LogEntry, buffered logs are saved when the buffer is full or level of the log is not below
+        flush_level
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        self.save_batch([log_entry])
+
+    def save_batch(self, log_entries):
+        """Buffers list of LogEntry, buffered logs are saved when the buffer is full or level of any log
+        is not below flush_level
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        with self._lock:
+            self._buffer.extend(log_entries)
+            if len(self._buffer) >= self.capacity \
+                    or any(LEVELS.get(log_entry.level, 0) >= self._flush_value for log_entry in log_entries):
+                self.flush()
+            elif self.flush_interval is not None and self._timer is None and self._buffer:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Saves all buffered logs to the wrapped handler in a single batch"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            log_entries, self._buffer = self._buffer, []
+            if log_entries:
+                self.handler.save_batch(log_entries)
+
+    def close(self):
+        """Saves buffered logs and closes the wrapped handler"""
+        self.flush()
+        _buffering_handlers.discard(self)
+        close = getattr(self.handler, "close", None)
+        if close:
+            close()
+
+    def _after_fork(self):
+        """Clears buffer in child process after fork and replaces lock and timer, which are not copied to the child"""
+        self._lock = threading.RLock()
+        self._timer = None
+        self._buffer = []
+
+
+@register_handler
+class RingBufferHandler(Handler):
+    """Handler keeping the last capacity logs, or the last logs of total size up to max_bytes, in memory.
+    Logs are stored in preallocated columns used as a ring buffer, saving a log and removing the oldest one is O(1)
+    and doesn't write to any file. ProfilLoggerReader reads the logs from memory, snapshot method saves them
+    to a persistent handler
+
+    Attributes:
+        capacity (int): Maximal number of kept logs
+        max_bytes (int): Maximal size of kept logs, counted as size of their lines in txt file,
+            logs are limited only by capacity if not specified
+        file_name (None): RingBufferHandler doesn't have a file
+        time_ordered (bool): False by default, see Handler
+    """
+    # size of the date, two " ; " separators and new line of a log's line in txt file
+    LINE_OVERHEAD = len(f"{datetime.datetime(2000, 1, 1):%d %b %Y %H:%M:%S} ;  ; \n".encode(ENCODING))
+
+    def __init__(self, capacity=10000, max_bytes=None):
+        """RingBufferHandler initializer
+
+        Args:
+            capacity (Optional[int]): Initializes the capacity attribute
+            max_bytes (Optional[int]): Initializes the max_bytes attribute
+        """
+        if not isinstance(capacity, int) or capacity < 1:
+            raise ValueError("capacity needs to be a positive integer")
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes < 1):
+            raise ValueError("max_bytes needs to be a positive integer")
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.file_name = None
+        self.time_ordered = False
+        self._dates = [None] * capacity
+        self._levels = [None] * capacity
+        self._msgs = [None] * capacity
+        self._sizes = [0] * capacity
+        # sequence numbers of the oldest log and of the next saved log, log is kept in slot sequence % capacity
+        self._first = 0
+        self._next = 0
+        self._bytes = 0
+        self._token = object()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"RingBufferHandler(capacity={self.capacity}, max_bytes={self.max_bytes})"
+
+    def __str__(self):
+        """str for users"""
+        return "ring buffer"
+
+    def __len__(self):
+        """Returns number of kept logs"""
+        return self._next - self._first
+
+    def _remove_oldest(self):
+        """Removes the oldest log, needs to be called with the lock"""
+        slot = self._first % self.capacity
+        self._bytes -= self._sizes[slot]
+        self._dates[slot] = self._levels[slot] = self._msgs[slot] = None
+        self._first += 1
+
+    def save(self, log_entry):
+        """Keeps LogEntry in memory, removes the oldest log when capacity or max_bytes is exceeded
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        self.save_batch([log_entry])
+
+    def save_batch(self, log_entries):
+        """Keeps list of LogEntry in memory, removes the oldest logs when capacity or max_bytes is exceeded
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        with self._lock:
+            for log_entry in log_entries:
+                if self._next - self._first == self.capacity:
+                    self._remove_oldest()
+                slot = self._next % self.capacity
+                self._dates[slot] = log_entry.date
+                self._levels[slot] = log_entry.level
+                self._msgs[slot] = log_entry.msg
+                self._next += 1
+                if self.max_bytes is not None:
+                    size = self.LINE_OVERHEAD + len(log_entry.level.encode(ENCODING)) \
+                        + len(log_entry.msg.encode(ENCODING))
+                    self._sizes[slot] = size
+                    self._bytes += size
+                    while self._bytes > self.max_bytes and self._next - self._first > 1:
+                        self._remove_oldest()
+
+    def clear(self):
+        """Removes all kept logs"""
+        with self._lock:
+            while self._first < self._next:
+                self._remove_oldest()
+
+    def read_range(self, start=0, end=None):
+        """Yields (sequence number, date, level, msg) tuples of kept logs with sequence number from start,
+        until sequence number end. Logs are copied at the call, logs saved later are not yielded
+
+        Args:
+            start Optional([int]): Sequence number of the first log
+            end Optional([int]): Sequence number after the last log, reads to the last log if not specified
+        """
+        with self._lock:
+            first = max(start, self._first)
+            last = self._next if end is None else min(end, self._next)
+            slots = [sequence % self.capacity for sequence in range(first, last)]
+            records = [(self._dates[slot], self._levels[slot], self._msgs[slot]) for slot in slots]
+        for sequence, (date, level, msg) in enumerate(records, first):
+            yield sequence, date.strftime("%d %b %Y %H:%M:%S"), level, msg
+
+    def read_raw(self):
+        """Yields (date, level, msg) tuples of strings of kept logs, without creating LogEntry"""
+        for sequence, date, level, msg in self.read_range():
+            yield date, level, msg
+
+    def read(self):
+        """Yields LogEntry of kept logs"""
+        with self._lock:
+            slots = [sequence % self.capacity for sequence in range(self._first, self._next)]
+            records = [(self._dates[slot], self._levels[slot], self._msgs[slot]) for slot in slots]
+        for date, level, msg in records:
+            yield LogEntry(msg=msg, level=level, date=date)
+
+    def snapshot(self, handler):
+        """Saves kept logs to a persistent handler in a single batch, returns number of saved logs
+
+        Args:
+            handler (Handler): FileHandler, CSVHandler, JsonHandler or SQLLiteHandler
+        """
+        if not isinstance(handler, Handler):
+            raise TypeError("Unsupported type passed as Handler")
+        log_entries = list(self.read())
+        if log_entries:
+            handler.save_batch(log_entries)
+        return len(log_entries)
+
+    def seek_date(self, date):
+        """Returns sequence number of the first log with date not before date using binary search,
+        logs need to be in time order
+
+        Args:
+            date (datetime): Minimal date of the log
+        """
+        def probe(position):
+            with self._lock:
+                position = max(position, self._first)
+                if position >= self._next:
+                    return None
+                return position, self._dates[position % self.capacity].strftime("%d %b %Y %H:%M:%S")
+
+        return _bisect_date(probe, self._next, date.isoformat())
+
+    def version(self):
+        """Returns version of kept logs: (token of the handler, sequence number of the next log,
+        sequence number of the oldest log)"""
+        with self._lock:
+            return self._token, self._next, self._first
+
+    def grown_from(self, version):
+        """Returns True if logs were only saved and no log was removed since version was taken
+
+        Args:
+            version (tuple): Version returned by version method
+        """
+        token, next_sequence, first = self.version()
+        return token is version[0] and first == version[2] and next_sequence > version[1]
+
+
+@register_handler
+class QueueHandler(Handler):
+    """Lightweight handler of worker processes, sends (date, level, msg) records of logs through
+    multiprocessing queue to LogCollector process, which saves them with it's handlers. Created by LogCollector.handler.
+    When bounded queue is full, block policy waits up to block_timeout seconds and drop_newest drops the logs
+
+    Attributes:
+        queue (multiprocessing.Queue): Queue of LogCollector
+        overload (OverloadPolicy): Policy of the queue, block or drop_newest, counts dropped logs of the process
+    """
+
+    def __init__(self, queue, overload="block", block_timeout=None):
+        """QueueHandler initializer
+
+        Args:
+            queue (multiprocessing.Queue): Initializes the queue attribute
+            overload (Optional[str]): block or drop_newest, logs cannot be removed from the queue by other policies
+            block_timeout (Optional[float]): Maximal number of seconds to wait for space in the queue with block
+                policy, waits until there is space if not passed
+        """
+        if not callable(getattr(queue, "put", None)):
+            raise TypeError("queue needs to be a multiprocessing queue")
+        if overload not in ("block", "drop_newest"):
+            raise ValueError("overload needs to be block or drop_newest")
+        self.queue = queue
+        self.overload = OverloadPolicy(None, overload, block_timeout)
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"QueueHandler({self.queue!r})"
+
+    def save(self, log_entry):
+        """Sends record of LogEntry to LogCollector
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        self.save_batch((log_entry,))
+
+    def save_batch(self, log_entries):
+        """Sends records of list of LogEntry to LogCollector in a single message, with summary of logs dropped
+        since the last message
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        import queue as queues
+        records = [(log_entry.date, log_entry.level, log_entry.msg) for log_entry in log_entries]
+        summary = self.overload.summary()
+        if summary is not None:
+            records.append((summary.date, summary.level, summary.msg))
+        try:
+            self.queue.put(tuple(records), self.overload.policy == "block", self.overload.block_timeout)
+        except queues.Full:
+            self.overload.drop(log_entries)
+            return
+        if summary is not None:
+            self.overload.reported()
+
+
+def _collect(queue, handlers, max_batch):
+    """Target of LogCollector process, saves records received from QueueHandlers with handlers in batches
+    of up to max_batch logs, until None is received and the queue is empty. Handlers are closed at the end
+
+    Args:
+        queue (multiprocessing.Queue): Queue of messages, tuples of (date, level, msg) records
+        handlers (list): List of Handlers
+        max_batch (int): Maximal number of logs saved at once
+    """
+    import queue as queues
+    import signal
+    import traceback
+    # interrupt of the process group stops workers, the collector is stopped by LogCollector.stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logger = ProfilLogger(handlers)
+    stopping = False
+    while True:
+        log_entries = []
+        try:
+            message = queue.get_nowait() if stopping else queue.get()
+            while True:
+                if message is None:
+                    stopping = True
+                else:
+                    log_entries.extend(LogEntry(msg, level, date) for date, level, msg in message)
+                if len(log_entries) >= max_batch:
+                    break
+                message = queue.get_nowait()
+        except queues.Empty:
+            pass
+        if not log_entries:
+            if stopping:
+                break
+            continue
+        try:
+            logger._save_batch(log_entries)
+        except Exception:
+            traceback.print_exc()
+    for handler in handlers:
+        close = getattr(handler, "close", None)
+        if close:
+            close()
+
+
+# started LogCollector instances stopped at exit
+_log_collectors = None
+
+
+def _stop_log_collectors():
+    """Stops all started LogCollector instances, registered with atexit"""
+    for collector in list(_log_collectors):
+        collector.stop()
+
+
+class LogCollector:
+    """Single writer process of logs of many processes. Worker processes log with ProfilLogger using QueueHandler
+    returned by handler method, which sends compact (date, level, msg) records through multiprocessing queue,
+    and the collector process saves them with it's handlers in batches, so only one process writes to the files.
+    Works with fork, spawn and forkserver start methods, handlers need to be picklable for spawn and forkserver.
+    Queue is unbounded, unless max_queue is passed, then QueueHandlers block or drop logs when it is full
+
+    Example:
+        with LogCollector([FileHandler("app.txt")]) as collector:
+            pool = multiprocessing.Pool(initializer=init_worker, initargs=(collector.handler(),))
+
+    Attributes:
+        handlers (list): List of Handlers used by the collector process
+        max_batch (int): Maximal number of logs saved at once
+        queue (multiprocessing.Queue): Queue of records sent by QueueHandlers
+        process (multiprocessing.Process): Collector process
+        overload (str): block or drop_newest, overload policy of QueueHandlers
+        block_timeout (float): Maximal number of seconds QueueHandlers wait for space in the queue
+    """
+
+    def __init__(self, handlers, max_batch=1000, start_method=None, max_queue=None, overload="block",
+                 block_timeout=None):
+        """LogCollector initializer, the collector process is started by start method
+
+        Args:
+            handlers (list): Initializes the handlers attribute
+            max_batch (Optional[int]): Initializes the max_batch attribute
+            start_method (Optional[str]): fork, spawn or forkserver, default start method of multiprocessing
+                if not passed
+            max_queue (Optional[int]): Maximal number of messages in the queue, every save or log_many of a worker
+                sends one message, queue is unbounded if not passed
+            overload (Optional[str]): Initializes the overload attribute
+            block_timeout (Optional[float]): Initializes the block_timeout attribute
+        """
+        import multiprocessing
+        if not isinstance(handlers, list) or len(handlers) == 0:
+            raise TypeError("handlers needs to be a non empty list")
+        for handler in handlers:
+            if not isinstance(handler, tuple(HANDLERS)) or isinstance(handler, QueueHandler):
+                raise TypeError("Unsupported type passed as Handler")
+        if isinstance(max_batch, bool) or not isinstance(max_batch, int):
+            raise TypeError("max_batch needs to be an int")
+        if max_batch < 1:
+            raise ValueError("max_batch needs to be greater than 0")
+        if overload not in ("block", "drop_newest"):
+            raise ValueError("overload needs to be block or drop_newest")
+        OverloadPolicy(max_queue, overload, block_timeout)  # validates max_queue and block_timeout
+        context = multiprocessing.get_context(start_method)
+        self.handlers = handlers
+        self.max_batch = max_batch
+        self.overload = overload
+        self.block_timeout = block_timeout
+        self.queue = context.Queue(max_queue or 0)
+        self.process = context.Process(target=_collect, args=(self.queue, handlers, max_batch),
+                                       name="LogCollector")
+        self._pid = os.getpid()
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"LogCollector(handlers={self.handlers}, max_batch={self.max_batch})"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def handler(self):
+        """Returns QueueHandler sending logs to the collector, can be passed to worker processes"""
+        return QueueHandler(self.queue, self.overload, self.block_timeout)
+
+    def start(self):
+        """Starts the collector process, it is stopped by stop method or at exit"""
+        global _log_collectors
+        self.process.start()
+        if _log_collectors is None:
+            _log_collectors = weakref.WeakSet()
+            atexit.register(_stop_log_collectors)
+        _log_collectors.add(self)
+
+    def stop(self, timeout=None):
+        """Stops the collector process after all logs sent before are saved, workers should be stopped first,
+        logs sent after stop are lost. Does nothing in processes other than the one that created the collector
+
+        Args:
+            timeout (Optional[float]): Maximal number of seconds to wait for the collector, waits until all logs
+                are saved if not passed
+        """
+        if os.getpid() != self._pid or not self.process.is_alive():
+            return
+        self.queue.put(None)
+        self.process.join(timeout)
+        if not self.process.is_alive():
+            _log_collectors.discard(self)
+
+
+# frame of SocketHandler protocol: size of the payload and number of records, followed by records
+SOCKET_FRAME = struct.Struct("<II")
+# record of the payload: microseconds since 1970-01-01 of LogEntry date, size of level and size of msg,
+# followed by level and msg encoded in utf-8
+SOCKET_RECORD = struct.Struct("<qBI")
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _encode_frame(log_entries):
+    """Returns frame of SocketHandler protocol with records of log_entries
+
+    Args:
+        log_entries (list): List of LogEntry instances
+    """
+    parts = []
+    for log_entry in log_entries:
+        level = log_entry.level.encode("utf-8")
+        msg = str(log_entry.msg).encode("utf-8")
+        parts += SOCKET_RECORD.pack((log_entry.date - _EPOCH) // datetime.timedelta(microseconds=1), len(level),
+                                    len(msg)), level, msg
+    payload = b"".join(parts)
+    return SOCKET_FRAME.pack(len(payload), len(log_entries)) + payload
+
+
+def _decode_frame(payload, count):
+    """Returns list of LogEntry decoded from payload of a frame of SocketHandler protocol,
+    raises ValueError if payload is malformed or has unknown level
+
+    Args:
+        payload (bytes): Payload of the frame
+        count (int): Number of records in the payload
+    """
+    log_entries = []
+    position = 0
+    try:
+        for _ in range(count):
+            microseconds, level_size, msg_size = SOCKET_RECORD.unpack_from(payload, position)
+            position += SOCKET_RECORD.size
+            level = payload[position:position + level_size].decode("utf-8")
+            if level not in LEVELS:
+                raise ValueError("Malformed frame")
+            position += level_size
+            msg = payload[position:position + msg_size].decode("utf-8")
+            position += msg_size
+            log_entries.append(LogEntry(msg, level, _EPOCH + datetime.timedelta(microseconds=microseconds)))
+    except (struct.error, OverflowError) as error:
+        raise ValueError("Malformed frame") from error
+    if position != len(payload):
+        raise ValueError("Malformed frame")
+    return log_entries
+
+
+@register_handler
+class SocketHandler(Handler):
+    """Client of LogServer, sends logs in batches through Unix domain socket or TCP connection, which is kept open
+    and reused. Logs are sent by a timer thread when batch_size logs are buffered and flush_interval seconds after
+    the first buffered log, so saving a log only buffers it and doesn't wait for the server. Logs are also sent
+    by flush and close methods and at exit. Logs that cannot be sent, because the server is not running, stay in
+    the buffer of up to capacity logs and are sent after reconnection. When the buffer is full, overload policy is
+    applied, the oldest logs are dropped by default, block policy waits for the server up to block_timeout seconds
+
+    Attributes:
+        path (str): Path of Unix domain socket of LogServer, host and port are used if not specified
+        host (str): Host of LogServer
+        port (int): TCP port of LogServer
+        batch_size (int): Maximal number of logs sent at once
+        flush_interval (float): Maximal number of seconds logs are kept in the buffer while the server is running
+        capacity (int): Maximal number of logs kept in the buffer
+        timeout (float): Timeout of connecting and sending in seconds
+        retry_interval (float): Minimal number of seconds between attempts to connect
+        overload (OverloadPolicy): Policy of the buffer, counts dropped logs
+    """
+
+    def __init__(self, path=None, host="127.0.0.1", port=None, batch_size=100, flush_interval=0.5, capacity=10000,
+                 timeout=1.0, retry_interval=1.0, overload="drop_oldest", block_timeout=None):
+        """SocketHandler initializer
+
+        Args:
+            path (Optional[str]): Initializes the path attribute
+            host (Optional[str]): Initializes the host attribute
+            port (Optional[int]): Initializes the port attribute, needed if path is not specified
+            batch_size (Optional[int]): Initializes the batch_size attribute
+            flush_interval (Optional[float]): Initializes the flush_interval attribute
+            capacity (Optional[int]): Initializes the capacity attribute
+            timeout (Optional[float]): Initializes the timeout attribute
+            retry_interval (Optional[float]): Initializes the retry_interval attribute
+            overload (Optional[str]): One of OVERLOAD_POLICIES, applied when the buffer is full
+            block_timeout (Optional[float]): Maximal number of seconds to wait for the server with block policy,
+                waits until logs are sent if not passed
+        """
+        if path is not None and not isinstance(path, str):
+            raise TypeError("path needs to be a string")
+        if path is None and (isinstance(port, bool) or not isinstance(port, int)):
+            raise TypeError("path or port needs to be passed")
+        for name, value in [("batch_size", batch_size), ("capacity", capacity)]:
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} needs to be a positive integer")
+        for name, value in [("flush_interval", flush_interval), ("timeout", timeout),
+                            ("retry_interval", retry_interval)]:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"{name} needs to be a positive number")
+        self.path = path
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.overload = OverloadPolicy(capacity, overload, block_timeout)
+        self._buffer = collections.deque()
+        self._socket = None
+        self._next_attempt = 0
+        self._timer = None
+        self._due = None
+        self._lock = threading.RLock()
+        self._space = threading.Condition(self._lock)
+        # held while connecting and sending, the buffer is guarded by _lock, so logs are saved in the meantime
+        self._send_lock = threading.Lock()
+        _flush_at_exit(self)
+
+    def __repr__(self):
+        """repr for developers"""
+        address = self.path if self.path is not None else f"{self.host}:{self.port}"
+        return f"SocketHandler({address}, batch_size={self.batch_size})"
+
+    def __len__(self):
+        """Returns number of logs, which are not sent yet"""
+        return len(self._buffer)
+
+    @property
+    def dropped(self):
+        """Number of logs dropped because the buffer was full"""
+        return self.overload.dropped
+
+    def save(self, log_entry):
+        """Buffers LogEntry, buffered logs are sent by the timer thread when batch_size logs are buffered
+
+        Args:
+            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        self.save_batch([log_entry])
+
+    def save_batch(self, log_entries):
+        """Buffers list of LogEntry, buffered logs are sent by the timer thread when batch_size logs are buffered
+
+        Args:
+            log_entries (list): List of LogEntry instances
+        """
+        with self._lock:
+            if len(self._buffer) + len(log_entries) > self.capacity:
+                if self.overload.policy == "block":
+                    self._wait_for_space(len(log_entries))
+                log_entries = self.overload.admit(self._buffer, log_entries)
+            self._buffer.extend(log_entries)
+            if len(self._buffer) >= self.batch_size:
+                self._start_timer(0)
+            elif self._buffer:
+                self._start_timer(self.flush_interval)
+
+    def flush(self):
+        """Sends buffered logs in frames of up to batch_size logs, logs that cannot be sent stay in the buffer
+        and are sent again after flush_interval. Connecting and sending is done without the lock of the buffer,
+        so logs are saved by other threads in the meantime"""
+        with self._send_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                summary = self.overload.summary()
+            if summary is not None and self._connect():
+                with self._lock:
+                    self._buffer.append(summary)
+                    self.overload.reported()
+            while self._connect():
+                with self._lock:
+                    batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                if not batch:
+                    break
+                try:
+                    self._socket.sendall(_encode_frame(batch))
+                except OSError:
+                    # partially sent frame is dropped by the server with the connection
+                    self._disconnect()
+                    with self._lock:
+                        self._buffer.extendleft(reversed(batch))
+                        while len(self._buffer) > self.capacity:
+                            self.overload.drop([self._buffer.pop()])
+                    break
+                with self._lock:
+                    self._space.notify_all()
+            with self._lock:
+                if self._buffer:
+                    self._start_timer(self.flush_interval)
+
+    def _wait_for_space(self, count):
+        """Waits until count logs fit in the buffer, sent by the timer thread, or block_timeout expires,
+        must be called with the lock
+
+        Args:
+            count (int): Number of logs to buffer
+        """
+        deadline = None if self.overload.block_timeout is None else time.monotonic() + self.overload.block_timeout
+        while self._buffer and len(self._buffer) + count > self.capacity:
+            self._start_timer(0)
+            timeout = self.retry_interval if deadline is None else min(self.retry_interval, deadline - time.monotonic())
+            if timeout <= 0:
+                break
+            self._space.wait(timeout)
+
+    def close(self):
+        """Sends buffered logs and closes the connection, logs that cannot be sent are lost"""
+        self.flush()
+        with self._send_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            self._disconnect()
+        _buffering_handlers.discard(self)
+
+    def _start_timer(self, delay):
+        """Starts timer flushing the buffer after delay seconds, unless the running timer flushes it sooner,
+        must be called with the lock
+
+        Args:
+            delay (float): Number of seconds before the buffer is flushed
+        """
+        due = time.monotonic() + delay
+        if self._timer is not None:
+            if self._due <= due:
+                return
+            self._timer.cancel()
+        self._due = due
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _connect(self):
+        """Returns True if connected to the server, connects at most once per retry_interval"""
+        if self._socket is not None:
+            return True
+        now = time.monotonic()
+        if now < self._next_attempt:
+            return False
+        self._next_attempt = now + self.retry_interval
+        try:
+            if self.path is not None:
+                connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                connection.settimeout(self.timeout)
+                try:
+                    connection.connect(self.path)
+                except OSError:
+                    connection.close()
+                    raise
+            else:
+                connection = socket.create_connection((self.host, self.port), self.timeout)
+        except OSError:
+            return False
+        self._socket = connection
+        return True
+
+    def _disconnect(self):
+        """Closes the connection"""
+        connection, self._socket = self._socket, None
+        if connection is not None:
+            connection.close()
+
+    def _after_fork(self):
+        """Clears buffer in child process after fork, replaces lock and timer, which are not copied to the child,
+        and closes child's copy of the connection"""
+        self._lock = threading.RLock()
+        self._space = threading.Condition(self._lock)
+        self._send_lock = threading.Lock()
+        self._timer = None
+        self._buffer = collections.deque()
+        self._disconnect()
+
+
+class LogServer:
+    """asyncio server collecting logs sent by SocketHandler clients of many processes through Unix domain socket
+    or localhost TCP. Received logs are saved with handlers in batches by AsyncProfilLogger, which writes
+    in a thread pool, so the server keeps receiving logs while they are saved. With bounded queue and block policy
+    the server stops reading from connections while the queue is full, so clients buffer their logs
+
+    Example:
+        async with LogServer([SQLLiteHandler("host.sqlite")], path="/tmp/logs.sock") as server:
+            await server.serve_forever()
+
+    Attributes:
+        handlers (list): List of Handlers saving received logs
+        path (str): Path of Unix domain socket, TCP is used if not specified
+        host (str): Host of TCP server
+        port (int): Port of TCP server, port chosen by the system after start if 0 was passed
+        logger (AsyncProfilLogger): Logger saving received logs
+        received (int): Number of received logs
+        max_frame_size (int): Maximal size of a frame payload in bytes, connection sending bigger frame is closed
+    """
+    max_frame_size = 16 * 1024 * 1024
+
+    def __init__(self, handlers, path=None, host="127.0.0.1", port=0, max_batch=1000, max_queue=None,
+                 overload="block", block_timeout=None):
+        """LogServer initializer, the server is started by start method
+
+        Args:
+            handlers (list): Initializes the handlers attribute
+            path (Optional[str]): Initializes the path attribute
+            host (Optional[str]): Initializes the host attribute
+            port (Optional[int]): Initializes the port attribute
+            max_batch (Optional[int]): Maximal number of logs saved at once
+            max_queue (Optional[int]): Maximal number of queued logs of the logger, unbounded if not passed
+            overload (Optional[str]): Overload policy of the logger, one of OVERLOAD_POLICIES
+            block_timeout (Optional[float]): Maximal number of seconds to wait for space in the queue with block
+                policy
+        """
+        if path is not None and not isinstance(path, str):
+            raise TypeError("path needs to be a string")
+        if isinstance(port, bool) or not isinstance(port, int):
+            raise TypeError("port needs to be an int")
+        self.logger = AsyncProfilLogger(handlers, max_batch=max_batch, max_queue=max_queue, overload=overload,
+                                        block_timeout=block_timeout)
+        self.handlers = handlers
+        self.path = path
+        self.host = host
+        self.port = port
+        self.received = 0
+        self._server = None
+        # writers of open client connections by their tasks
+        self._connections = {}
+
+    def __repr__(self):
+        """repr for developers"""
+        address = self.path if self.path is not None else f"{self.host}:{self.port}"
+        return f"LogServer({address}, handlers={self.handlers})"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def start(self):
+        """Starts listening on the Unix domain socket or TCP port"""
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, self.path)
+        else:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Starts the server if needed and serves until the task is cancelled"""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def _serve(self, reader, writer):
+        """Reads frames from a client connection and puts received logs in logger's queue, malformed frame
+        closes the connection
+
+        Args:
+            reader (asyncio.StreamReader): Reader of the connection
+            writer (asyncio.StreamWriter): Writer of the connection
+        """
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                header = await reader.readexactly(SOCKET_FRAME.size)
+                size, count = SOCKET_FRAME.unpack(header)
+                if size > self.max_frame_size:
+                    break
+                log_entries = _decode_frame(await reader.readexactly(size), count)
+                self.received += len(log_entries)
+                if log_entries and self.logger._enqueue(log_entries):
+                    await self.logger._overloaded(log_entries)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def aflush(self):
+        """Waits until all received logs are saved, see AsyncProfilLogger.aflush"""
+        await self.logger.aflush()
+
+    async def aclose(self, timeout=1.0):
+        """Stops listening, waits up to timeout seconds for clients to close their connections, closes the rest,
+        saves received logs and closes the handlers
+
+        Args:
+            timeout (Optional[float]): Maximal number of seconds to wait for clients
+        """
+        if self._server is not None:
+            self._server.close()
+            if self._connections:
+                done, pending = await asyncio.wait(list(self._connections), timeout=timeout)
+                # closed connection ends reading of the client's frames
+                for task in pending:
+                    self._connections[task].transport.abort()
+                await asyncio.gather(*pending, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+            if self.path is not None:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+        await self.logger.aclose()
+        for handler in self.handlers:
+            close = getattr(handler, "close", None)
+            if close:
+                close()
+
+
+class _SidecarSegments(abc.ABC):
+    """Base of sidecar files of segments of FileHandler, CSVHandler and JsonHandler files.
+    Sidecar starts with b"PLSC", size of the fingerprinted prefix of the log file (I) and it's blake2b digest (16s),
+    followed by segments of HEADER, which starts with MAGIC, and payload of payload_size bytes.
+    Sidecar of a replaced or rewritten log file is ignored, readers ignore incomplete segment left by interrupted
+    or concurrent write, only the writer repairs the file in update
+    """
+    FILE_HEADER = struct.Struct("<4sI16s")
+    FINGERPRINT_SIZE = 65536
+
+    @abc.abstractmethod
+    def _payload_size(self, fields):
+        """Returns size of segment's payload following the header
+
+        Args:
+            fields (tuple): Unpacked HEADER of the segment
+        """
+
+    def _fingerprint(self, size):
+        """Returns digest of the first size bytes of the log file, None if the file is shorter
+
+        Args:
+            size (int): Number of fingerprinted bytes
+        """
+        import hashlib
+        try:
+            with open(self.handler.file_name, "rb") as log_file:
+                prefix = log_file.read(size)
+        except OSError:
+            return None
+        return hashlib.blake2b(prefix, digest_size=16).digest() if len(prefix) == size else None
+
+    def _read_segments(self):
+        """Returns tuple of list of (position, header fields) of complete segments and position after the last one,
+        position is 0 if the sidecar doesn't exist or belongs to a different log file. Result is cached until
+        the sidecar or the log file changes"""
+        try:
+            sidecar_size = os.path.getsize(self.file_name)
+            log_stat = os.stat(self.handler.file_name)
+        except OSError:
+            return [], 0
+        key = (sidecar_size, log_stat.st_ino, log_stat.st_size, log_stat.st_mtime_ns)
+        if self._read_cache[0] == key:
+            return self._read_cache[1]
+        segments, position = [], 0
+        with open(self.file_name, "rb") as sidecar_file:
+            header = sidecar_file.read(self.FILE_HEADER.size)
+            if len(header) == self.FILE_HEADER.size:
+                magic, size, digest = self.FILE_HEADER.unpack(header)
+                if magic == b"PLSC" and self._fingerprint(size) == digest:
+                    position = self.FILE_HEADER.size
+            while position and position + self.HEADER.size <= sidecar_size:
+                sidecar_file.seek(position)
+                fields = self.HEADER.unpack(sidecar_file.read(self.HEADER.size))
+                end = position + self.HEADER.size + self._payload_size(fields)
+                if fields[0] != self.MAGIC or end > sidecar_size:
+                    break
+                segments.append((position, fields))
+                position = end
+        # fields[2] is end offset of the segment in the log file
+        if segments and log_stat.st_size < segments[-1][1][2]:
+            segments, position = [], 0
+        self._read_cache = (key, (segments, position))
+        return segments, position
+
+    def _repair(self):
+        """Removes incomplete segment left by interrupted write and the sidecar of a different log file,
+        called by update, readers only ignore them"""
+        segments, position = self._read_segments()
+        try:
+            sidecar_size = os.path.getsize(self.file_name)
+        except OSError:
+            return
+        if not position:
+            self.clear()
+        elif position != sidecar_size:
+            with open(self.file_name, "r+b") as sidecar_file:
+                sidecar_file.truncate(position)
+
+    def _append_segment(self, header, payload):
+        """Appends segment to the sidecar, the first segment is preceded by the fingerprint of the log file
+
+        Args:
+            header (bytes): Packed HEADER of the segment, end offset of the segment is it's third field
+            payload (bytes): Payload of the segment
+        """
+        with open(self.file_name, "ab") as sidecar_file:
+            if sidecar_file.tell() == 0:
+                size = min(self.FINGERPRINT_SIZE, self.HEADER.unpack(header)[2])
+                sidecar_file.write(self.FILE_HEADER.pack(b"PLSC", size, self._fingerprint(size)))
+            sidecar_file.write(header + payload)
+
+
+class TokenIndex(_SidecarSegments):
+    """Sidecar inverted index of message tokens for FileHandler, CSVHandler and JsonHandler,
+    saved next to the handler's file with .idx suffix.
+    The index is built from segments of segment_size records, every segment maps tokens to byte offsets
+    of records containing them. Segments are appended when handler saves segment_size new logs,
+    logs saved after the last segment are read from the log file. Whole tokens are looked up in the dictionary,
+    tokens at the edges of texts searched by find_by_text are matched with dictionary tokens containing them.
+
+    Index file starts with fingerprint of the log file, followed by segments (little endian):
+        header: b"PLIX", start offset (Q), end offset (Q), number of records (I),
+        dictionary size (I), postings size (I)
+        dictionary: for every token: token length (H), token (utf-8), postings position (I), postings size (I)
+        postings: varint encoded differences between offsets of records, relative to start offset
+
+    Attributes:
+        handler (Handler): FileHandler, CSVHandler or JsonHandler
+        file_name (str): Name of the index file
+        segment_size (int): Number of records in a segment
+    """
+    HEADER = struct.Struct("<4sQQIII")
+    MAGIC = b"PLIX"
+    ENTRY = struct.Struct("<II")
+
+    def __init__(self, handler, segment_size=1024):
+        """TokenIndex initializer, attaches the index to the handler, so it can be updated by handler's save
+        and used by ProfilLoggerReader
+
+        Args:
+            handler (Handler): FileHandler, CSVHandler or JsonHandler
+            segment_size (Optional[int]): Number of records in a segment
+        """
+        if not hasattr(handler, "read_range"):
+            raise TypeError("Unsupported type passed as Handler")
+        if not isinstance(segment_size, int) or segment_size < 1:
+            raise ValueError("segment_size needs to be a positive integer")
+        self.handler = handler
+        self.file_name = handler.file_name + ".idx"
+        self.segment_size = segment_size
+        self._pending = 0
+        self._dictionaries = {}
+        self._read_cache = (None, None)
+        handler.index = self
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"TokenIndex({self.handler}, segment_size={self.segment_size})"
+
+    def segments(self):
+        """Returns list of (position, start, end, records, dictionary size, postings size) tuples of segments,
+        position is the offset of segment in the index file. Incomplete segment is ignored, no segments are
+        returned if the index belongs to a different or truncated log file"""
+        return [(position,) + fields[1:] for position, fields in self._read_segments()[0]]
+
+    def _payload_size(self, fields):
+        """Returns size of dictionary and postings of the segment
+
+        Args:
+            fields (tuple): Unpacked HEADER of the segment
+        """
+        return fields[4] + fields[5]
+
+    def clear(self):
+        """Removes the index file"""
+        self._dictionaries = {}
+        self._read_cache = (None, None)
+        try:
+            os.remove(self.file_name)
+        except OSError:
+            pass
+
+    def indexed_until(self):
+        """Returns byte offset of the log file after the last indexed record"""
+        segments = self.segments()
+        return segments[-1][2] if segments else 0
+
+    def appended(self, count=1):
+        """Called by handler after saving logs, updates the index after segment_size logs
+
+        Args:
+            count (Optional[int]): Number of saved logs
+        """
+        self._pending += count
+        if self._pending >= self.segment_size:
+            self.update()
+
+    def update(self, partial=False):
+        """Indexes records saved after the last segment, in segments of segment_size records
+
+        Args:
+            partial Optional([bool]): If True, records that don't fill a whole segment are indexed as well
+        """
+        self._pending = 0
+        SharedWriter.flush_file(self.handler.file_name)
+        if not os.path.exists(self.handler.file_name):
+            return
+        self._repair()
+        start = self.indexed_until()
+        end = os.path.getsize(self.handler.file_name)
+        postings = {}
+        records = 0
+        for offset, date, level, msg in self.handler.read_range(start, end):
+            if records == self.segment_size:
+                self._write_segment(start, offset, records, postings)
+                start, postings, records = offset, {}, 0
+            for token in set(TOKEN.findall(msg)):
+                postings.setdefault(token, []).append(offset - start)
+            records += 1
+        if records == self.segment_size or (records and partial):
+            self._write_segment(start, end, records, postings)
+
+    def _write_segment(self, start, end, records, postings):
+        """Appends segment to the index file
+
+        Args:
+            start (int): Byte offset of the first record of the segment
+            end (int): Byte offset after the last record of the segment
+            records (int): Number of records in the segment
+            postings (dict): Dict of tokens and lists of record offsets relative to start
+        """
+        dictionary = bytearray()
+        encoded_postings = bytearray()
+        for token in sorted(postings):
+            offsets = postings[token]
+            encoded = _encode_varints([offsets[0]] + [second - first for first, second in zip(offsets, offsets[1:])])
+            encoded_token = token.encode("utf-8")
+            dictionary += struct.pack("<H", len(encoded_token)) + encoded_token
+            dictionary += self.ENTRY.pack(len(encoded_postings), len(encoded))
+            encoded_postings += encoded
+        self._append_segment(self.HEADER.pack(self.MAGIC, start, end, records, len(dictionary), len(encoded_postings)),
+                             bytes(dictionary + encoded_postings))
+
+    def _dictionary(self, index_file, segment):
+        """Returns dict of tokens and (postings position, postings size) of the segment, dictionaries are cached
+
+        Args:
+            index_file (file): Index file opened in binary mode
+            segment (tuple): Segment returned by segments method
+        """
+        position, start, end, records, dictionary_size, postings_size = segment
+        if segment not in self._dictionaries:
+            index_file.seek(position + self.HEADER.size)
+            data = index_file.read(dictionary_size)
+            dictionary = {}
+            cursor = 0
+            while cursor < dictionary_size:
+                length, = struct.unpack_from("<H", data, cursor)
+                token = data[cursor + 2:cursor + 2 + length].decode("utf-8")
+                dictionary[token] = self.ENTRY.unpack_from(data, cursor + 2 + length)
+                cursor += 2 + length + self.ENTRY.size
+            self._dictionaries[segment] = dictionary
+        return self._dictionaries[segment]
+
+    def _postings(self, index_file, segment, entry):
+        """Returns set of byte offsets of records in postings of a token
+
+        Args:
+            index_file (file): Index file opened in binary mode
+            segment (tuple): Segment returned by segments method
+            entry (tuple): (postings position, postings size) of the token in segment's dictionary
+        """
+        position, start, end, records, dictionary_size, postings_size = segment
+        postings_position, size = entry
+        index_file.seek(position + self.HEADER.size + dictionary_size + postings_position)
+        offsets = set()
+        offset = start
+        for difference in _decode_varints(index_file.read(size)):
+            offset += difference
+            offsets.add(offset)
+        return offsets
+
+    def lookup(self, tokens, edge_tokens=()):
+        """Returns tuple of sorted list of byte offsets of indexed records containing all tokens and tokens
+        matching all edge_tokens, and byte offset after the last indexed record. Edge token is matched with
+        tokens of the segment's dictionary, which end with it, start with it or contain it
+
+        Args:
+            tokens (list): List of whole tokens
+            edge_tokens Optional([list]): List of (token, extends_left, extends_right) tuples returned by _edge_tokens
+        """
+        segments = self.segments()
+        offsets = []
+        if not segments:
+            return offsets, 0
+        with open(self.file_name, "rb") as index_file:
+            for segment in segments:
+                dictionary = self._dictionary(index_file, segment)
+                found = None
+                for token in set(tokens):
+                    if token not in dictionary:
+                        found = set()
+                        break
+                    relative_offsets = self._postings(index_file, segment, dictionary[token])
+                    found = relative_offsets if found is None else found & relative_offsets
+                    if not found:
+                        break
+                for token, extends_left, extends_right in edge_tokens:
+                    if found is not None and not found:
+                        break
+                    if extends_left and extends_right:
+                        matching = [entry for word, entry in dictionary.items() if token in word]
+                    elif extends_left:
+                        matching = [entry for word, entry in dictionary.items() if word.endswith(token)]
+                    else:
+                        matching = [entry for word, entry in dictionary.items() if word.startswith(token)]
+                    relative_offsets = set()
+                    for entry in matching:
+                        relative_offsets |= self._postings(index_file, segment, entry)
+                    found = relative_offsets if found is None else found & relative_offsets
+                offsets += sorted(found or ())
+        return offsets, segments[-1][2]
+
+
+class SegmentSummaries(_SidecarSegments):
+    """Sidecar summaries of segments of FileHandler, CSVHandler and JsonHandler files, saved next to the
+    handler's file with .seg suffix. Every closed segment of segment_size records has it's byte range,
+    minimal and maximal date, bitmap of levels and Bloom filter of message tokens,
+    ProfilLoggerReader uses them to skip segments that cannot contain searched logs.
+
+    Summaries file starts with fingerprint of the log file, followed by segments (little endian):
+        b"PLSS", start offset (Q), end offset (Q), number of records (I), minimal date (19s, iso format),
+        maximal date (19s), levels bitmap (H), Bloom filter size (I), Bloom filter
+
+    Attributes:
+        handler (Handler): FileHandler, CSVHandler or JsonHandler
+        file_name (str): Name of the summaries file
+        segment_size (int): Number of records in a segment
+    """
+    HEADER = struct.Struct("<4sQQI19s19sHI")
+    MAGIC = b"PLSS"
+    HASHES = 7
+    BITS_PER_TOKEN = 10
+
+    def __init__(self, handler, segment_size=1024):
+        """SegmentSummaries initializer, attaches summaries to the handler, so they can be updated by handler's save
+        and used by ProfilLoggerReader
+
+        Args:
+            handler (Handler): FileHandler, CSVHandler or JsonHandler
+            segment_size (Optional[int]): Number of records in a segment
+        """
+        if not hasattr(handler, "read_range"):
+            raise TypeError("Unsupported type passed as Handler")
+        if not isinstance(segment_size, int) or segment_size < 1:
+            raise ValueError("segment_size needs to be a positive integer")
+        self.handler = handler
+        self.file_name = handler.file_name + ".seg"
+        self.segment_size = segment_size
+        self._pending = 0
+        self._cache = (None, [])
+        self._read_cache = (None, None)
+        handler.summaries = self
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"SegmentSummaries({self.handler}, segment_size={self.segment_size})"
+
+    @staticmethod
+    def _level_bit(level):
+        """Returns bit of the level in levels bitmap, levels not in LEVELS share the last bit
+
+        Args:
+            level (str): Level of the log
+        """
+        levels = list(LEVELS)
+        return 1 << (levels.index(level) if level in LEVELS else 15)
+
+    def _bloom_positions(self, token, bits):
+        """Returns positions of token's bits in Bloom filter, uses double hashing of blake2b digest,
+        so positions are the same in every process
+
+        Args:
+            token (str): Token of a message
+            bits (int): Size of Bloom filter in bits
+        """
+        import hashlib
+        digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+        first, second = digest & 0xffffffff, (digest >> 32) | 1
+        return [(first + number * second) % bits for number in range(self.HASHES)]
+
+    def segments(self):
+        """Returns list of (start, end, records, min date, max date, levels bitmap, Bloom filter) tuples of segments,
+        incomplete segment is ignored, no segments are returned if the summaries belong to a different
+        or truncated log file"""
+        read = self._read_segments()
+        if self._cache[0] is not read:
+            segments = []
+            if read[0]:
+                with open(self.file_name, "rb") as summaries_file:
+                    for position, (magic, start, end, records, min_date, max_date, levels, bloom_size) in read[0]:
+                        summaries_file.seek(position + self.HEADER.size)
+                        segments.append((start, end, records, min_date.decode("ascii"), max_date.decode("ascii"),
+                                         levels, summaries_file.read(bloom_size)))
+            self._cache = (read, segments)
+        return self._cache[1]
+
+    def _payload_size(self, fields):
+        """Returns size of Bloom filter of the segment
+
+        Args:
+            fields (tuple): Unpacked HEADER of the segment
+        """
+        return fields[7]
+
+    def clear(self):
+        """Removes the summaries file"""
+        self._cache = (None, [])
+        self._read_cache = (None, None)
+        try:
+            os.remove(self.file_name)
+        except OSError:
+            pass
+
+    def appended(self, count=1):
+        """Called by handler after saving logs, summarizes new segment after segment_size logs
+
+        Args:
+            count (Optional[int]): Number of saved logs
+        """
+        self._pending += count
+        if self._pending >= self.segment_size:
+            self.update()
+
+    def update(self, partial=False):
+        """Summarizes records saved after the last segment, in segments of segment_size records
+
+        Args:
+            partial Optional([bool]): If True, records that don't fill a whole segment are summarized as well
+        """
+        self._pending = 0
+        SharedWriter.flush_file(self.handler.file_name)
+        if not os.path.exists(self.handler.file_name):
+            return
+        self._repair()
+        segments = self.segments()
+        start = segments[-1][1] if segments else 0
+        end = os.path.getsize(self.handler.file_name)
+        records, dates, levels, tokens = 0, [], 0, set()
+        for offset, date, level, msg in self.handler.read_range(start, end):
+            if records == self.segment_size:
+                self._write_segment(start, offset, records, dates, levels, tokens)
+                start, records, dates, levels, tokens = offset, 0, [], 0, set()
+            date = _iso_date(date)
+            if not dates:
+                dates = [date, date]
+            elif date < dates[0]:
+                dates[0] = date
+            elif dates[1] < date:
+                dates[1] = date
+            levels |= self._level_bit(level)
+            tokens.update(TOKEN.findall(msg))
+            records += 1
+        if records == self.segment_size or (records and partial):
+            self._write_segment(start, end, records, dates, levels, tokens)
+
+    def _write_segment(self, start, end, records, dates, levels, tokens):
+        """Appends summary of a segment to the summaries file
+
+        Args:
+            start (int): Byte offset of the first record of the segment
+            end (int): Byte offset after the last record of the segment
+            records (int): Number of records in the segment
+            dates (list): Minimal and maximal date of the segment in iso format
+            levels (int): Bitmap of levels in the segment
+            tokens (set): Tokens of messages in the segment
+        """
+        bits = max(64, len(tokens) * self.BITS_PER_TOKEN) // 8 * 8
+        bloom = bytearray(bits // 8)
+        for token in tokens:
+            for position in self._bloom_positions(token, bits):
+                bloom[position >> 3] |= 1 << (position & 7)
+        self._append_segment(self.HEADER.pack(self.MAGIC, start, end, records, dates[0][:19].encode("ascii"),
+                                              dates[1][:19].encode("ascii"), levels, len(bloom)), bytes(bloom))
+
+    def might_contain(self, segment, tokens=(), level=None, start_date=None, end_date=None):
+        """Returns False if the segment surely doesn't contain any log matching passed arguments
+
+        Args:
+            segment (tuple): Segment returned by segments method
+            tokens Optional([list]): Tokens that message must contain
+            level Optional([str, tuple]): Level of the log, or tuple of allowed levels
+            start_date Optional([datetime]): Minimal date of the log
+            end_date Optional([datetime]): Maximal date of the log
+        """
+        start, end, records, min_date, max_date, levels, bloom = segment
+        if start_date and max_date < start_date.isoformat():
+            return False
+        if end_date and end_date.isoformat() < min_date:
+            return False
+        if isinstance(level, str) and not levels & self._level_bit(level):
+            return False
+        if isinstance(level, tuple) and not any(levels & self._level_bit(name) for name in level):
+            return False
+        bits = len(bloom) * 8
+        for token in tokens:
+            for position in self._bloom_positions(token, bits):
+                if not bloom[position >> 3] & (1 << (position & 7)):
+                    return False
+        return True
+
+    def ranges(self, tokens=(), level=None, start_date=None, end_date=None):
+        """Returns list of (start, end) byte ranges of the log file that can contain logs matching passed arguments,
+        neighbouring segments are merged, the last range ends with None and covers logs saved after the last segment
+
+        Args:
+            tokens Optional([list]): Tokens that message must contain
+            level Optional([str, tuple]): Level of the log, or tuple of allowed levels
+            start_date Optional([datetime]): Minimal date of the log
+            end_date Optional([datetime]): Maximal date of the log
+        """
+        segments = self.segments()
+        ranges = []
+        for segment in segments:
+            if not self.might_contain(segment, tokens, level, start_date, end_date):
+                continue
+            if ranges and ranges[-1][1] == segment[0]:
+                ranges[-1] = (ranges[-1][0], segment[1])
+            else:
+                ranges.append((segment[0], segment[1]))
+        tail = segments[-1][1] if segments else 0
+        if ranges and ranges[-1][1] == tail:
+            ranges[-1] = (ranges[-1][0], None)
+        else:
+            ranges.append((tail, None))
+        return ranges
+
+
+class LogEntry:
+    """Class used to represent logs
+
+    Attributes:
+        msg (str): Message of the log
+        level (str): Level of the log
+        date Optional([datetime]): Instance of datetime containing the date that the log was created,
+        if not specified will default to current system's date
+    """
+    def __init__(self, msg, level, date=None):
+        """LogEntry initializer
+
+        Args:
+            msg (str): Initializes the msg attribute
+            level (str): Initializes the level attribute
+            date Optional([str]): Initializes the date attribute, works only with date in "%d %b %Y %H:%M:%S" format
+            if date is not specified will default to current system's date
+        """
+        if date:
+            if isinstance(date, datetime.datetime):
+                self.date = date
+            else:
+                try:
+                    self.date = datetime.datetime.strptime(date, "%d %b %Y %H:%M:%S")
+                except ValueError:
+                    print("Wrong format of a date")
+        else:
+            self.date = datetime.datetime.now()
+        self.level = level
+        self.msg = msg
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"LogEntry({self.date}, {self.level}, {self.msg})"
+
+    def formatted_date(self):
+        """Returns date in "%d %b %Y %H:%M:%S" format used by handlers, strftime is called once per date"""
+        formatted = self.__dict__.get("_formatted_date")
+        if formatted is None or formatted[0] is not self.date:
+            formatted = self._formatted_date = (self.date, self.date.strftime("%d %b %Y %H:%M:%S"))
+        return formatted[1]
+
+    def __str__(self):
+        """str for users"""
+        return f"{self.date.strftime('%d %b %Y %H:%M:%S')} ; {self.level} ; {self.msg}"
+
+    def __eq__(self, other):
+        """method used during comparison of two LogEntry objects, returns True if both contain the same informations
+        else returns False
+
+        Args:
+            other (LogEntry): Instance of LogEntry class, containing date, level and msg
+        """
+        if self.msg == other.msg:
+            if self.level == other.level:
+                if self.date == other.date:
+                    return True
+        return False
+
+
+class LogEntryList(list):
+    """List of LogEntry instances returned by ProfilLoggerReader, can be exported to arrays and pandas DataFrame"""
+
+    def to_arrays(self):
+        """Returns dict of numpy arrays with columns of the logs: date as datetime64, level as categorical codes
+        with level_categories list and msg as strings, requires numpy"""
+        return _build_arrays([log.date for log in self], [log.level for log in self], [log.msg for log in self])
+
+    def to_dataframe(self):
+        """Returns pandas DataFrame with date, level and msg columns, requires numpy and pandas"""
+        return _build_dataframe(self.to_arrays())
+
+
+def _freeze(value):
+    """Returns hashable version of query argument, lists and dicts are converted to tuples
+
+    Args:
+        value: Argument passed to ProfilLoggerReader method
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def _copy_result(result, copies=None):
+    """Returns copy of cached result with copies of it's LogEntry instances, so the caller can modify it
+    without modifying the cache. LogEntry found many times in the result, like in results of find_many,
+    is copied once
+
+    Args:
+        result: Result of ProfilLoggerReader method
+        copies Optional([dict]): Copies of LogEntry instances by their id
+    """
+    if copies is None:
+        copies = {}
+    if isinstance(result, LogEntry):
+        copy = copies.get(id(result))
+        if copy is None:
+            copy = copies[id(result)] = LogEntry.__new__(LogEntry)
+            copy.__dict__.update(result.__dict__)
+        return copy
+    if isinstance(result, (list, tuple)):
+        return type(result)(_copy_result(item, copies) for item in result)
+    if isinstance(result, dict):
+        return {key: _copy_result(item, copies) for key, item in result.items()}
+    return result
+
+
+def _result_size(result):
+    """Returns approximate size of result in bytes
+
+    Args:
+        result: Result of ProfilLoggerReader method
+    """
+    import sys
+    if isinstance(result, LogEntry):
+        return sys.getsizeof(result) + sys.getsizeof(result.__dict__) + sys.getsizeof(result.msg) + 48
+    if isinstance(result, (list, tuple)):
+        return sys.getsizeof(result) + sum(_result_size(item) for item in result)
+    if isinstance(result, dict):
+        return sys.getsizeof(result) + sum(_result_size(item) for item in result.values())
+    return sys.getsizeof(result)
+
+
+def _merge_lists(cached, tail, arguments):
+    """Merges lists of logs, used by ResultCache"""
+    return LogEntryList(cached + tail)
+
+
+def _merge_patterns(cached, tail, arguments):
+    """Merges lists of (LogEntry, found patterns) tuples returned by find_by_patterns, used by ResultCache"""
+    return cached + tail
+
+
+def _merge_sums(cached, tail, arguments):
+    """Merges numbers of logs, used by ResultCache"""
+    return cached + tail
+
+
+def _merge_exists(cached, tail, arguments):
+    """Merges results of exists, used by ResultCache"""
+    return cached or tail
+
+
+def _merge_many(cached, tail, arguments):
+    """Merges results of find_many, used by ResultCache"""
+    return [LogEntryList(cached_logs + tail_logs) for cached_logs, tail_logs in zip(cached, tail)]
+
+
+def _merge_groups(cached, tail, arguments):
+    """Merges dicts of groups returned by groupby and count_by_level, used by ResultCache,
+    returns None for sample aggregate, which cannot be merged"""
+    aggregate = arguments.get("aggregate", "count")
+    if aggregate == "sample":
+        return None
+    merged = dict(cached)
+    for group, value in tail.items():
+        if group not in merged:
+            merged[group] = value
+        elif aggregate == "count":
+            merged[group] = merged[group] + value
+        elif aggregate == "list":
+            merged[group] = LogEntryList(merged[group] + value)
+        elif aggregate == "last":
+            merged[group] = value
+    return merged
+
+
+# generated query filters by shape of the query, see _compile_filter
+QUERY_FILTERS = {}
+
+
+def _compile_filter(levels=None, texts=(), regexes=(), start_date=None, end_date=None):
+    """Returns generator function filtering raw (date, level, msg) records and yielding matching ones
+    with date in iso format. Source of the function is generated for the shape of the query: whether it filters
+    by one or many levels, number of texts and regular expressions and which dates are passed. It is compiled once
+    per shape and stored in QUERY_FILTERS, filters are bound as constants of the returned function,
+    so every record is checked by inlined comparisons without looping over filters
+
+    Args:
+        levels Optional([tuple]): Allowed levels of the logs
+        texts Optional([tuple]): Texts that msg must contain
+        regexes Optional([tuple]): Regular expressions that will be searched for in msg
+        start_date Optional([datetime]): Minimal date of the log
+        end_date Optional([datetime]): Maximal date of the log
+    """
+    shape = (None if levels is None else len(levels) == 1, len(texts), len(regexes),
+             start_date is not None, end_date is not None)
+    constants = {"iso_date": _iso_date}
+    if levels is not None and len(levels) == 1:
+        constants["level_0"] = levels[0]
+    elif levels is not None:
+        constants["levels"] = frozenset(levels)
+    for number, text in enumerate(texts):
+        constants[f"text_{number}"] = text
+    for number, regex in enumerate(regexes):
+        constants[f"search_{number}"] = re.compile(regex).search
+    if start_date is not None:
+        constants["start"] = start_date.isoformat()
+    if end_date is not None:
+        constants["end"] = end_date.isoformat()
+
+    factory = QUERY_FILTERS.get(shape)
+    if factory is None:
+        # cheap checks first: level, texts, dates, regular expressions
+        lines = ["    def query_filter(records):",
+                 "        for date, level, msg in records:"]
+        if "level_0" in constants:
+            lines += ["            if level != level_0:", "                continue"]
+        elif "levels" in constants:
+            lines += ["            if level not in levels:", "                continue"]
+        for number in range(len(texts)):
+            lines += [f"            if text_{number} not in msg:", "                continue"]
+        lines.append("            date = iso_date(date)")
+        if "start" in constants:
+            lines += ["            if date < start:", "                continue"]
+        if "end" in constants:
+            lines += ["            if end < date:", "                continue"]
+        for number in range(len(regexes)):
+            lines += [f"            if not search_{number}(msg):", "                continue"]
+        lines += ["            yield date, level, msg",
+                  "    return query_filter"]
+        source = f"def factory({', '.join(constants)}):\n" + "\n".join(lines) + "\n"
+        namespace = {}
+        exec(compile(source, f"<query filter {shape}>", "exec"), namespace)
+        factory = QUERY_FILTERS[shape] = namespace["factory"]
+    return factory(**constants)
+
+
+def _merge_query(cached, tail, arguments):
+    """Merges results of Query, used by ResultCache"""
+    result = arguments["result"]
+    if result == "find":
+        return _merge_lists(cached, tail, arguments)
+    if result == "count":
+        return _merge_sums(cached, tail, arguments)
+    if result == "exists":
+        return _merge_exists(cached, tail, arguments)
+    return _merge_groups(cached, tail, arguments)
+
+
+def _cached(merge=None):
+    """Decorator of ProfilLoggerReader methods, that can be stored in reader's ResultCache
+
+    Args:
+        merge Optional([function]): Function merging cached result with result of logs appended since
+        the result was cached, results are computed again when logs were appended and merge is not specified
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.cache is None or self._tail_start is not None:
+                return method(self, *args, **kwargs)
+            return self.cache.get(self, method, args, kwargs, merge)
+        return wrapper
+    return decorator
+
+
+class ResultCache:
+    """LRU cache of ProfilLoggerReader results, results are stored with version of the handler's file
+    (inode, size and modification time for files, rowid after the last log for sqlite) and are computed again
+    when the file changes. When logs were only appended to the file, only the new logs are read and merged
+    with the cached result. Result is not stored if the file changed while it was computed, because it can contain
+    logs past the version read before. Can be shared by many ProfilLoggerReader instances
+
+    Attributes:
+        max_bytes (int): Approximate size of all cached results, least recently used results are removed first
+        hits (int): Number of results returned from the cache
+        top_ups (int): Number of cached results merged with logs appended to the file
+        misses (int): Number of results computed from the whole file
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """ResultCache initializer
+
+        Args:
+            max_bytes (Optional[int]): Initializes the max_bytes attribute
+        """
+        if not isinstance(max_bytes, int) or max_bytes < 1:
+            raise ValueError("max_bytes needs to be a positive integer")
+        self.max_bytes = max_bytes
+        self.hits = self.top_ups = self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"ResultCache(max_bytes={self.max_bytes})"
+
+    def __len__(self):
+        """Returns number of cached results"""
+        return len(self._entries)
+
+    def clear(self):
+        """Removes all cached results"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get(self, reader, method, args, kwargs, merge=None):
+        """Returns result of reader's method, from the cache if the handler's file didn't change
+
+        Args:
+            reader (ProfilLoggerReader): Reader the method is called on
+            method (function): ProfilLoggerReader method
+            args (tuple): Positional arguments of the method
+            kwargs (dict): Keyword arguments of the method
+            merge Optional([function]): Function merging cached result with result of appended logs
+        """
+        handler = reader.handler
+        if "version" not in reader.capabilities:
+            return method(reader, *args, **kwargs)
+        try:
+            file_name = getattr(handler, "file_name", None)
+            location = os.path.realpath(file_name) if file_name is not None else handler.version()[0]
+            key = (type(handler).__name__, location, method.__name__, _freeze(args), _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            return method(reader, *args, **kwargs)
+        version = handler.version()
+        if version is None:
+            return method(reader, *args, **kwargs)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+        if entry:
+            cached_version, cached_result, size = entry
+            if cached_version == version:
+                self.hits += 1
+                return _copy_result(cached_result)
+            if merge and "read_range" in reader.capabilities and handler.grown_from(cached_version):
+                tail_reader = type(reader)(handler, chunk_cache=reader.chunk_cache)
+                tail_reader._tail_start = cached_version[1]
+                arguments = inspect.signature(method).bind(reader, *args, **kwargs)
+                arguments.apply_defaults()
+                result = merge(cached_result, method(tail_reader, *args, **kwargs), arguments.arguments)
+                if result is not None:
+                    self.top_ups += 1
+                    if handler.version() == version:
+                        self._store(key, version, result)
+                    return _copy_result(result)
+        self.misses += 1
+        result = method(reader, *args, **kwargs)
+        if handler.version() == version:
+            self._store(key, version, result)
+        return _copy_result(result)
+
+    def _store(self, key, version, result):
+        """Stores result in the cache, removes least recently used results above max_bytes
+
+        Args:
+            key (tuple): Key of the result
+            version (tuple): Version of the handler's file
+            result: Result of ProfilLoggerReader method
+        """
+        size = _result_size(result)
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (version, result, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._size -= self._entries.popitem(last=False)[1][2]
+
+
+class ChunkCache:
+    """Memory budgeted LRU cache of parsed records of FileHandler, CSVHandler and JsonHandler files,
+    shared by queries of ProfilLoggerReader instances using it. Records are stored in chunks of about
+    chunk_size bytes of the file, as columns of offsets, dates, levels and messages. Chunks are stored with the
+    version of the file and are removed when the file changes in other way than appending logs.
+    A chunk holds records starting in one chunk_size aligned part of the file, so reads starting at different
+    records of the part share the chunk instead of caching the same bytes twice.
+    The last chunk of the file is not stored until it's complete, so appended logs don't split the chunks.
+
+    Chunks can be saved to file with .chunks suffix next to the log file and loaded in another process,
+    loaded chunks are memory mapped and decoded on first use. The mapping is closed when none of its chunks
+    is left undecoded in the cache or when chunks of the file are loaded again.
+    Chunks file format:
+        header (little endian): b"PLCH", inode (Q), size (Q), modification time (Q), last bytes (32s),
+        number of chunks (I)
+        for every chunk (little endian): offset of the first record (Q), end (Q), number of records (I),
+        position of data (Q)
+        chunk data (native byte order of arrays): offsets of records (q), end positions of date, level and msg
+        of every record in text (q), text
+
+    Attributes:
+        max_bytes (int): Approximate size of all cached chunks
+        chunk_size (int): Size of the part of the file parsed into a chunk in bytes
+    """
+    HEADER = struct.Struct("<4sQQQ32sI")
+    CHUNK = struct.Struct("<QQIQ")
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, chunk_size=1024 * 1024):
+        """ChunkCache initializer
+
+        Args:
+            max_bytes (Optional[int]): Initializes the max_bytes attribute
+            chunk_size (Optional[int]): Initializes the chunk_size attribute
+        """
+        if not isinstance(max_bytes, int) or max_bytes < 1:
+            raise ValueError("max_bytes needs to be a positive integer")
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size needs to be a positive integer")
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        # (file path, chunk_size aligned start) :
+        # [end, columns or None, size, memory mapped data or None, offset of the first record]
+        self._chunks = collections.OrderedDict()
+        # file path : memory mapped chunks file and its memory view
+        self._mappings = {}
+        self._versions = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """repr for developers"""
+        return f"ChunkCache(max_bytes={self.max_bytes}, chunk_size={self.chunk_size})"
+
+    def __len__(self):
+        """Returns number of cached chunks"""
+        return len(self._chunks)
+
+    def clear(self):
+        """Removes all cached chunks"""
+        with self._lock:
+            self._chunks.clear()
+            self._versions.clear()
+            self._size = 0
+            self._close_unused()
+
+    def _close_unused(self):
+        """Closes memory mapped chunks files without undecoded chunks in the cache, needs to be called
+        with the lock held"""
+        for path, (mapped, view) in list(self._mappings.items()):
+            if not any(key[0] == path and chunk[3] is not None and chunk[3][0] is view
+                       for key, chunk in self._chunks.items()):
+                del self._mappings[path]
+                view.release()
+                mapped.close()
+
+    def _columns(self, chunk):
+        """Returns columns of chunk, decodes them from memory mapped chunks file on first use,
+        needs to be called with the lock held
+
+        Args:
+            chunk (list): End, columns, size, memory mapped data and offset of the first record of the chunk
+        """
+        if chunk[1] is None:
+            chunk[1] = self._decode(chunk[3])
+            chunk[3] = None
+            self._close_unused()
+        return chunk[1]
+
+    def _check_version(self, handler, path, version=None):
+        """Removes chunks of the file if it changed in other way than appending logs,
+        returns current version of the file
+
+        Args:
+            handler (Handler): FileHandler, CSVHandler or JsonHandler
+            path (str): Real path of handler's file
+            version Optional([tuple]): Version already read by the caller, used instead of reading it again
+        """
+        if version is None:
+            version = handler.version()
+        with self._lock:
+            known = self._versions.get(path)
+            if known is not None and known != version and (version is None or not handler.grown_from(known)):
+                for key in [key for key in self._chunks if key[0] == path]:
+                    self._size -= self._chunks.pop(key)[2]
+                self._close_unused()
+            self._versions[path] = version
+        return version
+
+    def _store(self, key, chunk):
+        """Stores chunk, removes least recently used chunks above max_bytes
+
+        Args:
+            key (tuple): File path and chunk_size aligned start of the chunk
+            chunk (list): End, columns, size, memory mapped data and offset of the first record of the chunk
+        """
+        with self._lock:
+            if key in self._chunks:
+                self._size -= self._chunks.pop(key)[2]
+            if chunk[2] <= self.max_bytes:
+                self._chunks[key] = chunk
+                self._size += chunk[2]
+                while self._size > self.max_bytes:
+                    self._size -= self._chunks.popitem(last=False)[1][2]
+            self._close_unused()
+
+    def _parse(self, handler, start, limit, size):
+        """Parses chunk of the file from byte offset start to the first record starting at limit or later,
+        returns end of the chunk, columns and True if the chunk is complete
+
+        Args:
+            handler (Handler): FileHandler, CSVHandler or JsonHandler
+            start (int): Byte offset of the first record
+            limit (int): End of the chunk_size aligned part of the file
+            size (int): Size of the file
+        """
+        offsets, dates, levels, msgs = [], [], [], []
+        end = size
+        for offset, date, level, msg in handler.read_range(start, size):
+            if offset >= limit:
+                end = offset
+                break
+            offsets.append(offset)
+            dates.append(date)
+            levels.append(level)
+            msgs.append(msg)
+        return end, (offsets, dates, levels, msgs), end >= limit
+
+    @staticmethod
+    def _decode(mapped):
+        """Decodes columns of chunk loaded from memory mapped chunks file
+
+        Args:
+            mapped (tuple): Memory view of the chunks file, position of chunk data and number of records
+        """
+        view, position, records = mapped
+        offsets = view[position:position + 8 * records].cast("q").tolist()
+        position += 8 * records
+        ends = view[position:position + 24 * records].cast("q").tolist()
+        position += 24 * records
+        data = bytes(view[position:position + (ends[-1] if ends else 0)])
+        # ends are byte offsets, they are offsets of characters in decoded text only when it is ascii
+        if data.isascii():
+            text = data.decode("ascii")
+            strings = [text[first:second] for first, second in zip([0] + ends, ends)]
+        else:
+            strings = [data[first:second].decode("utf-8") for first, second in zip([0] + ends, ends)]
+        return offsets, strings[0::3], strings[1::3], strings[2::3]
+
+    def records(self, handler, start=0, end=None):
+        """Yields (offset, date, level, msg) tuples of records like handler's read_range, from cached chunks
+        when possible, parsed chunks are stored in the cache
+
+        Args:
+            handler (Handler): FileHandler, CSVHandler or JsonHandler
+            start Optional([int]): Byte offset of the first record, needs to be the start of a record
+            end Optional([int]): Byte offset after the last record, reads to the end of the file if not specified
+        """
+        import bisect
+        path = os.path.realpath(handler.file_name)
+        version = self._check_version(handler, path)
+        if version is None:
+            yield from handler.read_range(start, end)
+            return
+        size = version[1]
+        position = start
+        while position < size and (end is None or position < end):
+            key = (path, position - position % self.chunk_size)
+            with self._lock:
+                chunk = self._chunks.get(key)
+                # a chunk parsed from a later record of the part is replaced by one starting at position
+                if chunk and chunk[4] <= position < chunk[0]:
+                    self._chunks.move_to_end(key)
+                    chunk_end, columns, complete = chunk[0], self._columns(chunk), True
+                else:
+                    chunk = None
+            if chunk is None:
+                chunk_end, columns, complete = self._parse(handler, position, key[1] + self.chunk_size, size)
+                if complete:
+                    chunk_size = (chunk_end - position) + 250 * len(columns[0])
+                    self._store(key, [chunk_end, columns, chunk_size, None, position])
+            offsets, dates, levels, msgs = columns
+            first = bisect.bisect_left(offsets, position)
+            stop = len(offsets) if end is None or chunk_end <= end else bisect.bisect_left(offsets, end)
+            yield from zip(offsets[first:stop], dates[first:stop], levels[first:stop], msgs[first:stop])
+            if not complete or not offsets:
+                break
+            position = chunk_end
+
+    def save(self, handler):
+        """Saves cached chunks of handler's file to file with .chunks suffix next to it
+
+        Args:
+            handler (Handler): FileHandler, CSVHandler or JsonHandler
+        """
+        from array import array
+        path = os.path.realpath(handler.file_name)
+        version = self._check_version(handler, path)
+        if version is None:
+            return
+        with self._lock:
+            chunks = sorted((chunk[4], chunk[0], self._columns(chunk))
+                            for key, chunk in self._chunks.items() if key[0] == path)
+        table, data = [], bytearray()
+        data_start = self.HEADER.size + self.CHUNK.size * len(chunks)
+        for start, end, (offsets, dates, levels, msgs) in chunks:
+            text = bytearray()
+            ends = array("q")
+            for record in zip(dates, levels, msgs):
+                for string in record:
+                    text += string.encode("utf-8")
+                    ends.append(len(text))
+            table.append(self.CHUNK.pack(start, end, len(offsets), data_start + len(data)))
+            data += array("q", offsets).tobytes() + ends.tobytes() + text
+            data += bytes(-len(data) % 8)
+        inode, size, modification_time, last_bytes = version
+        temporary_name = handler.file_name + ".chunks.tmp"
+        with open(temporary_name, "wb") as chunks_file:
+            chunks_file.write(self.HEADER.pack(b"PLCH", inode, size, modification_time,
+                                               last_bytes.ljust(32, b"\0"), len(chunks)))
+            chunks_file.write(b"".join(table))
+            chunks_file.write(data)
+        os.replace(temporary_name, handler.file_name + ".chunks")
+
+    def load(self, handler):
+        """Loads chunks saved by save method, chunks are memory mapped and decoded on first use,
+        returns number of loaded chunks. Chunks of file, that changed in other way than appending logs,
+        are not loaded. Undecoded chunks of the file loaded before are removed and their mapping is closed
+
+        Args:
+            handler (Handler): FileHandler, CSVHandler or JsonHandler
+        """
+        import mmap
+        try:
+            with open(handler.file_name + ".chunks", "rb") as chunks_file:
+                mapped = mmap.mmap(chunks_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return 0
+        try:
+            magic, inode, size, modification_time, last_bytes, count = self.HEADER.unpack_from(mapped, 0)
+        except struct.error:
+            mapped.close()
+            return 0
+        saved_version = (inode, size, modification_time, last_bytes[:min(size, 32)])
+        version = handler.version()
+        if magic != b"PLCH" or version is None or (version != saved_version and not handler.grown_from(saved_version)):
+            mapped.close()
+            return 0
+        path = os.path.realpath(handler.file_name)
+        # the version checked against saved chunks, a newer one would accept chunks of a rewritten file
+        self._check_version(handler, path, version)
+        with self._lock:
+            if path in self._mappings:
+                previous = self._mappings[path][1]
+                for key in [key for key, chunk in self._chunks.items()
+                            if chunk[3] is not None and chunk[3][0] is previous]:
+                    self._size -= self._chunks.pop(key)[2]
+                self._close_unused()
+            view = memoryview(mapped)
+            self._mappings[path] = (mapped, view)
+        for number in range(count):
+            start, end, records, position = self.CHUNK.unpack_from(mapped, self.HEADER.size + number * self.CHUNK.size)
+            self._store((path, start - start % self.chunk_size),
+                        [end, None, (end - start) + 250 * records, (view, position, records), start])
+        with self._lock:
+            self._close_unused()
+        return count
+
+
+class AhoCorasick:
+    """Automaton used to find many literal strings in a text with a single pass over the text,
+    cost of the search depends on length of the text, not on number of patterns
+
+    Attributes:
+        patterns (list): List of searched strings
+    """
+
+    def __init__(self, patterns):
+        """AhoCorasick initializer, builds the trie of patterns and it's failure links
+
+        Args:
+            patterns (list): List of non empty strings
+        """
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for index, pattern in enumerate(self.patterns):
+            if not isinstance(pattern, str) or not pattern:
+                raise ValueError("Patterns need to be non empty strings")
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state] += (index,)
+
+        # breadth first search sets failure links, outputs of the failure state are merged into the state
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def search(self, text):
+        """Returns set of indexes of patterns found in text
+
+        Args:
+            text (str): Text to search in
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class PatternSet:
+    """Set of literal strings and regular expressions searched for in a message at once,
+    literal strings are compiled into AhoCorasick automaton and regular expressions into single alternation
+    with named groups. Messages the alternation does not match are rejected with a single scan, whatever the number
+    of patterns. In messages it matches, regular expressions not reported by it can only start inside it's matches,
+    at every other position the alternation tried them all, so they are matched one by one only at positions
+    inside the matched spans
+
+    Attributes:
+        texts (list): List of literal strings
+        regexes (list): List of regular expressions
+    """
+
+    def __init__(self, texts=None, regexes=None):
+        """PatternSet initializer
+
+        Args:
+            texts Optional([list]): List of literal strings
+            regexes Optional([list]): List of valid regular expressions
+        """
+        self.texts = list(texts or [])
+        self.regexes = list(regexes or [])
+        for regex in self.regexes:
+            if not isinstance(regex, str):
+                raise TypeError("Regex needs to be a string")
+            re.compile(regex)
+        self._automaton = AhoCorasick(self.texts) if self.texts else None
+        # numbered backreferences would point to wrong groups after joining, those patterns are searched one by one
+        joined = [index for index, regex in enumerate(self.regexes) if not re.search(r"\\[1-9]|\(\?\(\d", regex)]
+        self._alternation = None
+        if joined:
+            try:
+                self._alternation = re.compile("|".join(f"(?P<_{index}>{self.regexes[index]})" for index in joined))
+            except re.error:
+                # duplicated group names or inline flags in the middle of the alternation
+                joined = []
+        self._joined = [(index, re.compile(self.regexes[index])) for index in joined]
+        self._separate = [(index, re.compile(regex)) for index, regex in enumerate(self.regexes)
+                          if index not in joined]
+
+    def search(self, msg):
+        """Returns list of patterns found in msg, literal strings first, in order they were passed
+
+        Args:
+            msg (str): Message to search in
+        """
+        found = []
+        if self._automaton:
+            found += [self.texts[index] for index in sorted(self._automaton.search(msg))]
+        if self.regexes:
+            indexes = set()
+            if self._alternation:
+                spans = []
+                for match in self._alternation.finditer(msg):
+                    indexes.add(int(match.lastgroup[1:]))
+                    spans.append(range(match.start(), max(match.end(), match.start() + 1)))
+                # joined patterns not reported can start only inside the matched spans
+                for index, regex in self._joined:
+                    if index not in indexes and any(regex.match(msg, position) for span in spans for position in span):
+                        indexes.add(index)
+            indexes.update(index for index, regex in self._separate if regex.search(msg))
+            found += [self.regexes[index] for index in sorted(indexes)]
+        return found
+
+
+def _until_set(records, event):
+    """Yields records until event is set, used to stop reading of cancelled async queries
+
+    Args:
+        records (iterable): Records of the query
+        event (threading.Event): Event set when the query is cancelled
+    """
+    for record in records:
+        if event.is_set():
+            return
+        yield record
+
+
+def _next_chunk(records, size):
+    """Returns LogEntryList of up to size next records of records generator, runs in worker thread of async query
+
+    Args:
+        records (generator): Raw (date, level, msg) records of the query
+        size (int): Maximal number of logs in the chunk
+    """
+    chunk = LogEntryList()
+    for record in records:
+        chunk.append(_log_entry(*record))
+        if len(chunk) == size:
+            break
+    return chunk
+
+
+# asyncio.Semaphore of every event loop, limiting number of async queries reading a chunk at once
+_read_semaphores = weakref.WeakKeyDictionary()
+
+
+def _read_semaphore(limit):
+    """Returns semaphore of the running event loop limiting number of async queries reading a chunk at once
+
+    Args:
+        limit (int): Number of async queries reading at once, used when the semaphore is created
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _read_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _read_semaphores[loop] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+class Query:
+    """Composable query of logs read by ProfilLoggerReader, created by ProfilLoggerReader.query method.
+    Every filtering method returns new Query, so queries can be reused. All filters are checked in a single pass
+    by function generated for the query, level and text before date and regular expressions,
+    SQLLiteHandler filters logs in sql
+
+    Example:
+        reader.query().level_at_least("error").text("db").between("2021-01-01", "2021-02-01").find()
+
+    Attributes:
+        reader (ProfilLoggerReader): Reader that runs the query
+    """
+
+    def __init__(self, reader):
+        """Query initializer
+
+        Args:
+            reader (ProfilLoggerReader): Initializes the reader attribute
+        """
+        self.reader = reader
+        self._levels = None
+        self._texts = ()
+        self._regexes = ()
+        self._start_date = None
+        self._end_date = None
+
+    def __repr__(self):
+        """repr for developers"""
+        return (f"Query(levels={self._levels}, texts={self._texts}, regexes={self._regexes}, "
+                f"start_date={self._start_date}, end_date={self._end_date})")
+
+    def _with(self, **filters):
+        """Returns copy of the query with changed filters"""
+        query = Query(self.reader)
+        query.__dict__.update(self.__dict__)
+        query.__dict__.update(filters)
+        return query
+
+    def _with_levels(self, levels):
+        """Returns copy of the query with allowed levels limited to levels"""
+        if self._levels is not None:
+            levels = [level for level in self._levels if level in levels]
+        return self._with(_levels=tuple(levels))
+
+    def level(self, level):
+        """Returns query filtering logs with given level
+
+        Args:
+            level (str): Level of the logs
+        """
+        if not isinstance(level, str):
+            raise TypeError("Level needs to be a string")
+        return self._with_levels([level])
+
+    def level_at_least(self, level):
+        """Returns query filtering logs with given level or higher
 
-        if len(entry) <= 5:
-            raise ValueError("File name must be at least 6 characters long and include .json at the end")
+        Args:
+            level (str): One of LEVELS
+        """
+        if not isinstance(level, str):
+            raise TypeError("Level needs to be a string")
+        if level not in LEVELS:
+            raise ValueError(f"Level needs to be one of {list(LEVELS)}")
+        return self._with_levels([name for name, value in LEVELS.items() if value >= LEVELS[level]])
 
-        if len(entry) >= 60:
-            raise ValueError("Length of file name cannot get past 60 characters")
+    def text(self, text):
+        """Returns query filtering logs with msg containing text
 
-        if entry[-5:] != ".json":
-            raise ValueError("Passed file name does not end with '.json'")
+        Args:
+            text (str): Text that LogEntry.msg must contain
+        """
+        if not isinstance(text, str):
+            raise TypeError("Text needs to be a string")
+        return self._with(_texts=self._texts + (text,))
 
-        if entry[-6] in [" ", "."]:
-            raise ValueError("It is not possible to have space or dot before .json in file name")
+    def regex(self, regex):
+        """Returns query filtering logs with msg matching regular expression
 
-        invalid_characters = ["\\", "/", ":", "*", '"', "<", ">", "|"]
-        for character in entry[:-5]:
-            if character in invalid_characters:
-                raise ValueError(f"Any of the following are not allowed in a file name {invalid_characters}")
-        return super(JsonHandler, cls).__new__(cls)
+        Args:
+            regex (str): Valid regular expression, will be searched for in LogEntry.msg
+        """
+        if not isinstance(regex, str):
+            raise TypeError("Regex needs to be a string")
+        re.compile(regex)
+        return self._with(_regexes=self._regexes + (regex,))
 
-    def __init__(self, file_name="log.json"):
-        """JsonHandler initializer
+    def between(self, start_date=None, end_date=None):
+        """Returns query filtering logs by dates
 
-            Args:
-                file_name (Optional[str]): Initializes the file_name attribute
+        Args:
+            start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
         """
-        self.file_name = file_name
+        start_date, end_date = _validate_dates(start_date, end_date)
+        return self._with(_start_date=start_date, _end_date=end_date)
 
-    def __repr__(self):
-        """repr for developers"""
-        return f"JsonHandler({self.file_name})"
+    def _filters(self):
+        """Returns tuple of query filters: levels, texts, regexes, start_date and end_date"""
+        return self._levels, self._texts, self._regexes, self._start_date, self._end_date
 
-    def __str__(self):
-        """str for users"""
-        return self.file_name
+    def find(self):
+        """Returns LogEntryList of logs matching the query"""
+        return self.reader._run_query(self._filters(), result="find")
 
-    def save(self, log_entry):
-        """Saves LogEntry to a json file specified in file_name
+    def count(self):
+        """Returns number of logs matching the query"""
+        return self.reader._run_query(self._filters(), result="count")
+
+    def exists(self):
+        """Returns True if any log matches the query, stops reading on the first match"""
+        return self.reader._run_query(self._filters(), result="exists")
+
+    def count_by_level(self):
+        """Returns dict of levels and number of logs matching the query with given level"""
+        return self.reader._run_query(self._filters(), result="groupby", key="level", aggregate="count")
+
+    def afind(self, chunk_size=1000):
+        """Returns async iterator of LogEntryList chunks of logs matching the query,
+        see ProfilLoggerReader.afind_by_text
 
         Args:
-            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+            chunk_size Optional([int]): Maximal number of logs in a chunk
         """
+        self.reader._validate_chunk_size(chunk_size)
+        return self.reader._aiter_query(self._filters(), chunk_size)
 
-        class LogEncoder(json.JSONEncoder):
-            def default(self, log):
-                log.date = log.date.strftime('%d %b %Y %H:%M:%S')
-                return log.__dict__
+    def groupby(self, key="level", aggregate="list", k=1):
+        """Returns dict of groups of logs matching the query, see ProfilLoggerReader.groupby
 
-        with open(self.file_name, "a", newline='\n') as json_file:
-            json.dump(log_entry, json_file, cls=LogEncoder)
-            json_file.write('\n')
-
-    def read(self):
-        """Yields LogEntry from file specified in file_name"""
-        with open(self.file_name, 'r') as json_file:
-            for line in json_file:
-                yield LogEntry(msg=json.loads(line)["msg"], level=json.loads(line)["level"], date=json.loads(line)["date"])
+        Args:
+            key Optional([str]): One of GROUPBY_KEYS or callable receiving LogEntry and returning key of the group
+            aggregate Optional([str]): One of AGGREGATES
+            k Optional([int]): Size of the sample, used only by sample aggregate
+        """
+        _grouping(key, aggregate, k)
+        return self.reader._run_query(self._filters(), result="groupby", key=key, aggregate=aggregate, k=k)
 
 
-class SQLLiteHandler:
-    """Class used to save and read LogEntry to and from .sqlite file
+class ProfilLoggerReader:
+    """Class used to receive filtered list of LogEntry instances
 
     Attributes:
-        file_name (str): Name of a file to save to, or to read from. It works in current working directory.
+        handler (Handler): Instance of a valid Handler
+        max_concurrent_reads (int): Number of async queries of all readers reading logs at once on an event loop,
+            used when the first async query runs on the loop
     """
+    max_concurrent_reads = 4
 
-    def __new__(cls, entry="log.sqlite"):
-        """SQLLiteHandler constructor creates instance only if entry is viable file name in all OS
+    def __new__(cls, handler, cache=None, chunk_cache=None):
+        """ProfilLoggerReader constructor prevents creation of LoggerReader with invalid Handler
 
-            Args:
-                entry (Optional[str]): name of a file to save to or read from, will default to log.sqlite if not specified
+        Args:
+            handler (Handler): Instance of a valid Handler
+            cache (Optional[ResultCache]): Cache of results
+            chunk_cache (Optional[ChunkCache]): Cache of parsed records
         """
+        if isinstance(handler, tuple(HANDLERS)) and "read" in handler_capabilities(handler):
+            return super(ProfilLoggerReader, cls).__new__(cls)
+        raise TypeError("Unsupported type passed as Handler")
 
-        if entry == "log.sqlite":
-            return super(SQLLiteHandler, cls).__new__(cls)
+    def __init__(self, handler, cache=None, chunk_cache=None):
+        """ProfilLoggerReader initializer
 
-        if not isinstance(entry, str):
-            raise TypeError("Input should be a string")
+        Args:
+            handler (Handler): Initializes the handler value
+            cache (Optional[ResultCache]): Initializes the cache value, results are not cached if not specified
+            chunk_cache (Optional[ChunkCache]): Initializes the chunk_cache value, used by FileHandler, CSVHandler
+            and JsonHandler, file is parsed by every query if not specified
+        """
+        if cache is not None and not isinstance(cache, ResultCache):
+            raise TypeError("cache needs to be an instance of ResultCache")
+        if chunk_cache is not None and not isinstance(chunk_cache, ChunkCache):
+            raise TypeError("chunk_cache needs to be an instance of ChunkCache")
+        self.handler = handler
+        self.cache = cache
+        self.chunk_cache = chunk_cache
+        self.capabilities = handler_capabilities(handler)
+        # set on copies of the reader, which read only logs appended since the result was cached
+        self._tail_start = None
 
-        if len(entry) <= 7:
-            raise ValueError("File name must be at least 8 characters long and include .sqlite at the end")
+    def _read(self, tokens=(), level=None, start_date=None, end_date=None):
+        """Yields raw (date, level, msg) tuples from handler, when handler has SegmentSummaries
+        segments that cannot contain logs matching passed arguments are not read. When handler's logs
+        are in time order and dates are passed, only logs between the dates are read
 
-        if len(entry) >= 60:
-            raise ValueError("Length of file name cannot get past 60 characters")
+        Args:
+            tokens Optional([list]): Tokens that message must contain as whole tokens
+            level Optional([str, tuple]): Level of the log, or tuple of allowed levels
+            start_date Optional([datetime]): Minimal date of the log
+            end_date Optional([datetime]): Maximal date of the log
+        """
+        file_name = getattr(self.handler, "file_name", None)
+        chunked = self.chunk_cache is not None and file_name is not None and {"read_range", "version"} <= \
+            self.capabilities and "supports_pushdown" not in self.capabilities
+        read_range = functools.partial(self.chunk_cache.records, self.handler) if chunked \
+            else getattr(self.handler, "read_range", None)
+        if self._tail_start is not None:
+            for offset, date, log_level, msg in read_range(self._tail_start):
+                yield date, log_level, msg
+            return
+        summaries = getattr(self.handler, "summaries", None)
+        if (start_date or end_date) and not summaries and self.handler.time_ordered and read_range \
+                and (file_name is None or os.path.exists(file_name)):
+            yield from self._read_ordered(start_date, end_date)
+            return
+        if not summaries or not os.path.exists(file_name):
+            if not chunked:
+                yield from self.handler.read_raw()
+                return
+            for offset, date, log_level, msg in read_range(0):
+                yield date, log_level, msg
+            return
+        for start, end in summaries.ranges(tokens, level, start_date, end_date):
+            for offset, date, log_level, msg in read_range(start, end):
+                yield date, log_level, msg
+
+    def _pushdown(self):
+        """Returns True if filters can be passed to handler, which filters logs itself"""
+        return "supports_pushdown" in self.capabilities and self._tail_start is None
+
+    def _file_missing(self):
+        """Returns True if file specified in handler's file_name doesn't exist. Handlers filtering logs themselves
+        are not asked for logs of missing file, they have none and SQLLiteHandler would create the file"""
+        file_name = getattr(self.handler, "file_name", None)
+        return file_name is not None and not os.path.exists(file_name)
+
+    def _read_indexed(self, tokens, edge_tokens=()):
+        """Yields raw (offset, date, level, msg) tuples of records containing all tokens found by handler's
+        TokenIndex, followed by records saved after the last indexed segment, in the order of the file
 
-        if entry[-7:] != ".sqlite":
-            raise ValueError("Passed file name does not end with '.sqlite'")
+        Args:
+            tokens (list): Tokens that message must contain as whole tokens
+            edge_tokens Optional([list]): Tokens that can be parts of message tokens, returned by _edge_tokens
+        """
+        offsets, indexed_until = self.handler.index.lookup(tokens, edge_tokens)
+        yield from self.handler.read_at(offsets)
+        if os.path.exists(self.handler.file_name):
+            yield from self.handler.read_range(indexed_until)
+
+    def _read_ordered(self, start_date=None, end_date=None):
+        """Yields raw (date, level, msg) tuples with dates between start_date and end_date from handler
+        with time_ordered set to True by the user, as they are read. Reading starts at the first log past
+        start_date, found by binary search when handler has seek_date method, and stops on the first log past
+        end_date. When logs out of time order are found, handler's time_ordered is set to False and all the other
+        logs are yielded: the rest of the file, then logs before the first read one, callers filter them by dates
 
-        if entry[-8] in [" ", "."]:
-            raise ValueError("It is not possible to have space or dot before .sqlite in file name")
+        Args:
+            start_date Optional([datetime]): Minimal date of the log
+            end_date Optional([datetime]): Maximal date of the log
+        """
+        seek_date = getattr(self.handler, "seek_date", None)
+        start = start_date.isoformat() if start_date else ""
+        end = end_date.isoformat() if end_date else None
+        position = seek_date(start_date) if seek_date and start else 0
+        records, previous = self.handler.read_range(position), ""
+        try:
+            for offset, date, level, msg in records:
+                iso_date = _iso_date(date)
+                if iso_date < previous:
+                    self.handler.time_ordered = False
+                    yield date, level, msg
+                    for offset, date, level, msg in records:
+                        yield date, level, msg
+                    if position:
+                        for offset, date, level, msg in self.handler.read_range(0, position):
+                            yield date, level, msg
+                    return
+                if end and end < iso_date:
+                    return
+                previous = iso_date
+                if iso_date >= start:
+                    yield date, level, msg
+        finally:
+            close = getattr(records, "close", None)
+            if close is not None:
+                close()
+
+    def _raw_records(self, start_date=None, end_date=None):
+        """Yields (date, level, msg) tuples from handler's raw rows, with date converted to iso format string,
+        filtered by dates. LogEntry instances are not created
 
-        invalid_characters = ["\\", "/", ":", "*", '"', "<", ">", "|"]
-        for character in entry[:-7]:
-            if character in invalid_characters:
-                raise ValueError(f"Any of the following are not allowed in a file name {invalid_characters}")
-        return super(SQLLiteHandler, cls).__new__(cls)
+        Args:
+            start_date Optional([datetime]): If passed will filter logs with date past the start_date
+            end_date Optional([datetime]): If passed will filter logs with date before the end_date
+        """
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+        for date, level, msg in self._read(start_date=start_date, end_date=end_date):
+            date = _iso_date(date)
+            if start and date < start:
+                continue
+            if end and end < date:
+                continue
+            yield date, level, msg
+
+    def _matching(self, text=None, regex=None, level=None, start_date=None, end_date=None):
+        """Yields raw (date, level, msg) tuples matching passed arguments, level and message are checked before
+        the date is converted. LogEntry instances are not created. When handler has TokenIndex and text contains
+        a word character, only records with all tokens of the text are read, tokens at the start and at the end
+        of the text are looked up as suffixes, prefixes or parts of indexed tokens
 
-    def __init__(self, file_name="log.sqlite"):
-        """SQLLiteHandler initializer
+        Args:
+            text Optional([str]): Text that msg must contain
+            regex Optional([str]): Regular expression that will be searched for in msg
+            level Optional([str]): Level of the logs
+            start_date Optional([datetime]): If passed will filter logs with date past the start_date
+            end_date Optional([datetime]): If passed will filter logs with date before the end_date
+        """
+        search = re.compile(regex).search if regex is not None else None
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+        tokens = _whole_tokens(text) if text is not None else ()
+        edge_tokens = _edge_tokens(text) if text is not None else ()
+        if (tokens or edge_tokens) and getattr(self.handler, "index", None) and self._tail_start is None:
+            records = (record[1:] for record in self._read_indexed(tokens, edge_tokens))
+        else:
+            records = self._read(tokens, level, start_date, end_date)
+        for date, log_level, msg in records:
+            if level is not None and log_level != level:
+                continue
+            if text is not None and text not in msg:
+                continue
+            if search and not search(msg):
+                continue
+            if start or end:
+                iso_date = _iso_date(date)
+                if start and iso_date < start:
+                    continue
+                if end and end < iso_date:
+                    continue
+            yield date, log_level, msg
+
+    @staticmethod
+    def _validate_filters(text=None, regex=None, level=None):
+        """Validates text, regex and level passed to count and exists methods
 
-            Args:
-                file_name (Optional[str]): Initializes the file_name attribute
+        Args:
+            text Optional([str]): Text that msg must contain
+            regex Optional([str]): Valid regular expression
+            level Optional([str]): Level of the logs
         """
-        self.file_name = file_name
+        if text is not None and not isinstance(text, str):
+            raise TypeError("Text needs to be a string")
+        if regex is not None:
+            if not isinstance(regex, str):
+                raise TypeError("Regex needs to be a string")
+            re.compile(regex)
+        if level is not None and not isinstance(level, str):
+            raise TypeError("Level needs to be a string")
 
-    def save(self, log_entry):
-        """Saves LogEntry to a sqlite file specified in file_name
+    @_cached(_merge_sums)
+    def count_by_text(self, text, level=None, start_date=None, end_date=None):
+        """Method used to count logs from file specified in handler's file_name containing text,
+        LogEntry instances are not created. Can also filter by level and dates
 
         Args:
-            log_entry (LogEntry): Instance of LogEntry class, containing date, level and msg
+            text (str): Text that LogEntry.msg must contain
+            level Optional([str]): If passed will count only logs with given level
+            start_date Optional([str]): Date in iso format. If passed will count logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will count logs with date before the end_date
         """
-        import sqlite3
-        connection = sqlite3.connect(self.file_name)
-        cursor = connection.cursor()
-        cursor.execute("CREATE TABLE IF NOT EXISTS logs (date VARCHAR, level VARCHAR, msg VARCHAR);")
-        cursor.execute(f"INSERT INTO logs (date, level, msg) VALUES "
-                       f"('{log_entry.date.strftime('%d %b %Y %H:%M:%S')}',"
-                       f"'{log_entry.level}',"
-                       f"'{log_entry.msg}');")
-        connection.commit()
-        connection.close()
+        if not isinstance(text, str):
+            raise TypeError("Text needs to be a string")
+        return self._count(text=text, level=level, start_date=start_date, end_date=end_date)
 
-    def read(self):
-        """Yields LogEntry from file specified in file_name"""
-        import sqlite3
-        connection = sqlite3.connect(self.file_name)
-        cursor = connection.cursor()
-        for row in cursor.execute("SELECT * FROM logs"):
-            yield LogEntry(date=row[0], level=row[1], msg=row[2])
-        connection.close()
+    @_cached(_merge_sums)
+    def count_by_regex(self, regex, level=None, start_date=None, end_date=None):
+        """Method used to count logs from file specified in handler's file_name matching regular expression,
+        LogEntry instances are not created. Can also filter by level and dates
 
+        Args:
+            regex (str): Valid regular expression, will be searched for in LogEntry.msg
+            level Optional([str]): If passed will count only logs with given level
+            start_date Optional([str]): Date in iso format. If passed will count logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will count logs with date before the end_date
+        """
+        if not isinstance(regex, str):
+            raise TypeError("Regex needs to be a string")
+        return self._count(regex=regex, level=level, start_date=start_date, end_date=end_date)
+
+    def _count(self, text=None, regex=None, level=None, start_date=None, end_date=None):
+        """Counts logs matching passed arguments, uses handler's count method if it has one,
+        like SELECT COUNT(*) of SQLLiteHandler"""
+        self._validate_filters(text, regex, level)
+        start_date, end_date = _validate_dates(start_date, end_date)
+        missing = self._file_missing()
+        if missing and self._pushdown():
+            return 0
+        if "count" in self.capabilities and self._tail_start is None and not missing:
+            return self.handler.count(text, regex, level, start_date, end_date)
+        return sum(1 for _ in self._matching(text, regex, level, start_date, end_date))
+
+    def query(self):
+        """Returns Query of all logs from file specified in handler's file_name, filters are added by it's methods
+        and logs are read by find, count, exists, count_by_level or groupby methods of the Query"""
+        return Query(self)
+
+    def _query_records(self, levels=None, texts=(), regexes=(), start_date=None, end_date=None, cancelled=None):
+        """Yields raw (date, level, msg) tuples with date in iso format matching all passed filters in a single pass,
+        records are filtered by function generated by _compile_filter
 
-class LogEntry:
-    """Class used to represent logs
+        Args:
+            levels Optional([tuple]): Allowed levels of the logs
+            texts Optional([tuple]): Texts that msg must contain
+            regexes Optional([tuple]): Regular expressions that will be searched for in msg
+            start_date Optional([datetime]): Minimal date of the log
+            end_date Optional([datetime]): Maximal date of the log
+            cancelled Optional([threading.Event]): If passed reading stops when the event is set
+        """
+        if self._pushdown():
+            if self._file_missing():
+                return
+            rows = self.handler.select(texts, regexes, levels, start_date, end_date)
+            for date, level, msg in rows if cancelled is None else _until_set(rows, cancelled):
+                yield _iso_date(date), level, msg
+            return
+        query_filter = _compile_filter(levels, texts, regexes, start_date, end_date)
+        tokens = [token for text in texts for token in _whole_tokens(text)]
+        records = self._read(tokens, levels, start_date, end_date)
+        yield from query_filter(records if cancelled is None else _until_set(records, cancelled))
+
+    async def _aiter_query(self, filters, chunk_size=1000):
+        """Async generator of LogEntryList chunks of logs matching filters. Logs are read in a worker thread
+        owned by the query, so SQLite connection is used by one thread, while up to max_concurrent_reads queries
+        read a chunk at once. The semaphore is held only while a chunk is read, so suspended or abandoned
+        generators don't block other queries. When the generator is closed or cancelled reading stops and file
+        or connection is closed
 
-    Attributes:
-        msg (str): Message of the log
-        level (str): Level of the log
-        date Optional([datetime]): Instance of datetime containing the date that the log was created,
-        if not specified will default to current system's date
-    """
-    def __init__(self, msg, level, date=None):
-        """LogEntry initializer
+        Args:
+            filters (tuple): Filters returned by Query._filters
+            chunk_size Optional([int]): Maximal number of logs in a chunk
+        """
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ProfilLoggerReader")
+        records = self._query_records(*filters, cancelled=cancelled)
+        try:
+            while True:
+                async with _read_semaphore(self.max_concurrent_reads):
+                    chunk = await loop.run_in_executor(executor, _next_chunk, records, chunk_size)
+                if chunk:
+                    yield chunk
+                if len(chunk) < chunk_size:
+                    return
+        finally:
+            # closing runs in the worker thread after the chunk being read, which stops on cancelled event
+            cancelled.set()
+            executor.submit(records.close)
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _validate_chunk_size(chunk_size):
+        """Raises TypeError or ValueError if chunk_size is not a positive int"""
+        if isinstance(chunk_size, bool) or not isinstance(chunk_size, int):
+            raise TypeError("chunk_size needs to be an int")
+        if chunk_size < 1:
+            raise ValueError("chunk_size needs to be greater than 0")
+
+    def afind_by_text(self, text, start_date=None, end_date=None, chunk_size=1000):
+        """Async variant of find_by_text for asyncio applications, returns async iterator of LogEntryList chunks
+        of up to chunk_size logs, file or sqlite database is read in a worker thread, so the event loop is not
+        blocked. Break of async for or cancellation of the task stops reading and closes the file
+
+        Example:
+            async for chunk in reader.afind_by_text("error"):
+                ...
 
         Args:
-            msg (str): Initializes the msg attribute
-            level (str): Initializes the level attribute
-            date Optional([str]): Initializes the date attribute, works only with date in "%d %b %Y %H:%M:%S" format
-            if date is not specified will default to current system's date
+            text (str): Text that LogEntry.msg must contain
+            start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
+            chunk_size Optional([int]): Maximal number of logs in a chunk
         """
-        if date:
-            if isinstance(date, datetime.datetime):
-                self.date = date
-            else:
-                try:
-                    self.date = datetime.datetime.strptime(date, "%d %b %Y %H:%M:%S")
-                except ValueError:
-                    print("Wrong format of a date")
-        else:
-            self.date = datetime.datetime.now()
-        self.level = level
-        self.msg = msg
+        if not isinstance(text, str):
+            raise TypeError("Text needs to be a string")
+        self._validate_chunk_size(chunk_size)
+        start_date, end_date = _validate_dates(start_date, end_date)
+        return self._aiter_query((None, (text,), (), start_date, end_date), chunk_size)
 
-    def __repr__(self):
-        """repr for developers"""
-        return f"LogEntry({self.date}, {self.level}, {self.msg})"
+    def afind_by_regex(self, regex, start_date=None, end_date=None, chunk_size=1000):
+        """Async variant of find_by_regex, returns async iterator of LogEntryList chunks, see afind_by_text
 
-    def __str__(self):
-        """str for users"""
-        return f"{self.date.strftime('%d %b %Y %H:%M:%S')} ; {self.level} ; {self.msg}"
+        Args:
+            regex (str): Valid regular expression, will be searched for in LogEntry.msg
+            start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
+            chunk_size Optional([int]): Maximal number of logs in a chunk
+        """
+        if not isinstance(regex, str):
+            raise TypeError("Regex needs to be a string")
+        re.compile(regex)
+        self._validate_chunk_size(chunk_size)
+        start_date, end_date = _validate_dates(start_date, end_date)
+        return self._aiter_query((None, (), (regex,), start_date, end_date), chunk_size)
 
-    def __eq__(self, other):
-        """method used during comparison of two LogEntry objects, returns True if both contain the same informations
-        else returns False
+    def afind(self, text=None, regex=None, level=None, start_date=None, end_date=None, chunk_size=1000):
+        """Async iterator of LogEntryList chunks of logs matching all passed arguments, see afind_by_text
 
         Args:
-            other (LogEntry): Instance of LogEntry class, containing date, level and msg
+            text Optional([str]): Text that LogEntry.msg must contain
+            regex Optional([str]): Valid regular expression, will be searched for in LogEntry.msg
+            level Optional([str]): Level of the logs
+            start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
+            chunk_size Optional([int]): Maximal number of logs in a chunk
         """
-        if self.msg == other.msg:
-            if self.level == other.level:
-                if self.date == other.date:
-                    return True
-        return False
-
+        self._validate_filters(text, regex, level)
+        self._validate_chunk_size(chunk_size)
+        start_date, end_date = _validate_dates(start_date, end_date)
+        filters = (None if level is None else (level,), () if text is None else (text,),
+                   () if regex is None else (regex,), start_date, end_date)
+        return self._aiter_query(filters, chunk_size)
 
-class ProfilLoggerReader:
-    """Class used to receive filtered list of LogEntry instances
+    @_cached(_merge_query)
+    def _run_query(self, filters, result="find", key="level", aggregate="count", k=1):
+        """Runs Query, returns result of it's method
 
-    Attributes:
-        handler (Handler): Instance of a valid Handler
-    """
+        Args:
+            filters (tuple): Filters returned by Query._filters
+            result Optional([str]): find, count, exists or groupby
+            key Optional([str]): Key of groupby
+            aggregate Optional([str]): Aggregate of groupby
+            k Optional([int]): Size of the sample of groupby
+        """
+        levels, texts, regexes, start_date, end_date = filters
+        sql = self._pushdown() and not self._file_missing()
+        if result == "count" and sql:
+            return self.handler.count(texts, regexes, levels, start_date, end_date)
+        if result == "exists" and sql:
+            return self.handler.exists(texts, regexes, levels, start_date, end_date)
+        if result == "groupby" and key == "level" and aggregate == "count" and sql:
+            return self.handler.count_by_level(start_date, end_date, texts, regexes, levels)
+        records = self._query_records(*filters)
+        if result == "count":
+            return sum(1 for _ in records)
+        if result == "exists":
+            try:
+                return next(records, None) is not None
+            finally:
+                records.close()
+        if result == "groupby":
+            return _group_records(records, _grouping(key, aggregate, k), aggregate, k)
+        return LogEntryList(_log_entry(*record) for record in records)
+
+    @_cached(_merge_groups)
+    def count_by_level(self, start_date=None, end_date=None):
+        """Method used to get dict of levels and number of logs with given level from file specified
+        in handler's file_name, LogEntry instances are not created. Can filter by dates
 
-    def __new__(cls, handler):
-        """ProfilLoggerReader constructor prevents creation of LoggerReader with invalid Handler
+        Args:
+            start_date Optional([str]): Date in iso format. If passed will count logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will count logs with date before the end_date
+        """
+        start_date, end_date = _validate_dates(start_date, end_date)
+        if self._pushdown():
+            return {} if self._file_missing() else self.handler.count_by_level(start_date, end_date)
+        levels = {}
+        for date, level, msg in self._matching(start_date=start_date, end_date=end_date):
+            levels[level] = levels.get(level, 0) + 1
+        return levels
+
+    @_cached(_merge_exists)
+    def exists(self, text=None, regex=None, level=None, start_date=None, end_date=None):
+        """Method used to check if any log from file specified in handler's file_name matches passed arguments,
+        stops reading on the first match
 
         Args:
-            handler (Handler): Instance of a valid Handler
+            text Optional([str]): Text that LogEntry.msg must contain
+            regex Optional([str]): Valid regular expression, will be searched for in LogEntry.msg
+            level Optional([str]): Level of the log
+            start_date Optional([str]): Date in iso format. If passed will look for logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will look for logs with date before the end_date
         """
-        viable_handlers = [FileHandler, CSVHandler, JsonHandler, SQLLiteHandler]
-        for viable_handler in viable_handlers:
-            if isinstance(handler, viable_handler):
-                return super(ProfilLoggerReader, cls).__new__(cls)
-        else:
-            raise TypeError("Unsupported type passed as Handler")
+        self._validate_filters(text, regex, level)
+        start_date, end_date = _validate_dates(start_date, end_date)
+        if self._pushdown():
+            return not self._file_missing() and self.handler.exists(text, regex, level, start_date, end_date)
+        matching = self._matching(text, regex, level, start_date, end_date)
+        try:
+            return next(matching, None) is not None
+        finally:
+            matching.close()
 
-    def __init__(self, handler):
-        """ProfilLoggerReader initializer
+    def to_arrays(self, start_date=None, end_date=None):
+        """Method used to get columns of logs from file specified in handler's file_name as numpy arrays,
+        arrays are built directly from handler's raw rows, requires numpy. Can filter by dates
 
         Args:
-            handler (Handler): Initializes the handler value
+            start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
         """
-        self.handler = handler
+        start_date, end_date = _validate_dates(start_date, end_date)
+        dates, levels, msgs = [], [], []
+        for date, level, msg in self._raw_records(start_date, end_date):
+            dates.append(date)
+            levels.append(level)
+            msgs.append(msg)
+        return _build_arrays(dates, levels, msgs)
+
+    def to_dataframe(self, start_date=None, end_date=None):
+        """Method used to get logs from file specified in handler's file_name as pandas DataFrame
+        with date, level and msg columns, requires numpy and pandas. Can filter by dates
+
+        Args:
+            start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
+            end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
+        """
+        return _build_dataframe(self.to_arrays(start_date, end_date))
 
+    @_cached(_merge_lists)
     def find_by_text(self, text, start_date=None, end_date=None):
         """Method used to get filter list of LogEntry instances from file specified in handler's file_name
         Needs to filter by text, can also filter by dates
@@ -517,47 +5132,13 @@ class ProfilLoggerReader:
         if not isinstance(text, str):
             raise TypeError("Text needs to be a string")
 
-        # start_date validation
-        if start_date:
-            if isinstance(start_date, datetime.datetime):
-                pass
-            else:
-                if isinstance(start_date, str):
-                    try:
-                        start_date = datetime.datetime.fromisoformat(start_date)
-                    except ValueError:
-                        raise ValueError("Please use iso format")
-                else:
-                    raise TypeError("start_date needs to be a string")
-
-        # end_date validation
-        if end_date:
-            if isinstance(end_date, datetime.datetime):
-                pass
-            else:
-                if isinstance(end_date, str):
-                    try:
-                        end_date = datetime.datetime.fromisoformat(end_date)
-                    except ValueError:
-                        raise ValueError("Please use iso format")
-                else:
-                    raise TypeError("start_date needs to be a string")
-            if start_date:
-                if end_date < start_date:
-                    raise ValueError("end_date needs to be past start_date")
+        start_date, end_date = _validate_dates(start_date, end_date)
 
         # filtration of logs based on passed arguments
-        if not start_date and not end_date:
-            filtered_logs = [log for log in self.handler.read() if text in log.msg]
-        if start_date and not end_date:
-            filtered_logs = [log for log in self.handler.read() if text in log.msg and start_date <= log.date]
-        if not start_date and end_date:
-            filtered_logs = [log for log in self.handler.read() if text in log.msg and log.date <= end_date]
-        if start_date and end_date:
-            filtered_logs = [log for log in self.handler.read() if text in log.msg and start_date <= log.date <= end_date]
-
-        return filtered_logs
+        logs = self._matching(text=text, start_date=start_date, end_date=end_date)
+        return LogEntryList(LogEntry(msg=msg, level=level, date=date) for date, level, msg in logs)
 
+    @_cached(_merge_lists)
     def find_by_regex(self, regex, start_date=None, end_date=None):
         """Method used to get filter list of LogEntry instances from file specified in handler's file_name
             Needs to filter by regular expression, can also filter by dates
@@ -567,7 +5148,6 @@ class ProfilLoggerReader:
                 start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
                 end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
         """
-        import re
         # regex validation
         if not isinstance(regex, str):
             raise TypeError("Regex needs to be a string")
@@ -576,49 +5156,140 @@ class ProfilLoggerReader:
         except re.error as error:
             raise re.error(error)
 
-        # start_date validation
-        if start_date:
-            if isinstance(start_date, datetime.datetime):
-                pass
-            else:
-                if isinstance(start_date, str):
-                    try:
-                        start_date = datetime.datetime.fromisoformat(start_date)
-                    except ValueError:
-                        raise ValueError("Please use iso format")
-                else:
-                    raise TypeError("start_date needs to be a string")
-
-        # end_date validation
-        if end_date:
-            if isinstance(end_date, datetime.datetime):
-                pass
-            else:
-                if isinstance(end_date, str):
-                    try:
-                        end_date = datetime.datetime.fromisoformat(end_date)
-                    except ValueError:
-                        raise ValueError("Please use iso format")
-                else:
-                    raise TypeError("start_date needs to be a string")
-            if start_date:
-                if end_date < start_date:
-                    raise ValueError("end_date needs to be past start_date")
+        start_date, end_date = _validate_dates(start_date, end_date)
 
         # filtration of logs based on passed arguments
-        if not start_date and not end_date:
-            filtered_logs = [log for log in self.handler.read() if re.search(regex, log.msg)]
-        if start_date and not end_date:
-            filtered_logs = [log for log in self.handler.read() if re.search(regex, log.msg)
-                                                                and start_date <= log.date]
-        if not start_date and end_date:
-            filtered_logs = [log for log in self.handler.read() if re.search(regex, log.msg)
-                                                                and log.date <= end_date]
-        if start_date and end_date:
-            filtered_logs = [log for log in self.handler.read() if
-                             re.search(regex, log.msg) and start_date <= log.date <= end_date]
+        logs = self._matching(regex=regex, start_date=start_date, end_date=end_date)
+        return LogEntryList(LogEntry(msg=msg, level=level, date=date) for date, level, msg in logs)
+
+    @_cached(_merge_many)
+    def find_many(self, queries):
+        """Method used to run many queries with a single read of the file specified in handler's file_name,
+            every log is checked against every query and LogEntry is created once per log, even if it matches
+            many queries. Returns list of LogEntryList, one for every query, in the same order as queries
+
+            Args:
+                queries (list): List of dicts with optional keys: text (str) - text that LogEntry.msg must contain,
+                regex (str) - valid regular expression, level (str) - level of the log, start_date and end_date
+                (str) - dates in iso format
+        """
+        if not isinstance(queries, list):
+            raise TypeError("Passed argument must be a list")
+        query_keys = {"text", "regex", "level", "start_date", "end_date"}
+        compiled_queries = []
+        for query in queries:
+            if not isinstance(query, dict):
+                raise TypeError("Query needs to be a dict")
+            if not set(query) <= query_keys:
+                raise ValueError(f"Query can contain only following keys {sorted(query_keys)}")
+            text, regex, level = query.get("text"), query.get("regex"), query.get("level")
+            self._validate_filters(text, regex, level)
+            start_date, end_date = _validate_dates(query.get("start_date"), query.get("end_date"))
+            compiled_queries.append((text,
+                                     re.compile(regex).search if regex is not None else None,
+                                     level,
+                                     start_date.isoformat() if start_date else None,
+                                     end_date.isoformat() if end_date else None))
+
+        results = [LogEntryList() for _ in compiled_queries]
+        routes = list(zip(compiled_queries, results))
+        for date, log_level, msg in self._read():
+            iso_date = None
+            log = None
+            for (text, search, level, start, end), result in routes:
+                if level is not None and log_level != level:
+                    continue
+                if text is not None and text not in msg:
+                    continue
+                if search is not None and not search(msg):
+                    continue
+                if iso_date is None:
+                    iso_date = _iso_date(date)
+                if start and iso_date < start:
+                    continue
+                if end and end < iso_date:
+                    continue
+                if log is None:
+                    log = _log_entry(iso_date, log_level, msg)
+                result.append(log)
+        return results
+
+    @_cached(_merge_lists)
+    def find_by_token(self, text, start_date=None, end_date=None):
+        """Method used to get filter list of LogEntry instances from file specified in handler's file_name
+            with text in LogEntry.msg as whole words, "error" matches "db error:" but not "errors".
+            When handler has TokenIndex only records containing all the tokens of the text are read,
+            texts that don't start and end with a word character are searched by reading the whole file.
+            Can also filter by dates
+
+            Args:
+                text (str): Words that LogEntry.msg must contain
+                start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
+                end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
+        """
+        if not isinstance(text, str):
+            raise TypeError("Text needs to be a string")
+        start_date, end_date = _validate_dates(start_date, end_date)
+        search = re.compile(r"(?<!\w)" + re.escape(text) + r"(?!\w)").search
+        index = getattr(self.handler, "index", None)
+        if index and self._tail_start is None and re.fullmatch(r"\w(.*\w)?", text, re.S):
+            records = self._read_indexed(TOKEN.findall(text))
+        else:
+            records = self._read(TOKEN.findall(text), start_date=start_date, end_date=end_date)
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+        filtered_logs = LogEntryList()
+        for *offset, date, level, msg in records:
+            if not search(msg):
+                continue
+            date = _iso_date(date)
+            if (start and date < start) or (end and end < date):
+                continue
+            filtered_logs.append(_log_entry(date, level, msg))
         return filtered_logs
 
+    @_cached(_merge_patterns)
+    def find_by_patterns(self, texts=None, regexes=None, start_date=None, end_date=None):
+        """Method used to search for many strings and regular expressions at once in logs from file specified
+            in handler's file_name, returns list of (LogEntry, list of found patterns) tuples. Can filter by dates
+
+            Args:
+                texts Optional([list]): List of strings that will be searched for in LogEntry.msg
+                regexes Optional([list]): List of valid regular expressions, will be searched for in LogEntry.msg
+                start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
+                end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
+        """
+        if texts is not None and not isinstance(texts, list):
+            raise TypeError("texts need to be a list")
+        if regexes is not None and not isinstance(regexes, list):
+            raise TypeError("regexes need to be a list")
+        patterns = PatternSet(texts, regexes)
+        start_date, end_date = _validate_dates(start_date, end_date)
+        found_logs = []
+        for date, level, msg in self._raw_records(start_date, end_date):
+            found = patterns.search(msg)
+            if found:
+                found_logs.append((_log_entry(date, level, msg), found))
+        return found_logs
+
+    @_cached(_merge_groups)
+    def groupby(self, key="level", aggregate="list", start_date=None, end_date=None, k=1):
+        """Method used to group logs from file specified in handler's file_name in a single pass,
+            memory used depends on number of groups, not number of logs, unless aggregate is list. Can filter by dates
+
+            Args:
+                key Optional([str]): One of GROUPBY_KEYS: level, minute, hour, day, year_month, month,
+                or callable receiving LogEntry and returning key of the group
+                aggregate Optional([str]): One of AGGREGATES: count - number of logs, first - first LogEntry,
+                last - last LogEntry, list - list of LogEntry, sample - list of up to k randomly chosen LogEntry
+                start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
+                end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
+                k Optional([int]): Size of the sample, used only by sample aggregate
+        """
+        key_function = _grouping(key, aggregate, k)
+        start_date, end_date = _validate_dates(start_date, end_date)
+        return _group_records(self._raw_records(start_date, end_date), key_function, aggregate, k)
+
     def groupby_level(self, start_date=None, end_date=None):
         """Method used to get grouped by level dict of LogEntry instances from file specified in handler's file_name
             Can filter by dates
@@ -627,126 +5298,15 @@ class ProfilLoggerReader:
                 start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
                 end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
         """
-        # start_date validation
-        if start_date:
-            if isinstance(start_date, datetime.datetime):
-                pass
-            else:
-                if isinstance(start_date, str):
-                    try:
-                        start_date = datetime.datetime.fromisoformat(start_date)
-                    except ValueError:
-                        raise ValueError("Please use iso format")
-                else:
-                    raise TypeError("start_date needs to be a string")
-
-        # end_date validation
-        if end_date:
-            if isinstance(end_date, datetime.datetime):
-                pass
-            else:
-                if isinstance(end_date, str):
-                    try:
-                        end_date = datetime.datetime.fromisoformat(end_date)
-                    except ValueError:
-                        raise ValueError("Please use iso format")
-                else:
-                    raise TypeError("start_date needs to be a string")
-            if start_date:
-                if end_date < start_date:
-                    raise ValueError("end_date needs to be past start_date")
-        log_dict = {}
-        if not start_date and not end_date:
-            for log in self.handler.read():
-                if log.level not in log_dict.keys():
-                    log_dict[log.level] = []
-                log_dict[log.level].append(log)
-
-        if start_date and not end_date:
-            for log in self.handler.read():
-                if start_date <= log.date:
-                    if log.level not in log_dict.keys():
-                        log_dict[log.level] = []
-                    log_dict[log.level].append(log)
-
-        if not start_date and end_date:
-            for log in self.handler.read():
-                if log.date <= end_date:
-                    if log.level not in log_dict.keys():
-                        log_dict[log.level] = []
-                    log_dict[log.level].append(log)
-
-        if start_date and end_date:
-            for log in self.handler.read():
-                if start_date <= log.date <= end_date:
-                    if log.level not in log_dict.keys():
-                        log_dict[log.level] = []
-                    log_dict[log.level].append(log)
-
-        return log_dict
+        return self.groupby(key="level", aggregate="list", start_date=start_date, end_date=end_date)
 
     def groupby_month(self, start_date=None, end_date=None):
         """Method used to get grouped by month dict of LogEntry instances from file specified in handler's file_name
-            Can filter by dates
+            Logs from the same month of different years are in the same group, use groupby with year_month key
+            to separate them. Can filter by dates
 
             Args:
                 start_date Optional([str]): Date in iso format. If passed will filter logs with date past the start_date
                 end_date Optional([str]): Date in iso format. If passed will filter logs with date before the end_date
         """
-        # start_date validation
-        if start_date:
-            if isinstance(start_date, datetime.datetime):
-                pass
-            else:
-                if isinstance(start_date, str):
-                    try:
-                        start_date = datetime.datetime.fromisoformat(start_date)
-                    except ValueError:
-                        raise ValueError("Please use iso format")
-                else:
-                    raise TypeError("start_date needs to be a string")
-
-        # end_date validation
-        if end_date:
-            if isinstance(end_date, datetime.datetime):
-                pass
-            else:
-                if isinstance(end_date, str):
-                    try:
-                        end_date = datetime.datetime.fromisoformat(end_date)
-                    except ValueError:
-                        raise ValueError("Please use iso format")
-                else:
-                    raise TypeError("start_date needs to be a string")
-            if start_date:
-                if end_date < start_date:
-                    raise ValueError("end_date needs to be past start_date")
-        log_dict = {}
-        if not start_date and not end_date:
-            for log in self.handler.read():
-                if log.date.month not in log_dict.keys():
-                    log_dict[log.date.month] = []
-                log_dict[log.date.month].append(log)
-
-        if start_date and not end_date:
-            for log in self.handler.read():
-                if start_date <= log.date:
-                    if log.date.month not in log_dict.keys():
-                        log_dict[log.date.month] = []
-                    log_dict[log.date.month].append(log)
-
-        if not start_date and end_date:
-            for log in self.handler.read():
-                if log.date <= end_date:
-                    if log.date.month not in log_dict.keys():
-                        log_dict[log.date.month] = []
-                    log_dict[log.date.month].append(log)
-
-        if start_date and end_date:
-            for log in self.handler.read():
-                if start_date <= log.date <= end_date:
-                    if log.date.month not in log_dict.keys():
-                        log_dict[log.date.month] = []
-                    log_dict[log.date.month].append(log)
-
-        return log_dict
+        return self.groupby(key="month", aggregate="list", start_date=start_date, end_date=end_date)
@@ -0,0 +1,64 @@
+"""Benchmark of query filters generated by _compile_filter against a generic loop over filters checked
+in the same order, run from the repository root: python benchmarks/bench_filters.py"""
+import datetime
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ProfilLogger.ProfilLogger import LEVELS, _compile_filter, _iso_date
+
+
+def generic_filter(records, levels=None, texts=(), regexes=(), start_date=None, end_date=None):
+    """Checks every record against every filter in a loop, in the same order as generated filters:
+    level, texts, dates, regular expressions, so only code generation is measured"""
+    searches = [re.compile(regex).search for regex in regexes]
+    allowed = frozenset(levels) if levels is not None else None
+    start = start_date.isoformat() if start_date else None
+    end = end_date.isoformat() if end_date else None
+    for date, level, msg in records:
+        if allowed is not None and level not in allowed:
+            continue
+        for text in texts:
+            if text not in msg:
+                break
+        else:
+            date = _iso_date(date)
+            if (start and date < start) or (end and end < date):
+                continue
+            for search in searches:
+                if not search(msg):
+                    break
+            else:
+                yield date, level, msg
+
+
+def main(number_of_records=200000, repeat=5):
+    base = datetime.datetime(2021, 1, 1)
+    levels = list(LEVELS)
+    records = [((base + datetime.timedelta(seconds=number)).strftime("%d %b %Y %H:%M:%S"),
+                levels[number % 5], f"db {'error' if number % 3 else 'ok'} request {number}")
+               for number in range(number_of_records)]
+    queries = {
+        "level": dict(levels=("error", "critical")),
+        "level + text": dict(levels=("error", "critical"), texts=("error",)),
+        "level + text + regex + dates": dict(levels=("error", "critical"), texts=("error",), regexes=(r"\d7$",),
+                                             start_date=base + datetime.timedelta(hours=1),
+                                             end_date=base + datetime.timedelta(hours=40)),
+        "text + regex": dict(texts=("db", "request"), regexes=(r"\d7$",)),
+    }
+    print(f"{'query':<32}{'generic ns/record':>20}{'generated ns/record':>22}{'speedup':>10}")
+    for name, query in queries.items():
+        assert list(generic_filter(records, **query)) == list(_compile_filter(**query)(records))
+        generic = min(timeit.repeat(lambda: sum(1 for _ in generic_filter(records, **query)),
+                                    number=1, repeat=repeat))
+        generated = min(timeit.repeat(lambda: sum(1 for _ in _compile_filter(**query)(records)),
+                                      number=1, repeat=repeat))
+        print(f"{name:<32}{generic / number_of_records * 1e9:>20.1f}{generated / number_of_records * 1e9:>22.1f}"
+              f"{generic / generated:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
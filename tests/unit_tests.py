@@ -7,6 +7,15 @@ import re
 import csv
 import json
 import sqlite3
+import importlib.util
+import asyncio
+import threading
+import multiprocessing
+import queue
+import socket
+import collections
+import time
+import struct
 os.chdir(os.path.dirname(__file__))
 CUR_DIR = os.getcwd()
 src_path = (os.path.join(os.path.dirname(CUR_DIR), 'src'))
@@ -15,6 +24,10 @@ sys.path.append(logger_path)
 
 
 from ProfilLogger.ProfilLogger import ProfilLogger, FileHandler, LogEntry, ProfilLoggerReader, CSVHandler, JsonHandler, SQLLiteHandler
+from ProfilLogger.ProfilLogger import AhoCorasick, PatternSet, TokenIndex, SegmentSummaries, ResultCache, ChunkCache, QUERY_FILTERS, SharedWriter
+from ProfilLogger.ProfilLogger import BufferingHandler, RingBufferHandler, Handler, HANDLERS, register_handler, handler_capabilities
+from ProfilLogger.ProfilLogger import AsyncProfilLogger, LogCollector, QueueHandler, LogServer, SocketHandler
+from ProfilLogger.ProfilLogger import OverloadPolicy, OVERLOAD_POLICIES, RateLimiter
 
 
 class ProfilLoggerTest(unittest.TestCase):
@@ -36,6 +49,34 @@ class ProfilLoggerTest(unittest.TestCase):
         self.assertEqual(logger.log_level, "warning",
                          "set_log_method changed log level after receiving invalid input")
 
+    def test_set_log_level_replaces_disabled_level_methods_with_no_op(self):
+        logger = ProfilLogger(handlers=[FileHandler("lazy.txt")])
+        self.addCleanup(lambda: os.path.exists("lazy.txt") and os.remove("lazy.txt"))
+        self.assertIn("debug", vars(logger), "disabled debug method was not replaced")
+        self.assertNotIn("error", vars(logger))
+        logger.set_log_level("debug")
+        self.assertNotIn("debug", vars(logger), "debug method was not restored after enabling debug level")
+        logger.debug("restored debug message")
+        with open("lazy.txt", "r") as file:
+            self.assertIn("restored debug message", file.read())
+
+    def test_messages_are_formatted_only_when_saved(self):
+        logger = ProfilLogger(handlers=[FileHandler("lazy.txt")])
+        self.addCleanup(lambda: os.path.exists("lazy.txt") and os.remove("lazy.txt"))
+        calls = []
+        logger.info(lambda: calls.append(1) or "lazy info message")
+        logger.info("{} {missing}", 1)
+        self.assertEqual(calls, [], "message of disabled level was created")
+        logger.error(lambda: calls.append(1) or "lazy error message")
+        logger.error("error {} of {total}", 1, total=2)
+        logger.error("message with {braces} and no arguments")
+        with open("lazy.txt", "r") as file:
+            content = file.read()
+        self.assertEqual(calls, [1])
+        self.assertIn("lazy error message", content)
+        self.assertIn("error 1 of 2", content)
+        self.assertIn("message with {braces} and no arguments", content)
+
     def test_logger_raises_TypeError_when_passed_wrong_type_as_Handler(self):
         with self.assertRaises(TypeError):
             ProfilLogger(handlers=[11])
@@ -1923,5 +1964,1931 @@ class ProfilLoggerReaderSQLLiteHandlerTest(unittest.TestCase):
                          "Dict returned by Reader does not match dict created manually")
 
 
+class ProfilLoggerReaderExportTest(unittest.TestCase):
+
+    def setUp(self):
+        global sample_handlers
+        sample_handlers = [FileHandler("FileHandler_sample_data.txt"), CSVHandler("CSVHandler_sample_data.csv"),
+                           JsonHandler("JsonHandler_sample_data.json"),
+                           SQLLiteHandler("SQLLiteHandler_sample_data.sqlite")]
+
+    def test_read_raw_returns_same_data_as_read(self):
+        for handler in sample_handlers:
+            raw_logs = [LogEntry(msg=msg, level=level, date=date) for date, level, msg in handler.read_raw()]
+            self.assertEqual(raw_logs, list(handler.read()),
+                             f"read_raw of {handler} does not match read")
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+    def test_to_arrays_returns_columns_of_all_logs(self):
+        for handler in sample_handlers:
+            arrays = ProfilLoggerReader(handler=handler).to_arrays()
+            logs = list(handler.read())
+            self.assertEqual([str(date) for date in arrays["date"]], [log.date.isoformat() for log in logs],
+                             "Dates returned in arrays do not match logs")
+            self.assertEqual([arrays["level_categories"][code] for code in arrays["level"]],
+                             [log.level for log in logs],
+                             "Levels returned in arrays do not match logs")
+            self.assertEqual(list(arrays["msg"]), [log.msg for log in logs],
+                             "Messages returned in arrays do not match logs")
+
+    @unittest.skipUnless(importlib.util.find_spec("pandas"), "pandas is not installed")
+    def test_to_dataframe_works_with_start_and_end_dates_input(self):
+        start_date = "2021-06-20"
+        end_date = "2021-06-25"
+        my_reader = ProfilLoggerReader(handler=sample_handlers[0])
+        data_frame = my_reader.to_dataframe(start_date=start_date, end_date=end_date)
+        logs_filtered = my_reader.groupby_level(start_date=start_date, end_date=end_date)
+        self.assertEqual(len(data_frame), sum(len(logs) for logs in logs_filtered.values()),
+                         "DataFrame does not contain all filtered logs")
+        self.assertEqual(str(data_frame["level"].dtype), "category",
+                         "level column is not categorical")
+
+    @unittest.skipUnless(importlib.util.find_spec("pandas"), "pandas is not installed")
+    def test_find_by_text_result_can_be_exported_to_dataframe(self):
+        my_reader = ProfilLoggerReader(handler=sample_handlers[1])
+        logs_returned = my_reader.find_by_text("warning")
+        data_frame = logs_returned.to_dataframe()
+        self.assertEqual(list(data_frame["msg"]), [log.msg for log in logs_returned],
+                         "DataFrame does not match logs returned by Reader")
+
+
+class ProfilLoggerReaderGroupbyTest(unittest.TestCase):
+
+    def setUp(self):
+        global my_handler
+        my_handler = FileHandler("groupby.txt")
+        for date in ["15 Jan 2023 10:00:00", "15 Jan 2023 10:00:30", "15 Jan 2024 11:00:00", "20 Feb 2024 12:00:00"]:
+            my_handler.save(LogEntry(msg=f"message from {date}", level="info", date=date))
+        my_handler.save(LogEntry(msg="error message", level="error", date="21 Feb 2024 12:00:00"))
+
+    def tearDown(self):
+        try:
+            os.remove("groupby.txt")
+        except OSError:
+            pass
+
+    def test_groupby_year_month_separates_years(self):
+        my_reader = ProfilLoggerReader(handler=my_handler)
+        logs_returned = my_reader.groupby(key="year_month", aggregate="count")
+        self.assertEqual(logs_returned, {"2023-01": 2, "2024-01": 1, "2024-02": 2},
+                         "Logs are not grouped by year and month")
+
+    def test_groupby_minute_hour_and_day_keys(self):
+        my_reader = ProfilLoggerReader(handler=my_handler)
+        self.assertEqual(my_reader.groupby(key="minute", aggregate="count")["2023-01-15T10:00"], 2)
+        self.assertEqual(my_reader.groupby(key="hour", aggregate="count")["2024-01-15T11"], 1)
+        self.assertEqual(len(my_reader.groupby(key="day", aggregate="count")), 4)
+
+    def test_groupby_first_and_last_return_single_LogEntry(self):
+        my_reader = ProfilLoggerReader(handler=my_handler)
+        logs = list(my_handler.read())
+        self.assertEqual(my_reader.groupby(key="level", aggregate="first"), {"info": logs[0], "error": logs[4]},
+                         "first aggregate does not return first log of a group")
+        self.assertEqual(my_reader.groupby(key="level", aggregate="last"), {"info": logs[3], "error": logs[4]},
+                         "last aggregate does not return last log of a group")
+
+    def test_groupby_sample_returns_at_most_k_logs_from_group(self):
+        my_reader = ProfilLoggerReader(handler=my_handler)
+        logs_returned = my_reader.groupby(key="level", aggregate="sample", k=2)
+        self.assertEqual(len(logs_returned["info"]), 2)
+        self.assertEqual(len(logs_returned["error"]), 1)
+        for log in logs_returned["info"]:
+            self.assertIn(log, list(my_handler.read()))
+
+    def test_groupby_works_with_callable_key_and_dates_input(self):
+        my_reader = ProfilLoggerReader(handler=my_handler)
+        logs_returned = my_reader.groupby(key=lambda log: log.date.year, aggregate="list", start_date="2024-01-01")
+        self.assertEqual(logs_returned, {2024: list(my_handler.read())[2:]},
+                         "Logs are not grouped by callable key")
+
+    def test_groupby_raises_ValueError_when_key_or_aggregate_is_unknown(self):
+        my_reader = ProfilLoggerReader(handler=my_handler)
+        with self.assertRaises(ValueError):
+            my_reader.groupby(key="week")
+        with self.assertRaises(ValueError):
+            my_reader.groupby(aggregate="median")
+
+
+class ProfilLoggerReaderCountTest(unittest.TestCase):
+
+    def setUp(self):
+        global sample_handlers
+        sample_handlers = [FileHandler("FileHandler_sample_data.txt"), CSVHandler("CSVHandler_sample_data.csv"),
+                           JsonHandler("JsonHandler_sample_data.json"),
+                           SQLLiteHandler("SQLLiteHandler_sample_data.sqlite")]
+
+    def test_count_by_text_matches_length_of_find_by_text(self):
+        for handler in sample_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            for text in ["message", "warning", "I like cup of tea in the morning"]:
+                self.assertEqual(my_reader.count_by_text(text, start_date="2019-06-20", end_date="2021-06-25"),
+                                 len(my_reader.find_by_text(text, start_date="2019-06-20", end_date="2021-06-25")),
+                                 f"count_by_text doesn't match find_by_text for {handler}")
+
+    def test_count_by_regex_matches_length_of_find_by_regex(self):
+        for handler in sample_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            regex = r"[a-g] message"
+            self.assertEqual(my_reader.count_by_regex(regex, start_date="2019-06-20"),
+                             len(my_reader.find_by_regex(regex, start_date="2019-06-20")),
+                             f"count_by_regex doesn't match find_by_regex for {handler}")
+
+    def test_count_by_text_filters_by_level(self):
+        for handler in sample_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            logs_filtered = [log for log in handler.read() if "message" in log.msg and log.level == "warning"]
+            self.assertEqual(my_reader.count_by_text("message", level="warning"), len(logs_filtered),
+                             f"count_by_text doesn't filter by level for {handler}")
+
+    def test_count_by_level_matches_groupby_level(self):
+        for handler in sample_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            logs_grouped = my_reader.groupby_level(end_date="2021-06-25")
+            self.assertEqual(my_reader.count_by_level(end_date="2021-06-25"),
+                             {level: len(logs) for level, logs in logs_grouped.items()},
+                             f"count_by_level doesn't match groupby_level for {handler}")
+
+    def test_exists_returns_True_only_when_log_matches(self):
+        for handler in sample_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            self.assertTrue(my_reader.exists(text="critical", level="critical"))
+            self.assertFalse(my_reader.exists(text="critical", level="debug"))
+            self.assertFalse(my_reader.exists(regex=r"\d", start_date="2025-06-25"))
+
+    def test_count_methods_of_missing_sqlite_file_match_query_and_dont_create_it(self):
+        my_reader = ProfilLoggerReader(handler=SQLLiteHandler("missing_count_test.sqlite"))
+        self.assertEqual(my_reader.count_by_text("message"), my_reader.query().count())
+        self.assertEqual(my_reader.count_by_regex(r"\d"), 0)
+        self.assertEqual(my_reader.count_by_level(), my_reader.query().count_by_level())
+        self.assertEqual(my_reader.exists(text="message"), my_reader.query().exists())
+        self.assertFalse(os.path.exists("missing_count_test.sqlite"))
+
+    def test_count_methods_of_missing_text_file_raise_like_query(self):
+        my_reader = ProfilLoggerReader(handler=FileHandler("missing_count_test.txt"))
+        with self.assertRaises(FileNotFoundError):
+            my_reader.query().count()
+        with self.assertRaises(FileNotFoundError):
+            my_reader.count_by_text("message")
+        with self.assertRaises(FileNotFoundError):
+            my_reader.exists(text="message")
+
+
+class ProfilLoggerReaderFindManyTest(unittest.TestCase):
+
+    def setUp(self):
+        global sample_handlers
+        sample_handlers = [FileHandler("FileHandler_sample_data.txt"), CSVHandler("CSVHandler_sample_data.csv"),
+                           JsonHandler("JsonHandler_sample_data.json"),
+                           SQLLiteHandler("SQLLiteHandler_sample_data.sqlite")]
+
+    def test_find_many_returns_same_logs_as_separate_queries(self):
+        for handler in sample_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            logs_returned = my_reader.find_many([
+                {"text": "warning"},
+                {"regex": r"[a-g] message", "start_date": "2019-06-20"},
+                {"text": "message", "start_date": "2019-06-20", "end_date": "2021-06-25"},
+                {"text": "I like cup of tea in the morning"}
+            ])
+            self.assertEqual(logs_returned, [
+                my_reader.find_by_text("warning"),
+                my_reader.find_by_regex(r"[a-g] message", start_date="2019-06-20"),
+                my_reader.find_by_text("message", start_date="2019-06-20", end_date="2021-06-25"),
+                []
+            ], f"find_many doesn't match separate queries for {handler}")
+
+    def test_find_many_reads_file_once(self):
+        handler = sample_handlers[0]
+        my_reader = ProfilLoggerReader(handler=handler)
+        calls = []
+        read_raw = handler.read_raw
+        handler.read_raw = lambda: calls.append(1) or read_raw()
+        my_reader.find_many([{"text": "debug"}, {"text": "info"}, {"level": "warning"}])
+        self.assertEqual(len(calls), 1, "find_many read the file more than once")
+
+    def test_find_many_raises_errors_on_invalid_queries(self):
+        my_reader = ProfilLoggerReader(handler=sample_handlers[0])
+        with self.assertRaises(TypeError):
+            my_reader.find_many({"text": "debug"})
+        with self.assertRaises(ValueError):
+            my_reader.find_many([{"txt": "debug"}])
+        with self.assertRaises(ValueError):
+            my_reader.find_many([{"text": "debug", "start_date": "2021-06-25", "end_date": "2021-06-22"}])
+
+
+class PatternSetTest(unittest.TestCase):
+
+    def test_AhoCorasick_finds_all_overlapping_patterns(self):
+        patterns = ["he", "she", "his", "hers", "a", "abc", "bca"]
+        automaton = AhoCorasick(patterns)
+        for text in ["ushers", "abca", "this", "", "xyz"]:
+            self.assertEqual(automaton.search(text), {index for index, pattern in enumerate(patterns)
+                                                      if pattern in text},
+                             f"AhoCorasick didn't find all patterns in {text}")
+
+    def test_AhoCorasick_raises_ValueError_when_pattern_is_empty(self):
+        with self.assertRaises(ValueError):
+            AhoCorasick(["error", ""])
+
+    def test_PatternSet_reports_texts_and_regexes_found(self):
+        patterns = PatternSet(texts=["timeout", "refused"], regexes=[r"code \d+", r"(a)\1", "missing"])
+        self.assertEqual(patterns.search("connection refused, code 111, aa timeout"),
+                         ["timeout", "refused", r"code \d+", r"(a)\1"],
+                         "PatternSet didn't report found patterns")
+        self.assertEqual(patterns.search("all good"), [])
+
+    def test_PatternSet_reports_regexes_with_overlapping_matches(self):
+        regexes = [r"time", r"timeout \d+", r"out", r"\d+ ms", r"t\w+", r"fail"]
+        patterns = PatternSet(regexes=regexes)
+        for msg in ["timeout 30 ms", "ms 30 timeout", "fail", "nothing", "time"]:
+            self.assertEqual(patterns.search(msg), [regex for regex in regexes if re.search(regex, msg)],
+                             f"PatternSet didn't report all regexes found in {msg}")
+
+
+    def test_PatternSet_checks_anchors_and_lookbehinds_of_overlapping_regexes(self):
+        regexes = [r"^time", r"(?<=time)out", r"out$", r"\bout", r"e?", r"me \d"]
+        patterns = PatternSet(regexes=regexes)
+        for msg in ["timeout", "out of time", "time 5 out", "me 5", ""]:
+            self.assertEqual(patterns.search(msg), [regex for regex in regexes if re.search(regex, msg)],
+                             f"PatternSet didn't report all regexes found in {msg}")
+
+
+class ProfilLoggerReaderFindByPatternsTest(unittest.TestCase):
+
+    def test_find_by_patterns_returns_logs_with_found_patterns(self):
+        my_file_handler = FileHandler("FileHandler_sample_data.txt")
+        my_reader = ProfilLoggerReader(handler=my_file_handler)
+        logs_returned = my_reader.find_by_patterns(texts=["debug", "critical"], regexes=[r"[r-z] message"],
+                                                   start_date="2021-06-22")
+        logs_filtered = []
+        for log in my_file_handler.read():
+            found = [text for text in ["debug", "critical"] if text in log.msg]
+            found += [regex for regex in [r"[r-z] message"] if re.search(regex, log.msg)]
+            if found and datetime.datetime(2021, 6, 22) <= log.date:
+                logs_filtered.append((log, found))
+        self.assertEqual(logs_returned, logs_filtered,
+                         "Logs returned by Reader does not match logs filtered manually")
+
+    def test_find_by_patterns_raises_TypeError_when_patterns_are_not_list(self):
+        my_reader = ProfilLoggerReader(handler=FileHandler("FileHandler_sample_data.txt"))
+        with self.assertRaises(TypeError):
+            my_reader.find_by_patterns(texts="debug")
+
+
+class TokenIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        global index_handlers
+        index_handlers = [FileHandler("indexed.txt"), CSVHandler("indexed.csv"), JsonHandler("indexed.json")]
+        for handler in index_handlers:
+            TokenIndex(handler, segment_size=4)
+            for number in range(10):
+                handler.save(LogEntry(msg=f"db error {number}" if number % 3 == 0 else f"db errors {number}",
+                                      level="error", date=f"2{number} Jun 2021 12:00:00"))
+
+    def tearDown(self):
+        for file_name in ["indexed.txt", "indexed.csv", "indexed.json"]:
+            for suffix in ["", ".idx"]:
+                try:
+                    os.remove(file_name + suffix)
+                except OSError:
+                    pass
+
+    def test_index_is_built_in_segments_when_logs_are_saved(self):
+        for handler in index_handlers:
+            segments = handler.index.segments()
+            self.assertEqual([segment[3] for segment in segments], [4, 4],
+                             f"Index of {handler} doesn't contain two full segments")
+            self.assertEqual(handler.index.indexed_until(), segments[-1][2])
+
+    def test_find_by_token_returns_logs_with_whole_words(self):
+        for handler in index_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            logs_returned = my_reader.find_by_token("db error")
+            logs_filtered = [log for log in handler.read() if re.search(r"\bdb error\b", log.msg)]
+            self.assertEqual(logs_returned, logs_filtered,
+                             f"Logs returned by Reader does not match logs filtered manually for {handler}")
+            self.assertEqual(len(logs_returned), 4)
+
+    def test_find_by_token_returns_same_logs_with_and_without_index(self):
+        for handler in index_handlers:
+            handler.index.update(partial=True)
+            not_indexed = type(handler)(handler.file_name)
+            for text in ["errors", "9", "db error 3", "error 1"]:
+                self.assertEqual(ProfilLoggerReader(handler=handler).find_by_token(text, start_date="2021-06-22"),
+                                 ProfilLoggerReader(handler=not_indexed).find_by_token(text, start_date="2021-06-22"),
+                                 f"Index of {handler} returned different logs for {text}")
+
+    def test_index_counts_every_log_saved_by_log_many(self):
+        for handler in index_handlers:
+            os.remove(handler.file_name)
+            handler.flush()
+            handler.index.clear()
+            ProfilLogger(handlers=[handler]).log_many([("error", f"batch message {number}") for number in range(100)])
+            self.assertEqual([segment[3] for segment in handler.index.segments()], [4] * 25,
+                             f"Index of {handler} wasn't updated by log_many")
+            read_offsets = []
+            read_at = handler.read_at
+            handler.read_at = lambda offsets: read_offsets.append(offsets) or read_at(offsets)
+            logs = ProfilLoggerReader(handler=handler).find_by_token("message 42")
+            self.assertEqual([log.msg for log in logs], ["batch message 42"])
+            self.assertEqual(len(read_offsets[0]), 1)
+
+    def test_find_by_text_reads_records_found_by_index(self):
+        for handler in index_handlers:
+            read_offsets = []
+            read_at = handler.read_at
+            handler.read_at = lambda offsets: read_offsets.append(offsets) or read_at(offsets)
+            not_indexed = type(handler)(handler.file_name)
+            for text in ["db error 3", " error ", "s 1", "rror", "error", "b e", " 9"]:
+                my_reader = ProfilLoggerReader(handler=handler)
+                self.assertEqual(my_reader.find_by_text(text), ProfilLoggerReader(handler=not_indexed).find_by_text(text),
+                                 f"Index of {handler} returned different logs for {text}")
+                self.assertEqual(my_reader.count_by_text(text), len(my_reader.find_by_text(text)))
+            # every text is searched by index in two find_by_text and count_by_text
+            self.assertEqual(len(read_offsets), 21, f"find_by_text didn't use index of {handler}")
+
+    def test_single_word_find_by_text_reads_only_records_with_words_containing_it(self):
+        for handler in index_handlers:
+            handler.index.update(partial=True)
+            read_offsets = []
+            read_at = handler.read_at
+            handler.read_at = lambda offsets: read_offsets.append(offsets) or read_at(offsets)
+            logs = ProfilLoggerReader(handler=handler).find_by_text("errors")
+            self.assertEqual(len(logs), 6)
+            self.assertEqual(len(read_offsets[0]), 6, f"Index of {handler} wasn't used for single word")
+
+    def test_index_is_removed_when_log_file_is_truncated(self):
+        for handler in index_handlers:
+            os.remove(handler.file_name)
+            handler.flush()
+            handler.save(LogEntry(msg="db error", level="error"))
+            self.assertEqual(handler.index.segments(), [],
+                             f"Index of {handler} was not removed")
+            self.assertEqual(len(ProfilLoggerReader(handler=handler).find_by_token("error")), 1)
+
+    def test_index_of_rewritten_log_file_is_ignored(self):
+        for handler in index_handlers:
+            os.remove(handler.file_name)
+            rewritten = type(handler)(handler.file_name)
+            for number in range(12):
+                rewritten.save(LogEntry(msg=f"cache miss number {number}", level="info",
+                                        date=f"0{number % 9 + 1} Jul 2021 12:00:00"))
+            self.assertEqual(handler.index.segments(), [], f"Index of {handler} was not ignored")
+            my_reader = ProfilLoggerReader(handler=handler)
+            self.assertEqual(my_reader.find_by_token("db"), [])
+            self.assertEqual(len(my_reader.find_by_token("miss")), 12)
+            handler.index.update()
+            self.assertEqual([segment[3] for segment in handler.index.segments()], [4, 4, 4])
+
+    def test_readers_ignore_incomplete_segment_without_truncating_index(self):
+        for handler in index_handlers:
+            with open(handler.index.file_name, "ab") as index_file:
+                index_file.write(b"PLIX\x00\x01")
+            size = os.path.getsize(handler.index.file_name)
+            self.assertEqual(len(handler.index.segments()), 2)
+            self.assertEqual(len(ProfilLoggerReader(handler=handler).find_by_token("db error")), 4)
+            self.assertEqual(os.path.getsize(handler.index.file_name), size, f"Reader truncated index of {handler}")
+            handler.index.update(partial=True)
+            self.assertEqual([segment[3] for segment in handler.index.segments()], [4, 4, 2])
+
+
+class SegmentSummariesTest(unittest.TestCase):
+
+    def setUp(self):
+        global summarized_handlers
+        summarized_handlers = [FileHandler("summarized.txt"), CSVHandler("summarized.csv"),
+                               JsonHandler("summarized.json")]
+        for handler in summarized_handlers:
+            SegmentSummaries(handler, segment_size=5)
+            for number in range(22):
+                msg = "db timeout connecting to replica" if number == 7 else f"request {number} served"
+                handler.save(LogEntry(msg=msg, level="error" if number in [3, 18] else "info",
+                                      date=datetime.datetime(2021, 6, 1) + datetime.timedelta(days=number)))
+
+    def tearDown(self):
+        for file_name in ["summarized.txt", "summarized.csv", "summarized.json"]:
+            for suffix in ["", ".seg"]:
+                try:
+                    os.remove(file_name + suffix)
+                except OSError:
+                    pass
+
+    def count_read_records(self, handler):
+        read_records = []
+        read_range = handler.read_range
+        handler.read_range = lambda start=0, end=None: (read_records.append(record) or record
+                                                        for record in read_range(start, end))
+        return read_records
+
+    def test_summaries_contain_dates_and_levels_of_segments(self):
+        for handler in summarized_handlers:
+            segments = handler.summaries.segments()
+            self.assertEqual(len(segments), 4)
+            start, end, records, min_date, max_date, levels, bloom = segments[0]
+            self.assertEqual((records, min_date, max_date), (5, "2021-06-01T00:00:00", "2021-06-05T00:00:00"))
+            self.assertTrue(handler.summaries.might_contain(segments[0], level="error"))
+            self.assertFalse(handler.summaries.might_contain(segments[1], level="error"))
+
+    def test_reader_skips_segments_that_cannot_match(self):
+        for handler in summarized_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            read_records = self.count_read_records(handler)
+            self.assertEqual(my_reader.count_by_text("timeout connecting to"), 1)
+            self.assertLess(len(read_records), 22, f"Reader didn't skip segments of {handler}")
+            read_records.clear()
+            self.assertEqual(len(my_reader.find_by_text("served", start_date="2021-06-12", end_date="2021-06-14")), 3)
+            self.assertLessEqual(len(read_records), 10, f"Reader didn't skip segments of {handler} by date")
+
+    def test_logs_saved_by_log_many_are_summarized(self):
+        for handler in summarized_handlers:
+            os.remove(handler.file_name)
+            handler.flush()
+            handler.summaries.clear()
+            ProfilLogger(handlers=[handler]).log_many(
+                [("error", f"batch request {number}", datetime.datetime(2022, 1, 1) + datetime.timedelta(days=number))
+                 for number in range(40)])
+            self.assertEqual([segment[2] for segment in handler.summaries.segments()], [5] * 8,
+                             f"Summaries of {handler} weren't updated by log_many")
+            read_records = self.count_read_records(handler)
+            logs = ProfilLoggerReader(handler=handler).find_by_regex("request", start_date="2022-01-12",
+                                                                     end_date="2022-01-13")
+            self.assertEqual(len(logs), 2)
+            self.assertLessEqual(len(read_records), 5, f"Reader didn't skip segments of {handler} by date")
+
+    def test_reader_returns_same_logs_with_and_without_summaries(self):
+        for handler in summarized_handlers:
+            not_summarized = type(handler)(handler.file_name)
+            for method, kwargs in [("find_by_text", {"text": "request 2"}),
+                                   ("find_by_token", {"text": "served", "start_date": "2021-06-20"}),
+                                   ("count_by_text", {"text": "quest", "level": "error"}),
+                                   ("groupby_level", {"end_date": "2021-06-10"})]:
+                self.assertEqual(getattr(ProfilLoggerReader(handler=handler), method)(**kwargs),
+                                 getattr(ProfilLoggerReader(handler=not_summarized), method)(**kwargs),
+                                 f"{method} of {handler} returned different logs with summaries")
+
+    def test_summaries_of_rewritten_log_file_are_ignored(self):
+        for handler in summarized_handlers:
+            os.remove(handler.file_name)
+            rewritten = type(handler)(handler.file_name)
+            for number in range(30):
+                rewritten.save(LogEntry(msg=f"db timeout {number}", level="critical",
+                                        date=datetime.datetime(2022, 1, 1) + datetime.timedelta(days=number)))
+            self.assertEqual(handler.summaries.segments(), [], f"Summaries of {handler} were not ignored")
+            my_reader = ProfilLoggerReader(handler=handler)
+            self.assertEqual(my_reader.count_by_text("timeout", level="critical"), 30)
+            handler.summaries.update()
+            self.assertEqual(len(handler.summaries.segments()), 6)
+
+    def test_readers_ignore_incomplete_segment_without_truncating_summaries(self):
+        for handler in summarized_handlers:
+            with open(handler.summaries.file_name, "ab") as summaries_file:
+                summaries_file.write(b"PLSS\x00")
+            size = os.path.getsize(handler.summaries.file_name)
+            self.assertEqual(len(handler.summaries.segments()), 4)
+            self.assertEqual(ProfilLoggerReader(handler=handler).count_by_text("timeout connecting to"), 1)
+            self.assertEqual(os.path.getsize(handler.summaries.file_name), size,
+                             f"Reader truncated summaries of {handler}")
+            handler.summaries.update(partial=True)
+            self.assertEqual(len(handler.summaries.segments()), 5)
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        global cached_handlers
+        cached_handlers = [FileHandler("cached.txt"), CSVHandler("cached.csv"), JsonHandler("cached.json"),
+                           SQLLiteHandler("cached.sqlite")]
+        for handler in cached_handlers:
+            for number in range(10):
+                handler.save(LogEntry(msg=f"message {number}", level="error" if number % 3 == 0 else "info"))
+
+    def tearDown(self):
+        for file_name in ["cached.txt", "cached.csv", "cached.json", "cached.sqlite"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    def test_repeated_query_is_returned_from_cache(self):
+        for handler in cached_handlers:
+            cache = ResultCache()
+            my_reader = ProfilLoggerReader(handler=handler, cache=cache)
+            first = my_reader.groupby_level()
+            second = my_reader.groupby_level()
+            self.assertEqual(first, second)
+            self.assertEqual((cache.misses, cache.hits), (1, 1),
+                             f"Second query on {handler} was not returned from cache")
+
+    def test_cached_results_are_topped_up_with_appended_logs(self):
+        for handler in cached_handlers:
+            cache = ResultCache()
+            my_reader = ProfilLoggerReader(handler=handler, cache=cache)
+            not_cached_reader = ProfilLoggerReader(handler=handler)
+            queries = [lambda reader: reader.find_by_text("message 1"),
+                       lambda reader: reader.count_by_level(),
+                       lambda reader: reader.groupby(key="level", aggregate="last"),
+                       lambda reader: reader.find_many([{"text": "new"}, {"level": "error"}])]
+            for query in queries:
+                query(my_reader)
+            handler.save(LogEntry(msg="new message 11", level="error"))
+            for query in queries:
+                self.assertEqual(query(my_reader), query(not_cached_reader),
+                                 f"Cached result of {handler} doesn't contain appended log")
+            self.assertEqual(cache.top_ups, len(queries))
+
+    def test_cached_results_are_not_modified_by_caller(self):
+        for handler in cached_handlers:
+            my_reader = ProfilLoggerReader(handler=handler, cache=ResultCache())
+            my_reader.find_by_text("message 1")[0].msg = "modified"
+            my_reader.find_many([{"text": "message 2"}])[0][0].level = "modified"
+            self.assertEqual(my_reader.find_by_text("message 1")[0].msg, "message 1",
+                             f"Cached result of {handler} was modified by the caller")
+            self.assertEqual(my_reader.find_many([{"text": "message 2"}])[0][0].level, "info")
+
+    def test_topped_up_find_by_patterns_returns_list_of_tuples(self):
+        for handler in cached_handlers:
+            cache = ResultCache()
+            my_reader = ProfilLoggerReader(handler=handler, cache=cache)
+            my_reader.find_by_patterns(texts=["message 1", "new"])
+            handler.save(LogEntry(msg="new message 11", level="error"))
+            logs = my_reader.find_by_patterns(texts=["message 1", "new"])
+            self.assertEqual(cache.top_ups, 1)
+            self.assertIs(type(logs), list, f"Topped up find_by_patterns of {handler} changed type of the result")
+            self.assertEqual(logs, ProfilLoggerReader(handler=handler).find_by_patterns(texts=["message 1", "new"]))
+            self.assertEqual([found for log, found in logs], [["message 1"], ["message 1", "new"]])
+
+    def test_cached_results_are_computed_again_when_file_is_replaced(self):
+        handler = cached_handlers[0]
+        cache = ResultCache()
+        my_reader = ProfilLoggerReader(handler=handler, cache=cache)
+        self.assertEqual(my_reader.count_by_text("message"), 10)
+        os.remove(handler.file_name)
+        handler.flush()
+        for number in range(12):
+            handler.save(LogEntry(msg=f"message {number}", level="info"))
+        self.assertEqual(my_reader.count_by_text("message"), 12)
+        self.assertEqual(cache.top_ups, 0)
+
+    def test_result_of_file_changed_during_query_is_not_stored(self):
+        for handler in cached_handlers[:3]:
+            class AppendingHandler(type(handler)):
+                append = True
+
+                def read_raw(self, *args, **kwargs):
+                    # log saved by another writer while the query reads the file
+                    if self.append:
+                        self.append = False
+                        self.save(LogEntry(msg="message 10", level="error"))
+                    return super().read_raw(*args, **kwargs)
+
+            cache = ResultCache()
+            my_reader = ProfilLoggerReader(handler=AppendingHandler(handler.file_name), cache=cache)
+            self.assertEqual(my_reader.count_by_text("message", level="error"), 5)
+            self.assertEqual(my_reader.count_by_text("message", level="error"), 5,
+                             f"Log appended during the query of {handler} was counted twice")
+            self.assertEqual((cache.misses, cache.top_ups), (2, 0))
+
+    def test_cache_removes_least_recently_used_results_above_max_bytes(self):
+        cache = ResultCache(max_bytes=1500)
+        my_reader = ProfilLoggerReader(handler=cached_handlers[0], cache=cache)
+        for number in range(10):
+            my_reader.find_by_text(f"message {number}")
+        self.assertLess(len(cache), 10)
+        my_reader.find_by_text("message 9")
+        self.assertEqual(cache.hits, 1, "Most recently used result was removed from cache")
+
+    def test_reader_raises_TypeError_when_cache_is_not_ResultCache(self):
+        with self.assertRaises(TypeError):
+            ProfilLoggerReader(cached_handlers[0], cache={})
+
+
+class ChunkCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        global chunked_handlers
+        chunked_handlers = [FileHandler("chunked.txt"), CSVHandler("chunked.csv"), JsonHandler("chunked.json")]
+        for handler in chunked_handlers:
+            for number in range(100):
+                handler.save(LogEntry(msg=f"message {number}", level="error" if number % 3 == 0 else "info"))
+
+    def tearDown(self):
+        for file_name in ["chunked.txt", "chunked.csv", "chunked.json"]:
+            for suffix in ["", ".chunks"]:
+                try:
+                    os.remove(file_name + suffix)
+                except OSError:
+                    pass
+
+    def test_chunks_are_reused_by_other_queries(self):
+        for handler in chunked_handlers:
+            chunk_cache = ChunkCache(chunk_size=256)
+            my_reader = ProfilLoggerReader(handler=handler, chunk_cache=chunk_cache)
+            not_cached_reader = ProfilLoggerReader(handler=handler)
+            self.assertEqual(my_reader.find_by_text("message 1"), not_cached_reader.find_by_text("message 1"))
+            self.assertGreater(len(chunk_cache), 1, f"Chunks of {handler} were not cached")
+            calls = []
+            read_range = handler.read_range
+            handler.read_range = lambda *args: calls.append(1) or read_range(*args)
+            self.assertEqual(my_reader.count_by_level(), not_cached_reader.count_by_level())
+            self.assertLessEqual(len(calls), 1, f"Cached chunks of {handler} were parsed again")
+
+    def test_records_are_the_same_as_read_range(self):
+        for handler in chunked_handlers:
+            chunk_cache = ChunkCache(chunk_size=256)
+            records = list(handler.read_range())
+            self.assertEqual(list(chunk_cache.records(handler)), records)
+            self.assertEqual(list(chunk_cache.records(handler)), records)
+            end = records[50][0]
+            self.assertEqual(list(chunk_cache.records(handler, 0, end)), records[:50])
+
+    def test_chunks_are_removed_when_file_is_rewritten(self):
+        for handler in chunked_handlers:
+            chunk_cache = ChunkCache(chunk_size=256)
+            my_reader = ProfilLoggerReader(handler=handler, chunk_cache=chunk_cache)
+            my_reader.count_by_level()
+            handler.save(LogEntry(msg="appended message", level="critical"))
+            self.assertEqual(my_reader.count_by_level(), ProfilLoggerReader(handler=handler).count_by_level())
+            os.remove(handler.file_name)
+            handler.flush()
+            handler.save(LogEntry(msg="new message", level="warning"))
+            self.assertEqual(my_reader.count_by_level(), {"warning": 1})
+
+    def test_saved_chunks_are_loaded(self):
+        for handler in chunked_handlers:
+            chunk_cache = ChunkCache(chunk_size=256)
+            list(chunk_cache.records(handler))
+            chunk_cache.save(handler)
+            loaded_cache = ChunkCache(chunk_size=256)
+            self.assertEqual(loaded_cache.load(handler), len(chunk_cache))
+            handler.save(LogEntry(msg="appended message", level="critical"))
+            self.assertEqual(list(loaded_cache.records(handler)), list(handler.read_range()))
+            os.remove(handler.file_name)
+            handler.flush()
+            handler.save(LogEntry(msg="new message", level="warning"))
+            self.assertEqual(ChunkCache().load(handler), 0, f"Chunks of rewritten {handler} were loaded")
+
+    def test_reads_from_records_inside_a_chunk_share_the_chunk(self):
+        for handler in chunked_handlers:
+            chunk_cache = ChunkCache(chunk_size=256)
+            records = list(handler.read_range())
+            self.assertEqual(list(chunk_cache.records(handler, records[30][0])), records[30:])
+            self.assertEqual(list(chunk_cache.records(handler, records[20][0])), records[20:])
+            self.assertEqual(list(chunk_cache.records(handler, records[25][0])), records[25:])
+            self.assertEqual(list(chunk_cache.records(handler)), records)
+            cached_bytes = sum(chunk[0] - chunk[4] for chunk in chunk_cache._chunks.values())
+            self.assertLessEqual(cached_bytes, os.path.getsize(handler.file_name), f"Chunks of {handler} overlap")
+
+    def test_loaded_chunks_file_is_closed_when_chunks_are_decoded_or_loaded_again(self):
+        for handler in chunked_handlers:
+            chunk_cache = ChunkCache(chunk_size=256)
+            list(chunk_cache.records(handler))
+            chunk_cache.save(handler)
+            loaded_cache = ChunkCache(chunk_size=256)
+            loaded_cache.load(handler)
+            mapped = next(iter(loaded_cache._mappings.values()))[0]
+            loaded_cache.load(handler)
+            self.assertTrue(mapped.closed, f"Chunks file of {handler} was not closed when loaded again")
+            mapped = next(iter(loaded_cache._mappings.values()))[0]
+            list(loaded_cache.records(handler))
+            self.assertTrue(mapped.closed, f"Chunks file of {handler} was not closed when chunks were decoded")
+            self.assertEqual(list(loaded_cache.records(handler)), list(handler.read_range()))
+
+    def test_saved_chunks_with_non_ascii_messages_are_loaded(self):
+        for handler in chunked_handlers:
+            for number in range(50):
+                handler.save(LogEntry(msg=f"zażółć gęślą jaźń {number} ✓", level="warning"))
+            chunk_cache = ChunkCache(chunk_size=256)
+            records = list(chunk_cache.records(handler))
+            chunk_cache.save(handler)
+            loaded_cache = ChunkCache(chunk_size=256)
+            self.assertGreater(loaded_cache.load(handler), 0)
+            self.assertEqual(list(loaded_cache.records(handler)), records,
+                             f"Loaded chunks of {handler} don't match the file")
+            my_reader = ProfilLoggerReader(handler=handler, chunk_cache=loaded_cache)
+            self.assertEqual(len(my_reader.find_by_text("gęślą")), 50)
+            repr(my_reader.find_by_text("jaźń 7"))
+
+    def test_raises_errors_on_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ChunkCache(max_bytes=0)
+        with self.assertRaises(ValueError):
+            ChunkCache(chunk_size="1")
+        with self.assertRaises(TypeError):
+            ProfilLoggerReader(handler=chunked_handlers[0], chunk_cache={})
+
+
+class TimeOrderedReadTest(unittest.TestCase):
+
+    def setUp(self):
+        global ordered_handlers
+        ordered_handlers = [FileHandler("ordered.txt"), CSVHandler("ordered.csv"), JsonHandler("ordered.json"),
+                            SQLLiteHandler("ordered.sqlite")]
+        for handler in ordered_handlers:
+            for number in range(200):
+                log_entry = LogEntry(msg=f"message {number}", level="error" if number % 3 == 0 else "info")
+                log_entry.date = datetime.datetime(2021, 1, 1) + datetime.timedelta(minutes=number)
+                handler.save(log_entry)
+            handler.time_ordered = True
+
+    def tearDown(self):
+        for file_name in ["ordered.txt", "ordered.csv", "ordered.json", "ordered.sqlite"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    def test_results_are_the_same_as_for_not_ordered_logs(self):
+        for handler in ordered_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            queries = [lambda reader: reader.find_by_text("message", start_date="2021-01-01T01:00:00",
+                                                          end_date="2021-01-01T02:00:00"),
+                       lambda reader: reader.find_by_regex("1$", start_date="2021-01-01T02:30:00"),
+                       lambda reader: reader.groupby_level(end_date="2021-01-01T00:10:30")]
+            ordered_results = [query(my_reader) for query in queries]
+            handler.time_ordered = False
+            self.assertEqual(ordered_results, [query(my_reader) for query in queries],
+                             f"Results of time ordered {handler} are different")
+
+    def test_only_logs_between_dates_are_read(self):
+        for handler in [ordered_handlers[0], ordered_handlers[2], ordered_handlers[3]]:
+            my_reader = ProfilLoggerReader(handler=handler)
+            records = []
+            read_range = handler.read_range
+            handler.read_range = lambda start=0, end=None: (records.append(record) or record
+                                                            for record in read_range(start, end))
+            result = my_reader.find_by_text("message", start_date="2021-01-01T01:00:00",
+                                            end_date="2021-01-01T01:30:00")
+            self.assertEqual(len(result), 31)
+            self.assertEqual(len(records), 32, f"{handler} read logs outside of dates")
+
+    def test_exists_stops_on_first_matching_log(self):
+        for handler in ordered_handlers[:3]:
+            my_reader = ProfilLoggerReader(handler=handler)
+            records = []
+            read_range = handler.read_range
+            handler.read_range = lambda start=0, end=None: (records.append(record) or record
+                                                            for record in read_range(start, end))
+            self.assertTrue(my_reader.exists(text="message", end_date="2021-01-01T03:00:00"))
+            self.assertEqual(len(records), 1, f"exists read more logs of {handler} than needed")
+
+    def test_seek_date_finds_first_log_past_date(self):
+        for handler in [ordered_handlers[0], ordered_handlers[2], ordered_handlers[3]]:
+            records = list(handler.read_range())
+            self.assertEqual(handler.seek_date(datetime.datetime(2021, 1, 1, 1, 0, 30)), records[61][0])
+            self.assertEqual(handler.seek_date(datetime.datetime(2020, 1, 1)), records[0][0])
+            self.assertGreater(handler.seek_date(datetime.datetime(2022, 1, 1)), records[-1][0])
+
+    def test_logs_out_of_time_order_are_read_from_whole_file(self):
+        for handler in ordered_handlers:
+            log_entry = LogEntry(msg="late message", level="info")
+            log_entry.date = datetime.datetime(2021, 1, 1, 1, 0, 30)
+            handler.save(log_entry)
+            my_reader = ProfilLoggerReader(handler=handler)
+            result = my_reader.find_by_text("late", start_date="2021-01-01T01:00:00")
+            self.assertEqual(len(result), 1, f"Log out of time order in {handler} was not found")
+            self.assertFalse(handler.time_ordered)
+
+    def test_logs_are_not_assumed_to_be_in_time_order(self):
+        for handler in ordered_handlers:
+            not_ordered = type(handler)(handler.file_name)
+            self.assertFalse(not_ordered.time_ordered)
+            ProfilLogger(handlers=[not_ordered]).log_many([("error", "early message", datetime.datetime(2020, 1, 1)),
+                                                           ("error", "late message", datetime.datetime(2022, 1, 1))])
+            my_reader = ProfilLoggerReader(handler=not_ordered)
+            self.assertEqual([log.msg for log in my_reader.find_by_text("message", start_date="2021-12-01")],
+                             ["late message"], f"Log of {handler} out of time order was not found")
+            self.assertEqual([log.msg for log in my_reader.find_by_text("message", end_date="2020-12-01")],
+                             ["early message"])
+
+
+class ProfilLoggerReaderQueryTest(unittest.TestCase):
+
+    def setUp(self):
+        global query_handlers
+        query_handlers = [FileHandler("query.txt"), CSVHandler("query.csv"), JsonHandler("query.json"),
+                          SQLLiteHandler("query.sqlite")]
+        levels = ["debug", "info", "warning", "error", "critical"]
+        for handler in query_handlers:
+            for number in range(50):
+                handler.save(LogEntry(msg=f"db {'error' if number % 3 else 'ok'} {number}", level=levels[number % 5]))
+
+    def tearDown(self):
+        for file_name in ["query.txt", "query.csv", "query.json", "query.sqlite"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    def test_query_combines_all_filters(self):
+        for handler in query_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            all_logs = my_reader.find_by_text("")
+            expected = [log for log in all_logs if log.level in ("error", "critical") and "error" in log.msg
+                        and re.search(r"[34]$", log.msg)]
+            query = my_reader.query().level_at_least("error").text("error").regex(r"[34]$")
+            self.assertEqual(query.find(), expected, f"Query of {handler} returned wrong logs")
+            self.assertEqual(query.count(), len(expected))
+            self.assertTrue(query.exists())
+            self.assertEqual(query.count_by_level(), {"error": 3, "critical": 4})
+            self.assertEqual(query.groupby(key="level", aggregate="first"),
+                             {"error": expected[1], "critical": expected[0]})
+
+    def test_query_filters_by_dates_and_levels(self):
+        for handler in query_handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            self.assertEqual(my_reader.query().level("info").between(end_date="2000-01-01").count(), 0)
+            self.assertEqual(my_reader.query().level("info").between(start_date="2000-01-01").count(), 10)
+            self.assertFalse(my_reader.query().level_at_least("error").level("info").exists())
+
+    def test_queries_can_be_reused(self):
+        my_reader = ProfilLoggerReader(handler=query_handlers[0])
+        errors = my_reader.query().level("error")
+        self.assertEqual(errors.text("ok").count(), 4)
+        self.assertEqual(errors.text("db").count(), 10)
+        self.assertEqual(errors.count(), 10)
+
+    def test_query_results_are_cached(self):
+        for handler in query_handlers:
+            cache = ResultCache()
+            query = ProfilLoggerReader(handler=handler, cache=cache).query().level("debug").text("ok")
+            self.assertEqual(query.count(), 4)
+            self.assertEqual(query.count(), 4)
+            handler.save(LogEntry(msg="db ok 51", level="debug"))
+            self.assertEqual(query.count(), 5)
+            self.assertEqual((cache.misses, cache.hits, cache.top_ups), (1, 1, 1))
+
+    def test_query_raises_errors_on_invalid_arguments(self):
+        query = ProfilLoggerReader(handler=query_handlers[0]).query()
+        with self.assertRaises(TypeError):
+            query.text(1)
+        with self.assertRaises(TypeError):
+            query.level(None)
+        with self.assertRaises(ValueError):
+            query.level_at_least("fatal")
+        with self.assertRaises(re.error):
+            query.regex("(")
+        with self.assertRaises(ValueError):
+            query.between("2021-01-02", "2021-01-01")
+        with self.assertRaises(ValueError):
+            query.groupby(key="week")
+
+
+class QueryFiltersTest(unittest.TestCase):
+
+    def setUp(self):
+        global filtered_handler
+        filtered_handler = FileHandler("filtered.txt")
+        for number in range(30):
+            filtered_handler.save(LogEntry(msg=f"request {number}", level="error" if number % 3 == 0 else "info"))
+
+    def tearDown(self):
+        try:
+            os.remove("filtered.txt")
+        except OSError:
+            pass
+
+    def test_filters_are_compiled_once_per_query_shape(self):
+        my_reader = ProfilLoggerReader(handler=filtered_handler)
+        self.assertEqual(my_reader.query().level("error").text("1").regex("2$").count(), 1)
+        shapes = len(QUERY_FILTERS)
+        self.assertEqual(my_reader.query().level("info").text("2").regex("[0-9]$").count(), 8)
+        self.assertEqual(len(QUERY_FILTERS), shapes, "Filter was compiled again for query of the same shape")
+        my_reader.query().level("info").text("2").text("1").count()
+        self.assertEqual(len(QUERY_FILTERS), shapes + 1)
+
+    def test_generated_filters_match_logs_like_find_methods(self):
+        my_reader = ProfilLoggerReader(handler=filtered_handler)
+        self.assertEqual(my_reader.query().text("1").find(), my_reader.find_by_text("1"))
+        self.assertEqual(my_reader.query().regex("^request [12]").between(start_date="2000-01-01").find(),
+                         my_reader.find_by_regex("^request [12]", start_date="2000-01-01"))
+        self.assertEqual(my_reader.query().level_at_least("warning").find(), my_reader.groupby_level()["error"])
+
+
+class ProfilLoggerFanOutTest(unittest.TestCase):
+
+    def tearDown(self):
+        for file_name in ["fan_out_1.txt", "fan_out_2.txt", "fan_out.json", "fan_out.sqlite"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    def test_all_handlers_save_the_same_log(self):
+        handlers = [FileHandler("fan_out_1.txt"), FileHandler("fan_out_2.txt"), JsonHandler("fan_out.json"),
+                    SQLLiteHandler("fan_out.sqlite")]
+        my_logger = ProfilLogger(handlers=handlers)
+        my_logger.error("fan out message")
+        logs = [list(handler.read()) for handler in handlers]
+        self.assertEqual(len(logs[0]), 1)
+        for handler_logs in logs[1:]:
+            self.assertEqual(handler_logs, logs[0], "Handlers saved logs with different dates")
+
+    def test_log_is_serialized_once_for_handlers_of_the_same_type(self):
+        handlers = [FileHandler("fan_out_1.txt"), FileHandler("fan_out_2.txt")]
+        calls = []
+        serialize = handlers[0].serialize
+        for handler in handlers:
+            handler.serialize = lambda log_entry: calls.append(1) or serialize(log_entry)
+        ProfilLogger(handlers=handlers).critical("shared message")
+        self.assertEqual(len(calls), 1, "Log was serialized for every handler")
+        with open("fan_out_1.txt", "rb") as first_file, open("fan_out_2.txt", "rb") as second_file:
+            self.assertEqual(first_file.read(), second_file.read())
+
+    def test_saving_does_not_modify_log_entry(self):
+        log_entry = LogEntry(msg="it's a 'quoted' message", level="info", date="01 Feb 2021 10:00:00")
+        date = log_entry.date
+        JsonHandler("fan_out.json").save(log_entry)
+        SQLLiteHandler("fan_out.sqlite").save(log_entry)
+        self.assertIs(log_entry.date, date, "JsonHandler changed date of LogEntry")
+        self.assertEqual(list(SQLLiteHandler("fan_out.sqlite").read()), [log_entry])
+
+
+class SharedWriterTest(unittest.TestCase):
+
+    def tearDown(self):
+        for file_name in ["shared.txt", "shared.csv"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    def test_handlers_of_the_same_file_share_writer(self):
+        first_handler, second_handler = FileHandler("shared.txt"), FileHandler("shared.txt")
+        ProfilLogger(handlers=[first_handler]).error("first message")
+        ProfilLogger(handlers=[second_handler]).error("second message")
+        self.assertIs(first_handler._writer, second_handler._writer, "Handlers of the same file use many writers")
+        self.assertEqual(first_handler._writer.references, 2)
+        self.assertEqual([log.msg for log in first_handler.read()], ["first message", "second message"])
+        first_handler.close()
+        second_handler.close()
+        self.assertNotIn(os.path.realpath("shared.txt"), SharedWriter._writers, "Writer was not released")
+
+    def test_writer_opens_file_again_when_it_was_removed(self):
+        handler = CSVHandler("shared.csv")
+        handler.save(LogEntry(msg="old message", level="info"))
+        os.remove("shared.csv")
+        handler.flush()
+        handler.save(LogEntry(msg="new message", level="info"))
+        self.assertEqual([log.msg for log in handler.read()], ["new message"])
+        handler.close()
+
+    def test_buffered_logs_are_written_before_file_is_read(self):
+        handler = FileHandler("shared.txt")
+        ProfilLogger(handlers=[handler]).error("first message")
+        handler._writer.buffer_size = 1024 * 1024
+        handler._writer.flush_interval = 60
+        ProfilLogger(handlers=[handler]).error("second message")
+        with open("shared.txt") as file:
+            self.assertEqual(len(file.read().splitlines()), 1, "Log wasn't buffered")
+        self.assertEqual([log.msg for log in FileHandler("shared.txt").read()], ["first message", "second message"])
+        handler.close()
+
+    def test_buffered_logs_are_written_after_flush_interval_without_next_write(self):
+        handler = FileHandler("shared.txt")
+        ProfilLogger(handlers=[handler]).error("first message")
+        handler._writer.buffer_size = 1024 * 1024
+        handler._writer.flush_interval = 0.05
+        ProfilLogger(handlers=[handler]).error("buffered message")
+        time.sleep(0.5)
+        with open("shared.txt") as file:
+            self.assertEqual(len(file.read().splitlines()), 2, "Buffered log wasn't written after flush_interval")
+        handler.close()
+
+    def test_logs_written_from_many_threads_are_not_interleaved(self):
+        import threading
+        handlers = [FileHandler("shared.txt") for _ in range(4)]
+
+        def save_logs(handler):
+            for number in range(100):
+                handler.save(LogEntry(msg=f"message {number} " + "x" * 500, level="info"))
+
+        threads = [threading.Thread(target=save_logs, args=(handler,)) for handler in handlers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logs = list(handlers[0].read())
+        self.assertEqual(len(logs), 400)
+        self.assertTrue(all(log.msg.endswith("x" * 500) for log in logs), "Logs were interleaved")
+        for handler in handlers:
+            handler.close()
+
+
+class ProfilLoggerLogManyTest(unittest.TestCase):
+
+    def setUp(self):
+        global batch_handlers
+        batch_handlers = [FileHandler("batch.txt"), CSVHandler("batch.csv"), JsonHandler("batch.json"),
+                          SQLLiteHandler("batch.sqlite")]
+
+    def tearDown(self):
+        for handler in batch_handlers:
+            try:
+                os.remove(handler.file_name)
+            except OSError:
+                pass
+
+    def test_log_many_saves_logs_not_below_log_level(self):
+        my_logger = ProfilLogger(handlers=batch_handlers)
+        date = datetime.datetime(2021, 5, 6, 7, 8, 9)
+        my_logger.log_many([("info", "skipped message"), ("error", "first 'message', \"quoted\""),
+                            ("critical", "second message", date), ("debug", "skipped message")])
+        for handler in batch_handlers:
+            logs = list(handler.read())
+            self.assertEqual([(log.level, log.msg) for log in logs],
+                             [("error", "first 'message', \"quoted\""), ("critical", "second message")],
+                             f"{handler} saved wrong logs")
+            self.assertEqual(logs[1].date, date)
+
+    def test_handlers_save_batch_with_single_write(self):
+        for handler in batch_handlers:
+            calls = []
+            write_batch = handler.write_batch
+            handler.write_batch = lambda data, count: calls.append(1) or write_batch(data, count)
+            ProfilLogger(handlers=[handler]).log_many([("error", f"message {number}") for number in range(50)])
+            self.assertEqual(len(calls), 1, f"{handler} didn't save logs with a single write")
+            self.assertEqual(len(list(handler.read())), 50)
+
+    def test_log_many_raises_errors_on_invalid_records(self):
+        my_logger = ProfilLogger(handlers=batch_handlers)
+        with self.assertRaises(TypeError):
+            my_logger.log_many(["error message"])
+        with self.assertRaises(ValueError):
+            my_logger.log_many([("fatal", "message")])
+        self.assertFalse(os.path.exists("batch.txt"), "Logs were saved before invalid record")
+
+
+class BufferingHandlerTest(unittest.TestCase):
+
+    def tearDown(self):
+        for file_name in ["buffered.txt", "buffered.sqlite"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    def test_logs_are_saved_when_buffer_is_full(self):
+        handler = FileHandler("buffered.txt")
+        my_logger = ProfilLogger(handlers=[BufferingHandler(handler, capacity=3)])
+        my_logger.set_log_level("debug")
+        my_logger.debug("first message")
+        my_logger.info("second message")
+        self.assertFalse(os.path.exists("buffered.txt"), "Logs were saved before the buffer was full")
+        my_logger.warning("third message")
+        self.assertEqual([log.msg for log in handler.read()], ["first message", "second message", "third message"])
+
+    def test_logs_are_saved_with_log_of_flush_level(self):
+        handler = SQLLiteHandler("buffered.sqlite")
+        buffering_handler = BufferingHandler(handler, flush_level="error")
+        my_logger = ProfilLogger(handlers=[buffering_handler])
+        my_logger.set_log_level("debug")
+        my_logger.log_many([("debug", "debug context"), ("info", "info context")])
+        self.assertEqual(len(buffering_handler), 2)
+        my_logger.error("failure")
+        self.assertEqual([log.msg for log in handler.read()], ["debug context", "info context", "failure"])
+        self.assertEqual(len(buffering_handler), 0)
+
+    def test_logs_are_saved_after_flush_interval(self):
+        import time
+        handler = FileHandler("buffered.txt")
+        buffering_handler = BufferingHandler(handler, flush_interval=0.05)
+        buffering_handler.save(LogEntry(msg="delayed message", level="info"))
+        self.assertFalse(os.path.exists("buffered.txt"))
+        time.sleep(0.3)
+        self.assertEqual([log.msg for log in handler.read()], ["delayed message"])
+
+    def test_close_saves_buffered_logs(self):
+        handler = FileHandler("buffered.txt")
+        buffering_handler = BufferingHandler(handler)
+        buffering_handler.save(LogEntry(msg="buffered message", level="info"))
+        buffering_handler.close()
+        self.assertEqual([log.msg for log in handler.read()], ["buffered message"])
+
+    def test_raises_errors_on_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            BufferingHandler("buffered.txt")
+        with self.assertRaises(ValueError):
+            BufferingHandler(FileHandler("buffered.txt"), capacity=0)
+        with self.assertRaises(ValueError):
+            BufferingHandler(FileHandler("buffered.txt"), flush_level="fatal")
+        with self.assertRaises(ValueError):
+            BufferingHandler(FileHandler("buffered.txt"), flush_interval=-1)
+
+
+class RingBufferHandlerTest(unittest.TestCase):
+
+    def tearDown(self):
+        for file_name in ["snapshot.csv", "snapshot.txt"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    def test_keeps_last_capacity_logs(self):
+        handler = RingBufferHandler(capacity=5)
+        my_logger = ProfilLogger(handlers=[handler])
+        for number in range(12):
+            my_logger.error(f"message {number}")
+        self.assertEqual(len(handler), 5)
+        self.assertEqual([log.msg for log in handler.read()], [f"message {number}" for number in range(7, 12)])
+
+    def test_keeps_last_logs_up_to_max_bytes(self):
+        handler = RingBufferHandler(capacity=100, max_bytes=100)
+        for number in range(10):
+            # every log takes 27 + 4 + 9 bytes
+            handler.save(LogEntry(msg=f"message {number}", level="info"))
+        self.assertEqual([log.msg for log in handler.read()], ["message 8", "message 9"])
+
+    def test_max_bytes_is_the_size_of_snapshot_in_txt_file(self):
+        handler = RingBufferHandler(capacity=100, max_bytes=200)
+        for number in range(10):
+            handler.save(LogEntry(msg=f"zażółć {number} ✓", level="warning"))
+        file_handler = FileHandler("snapshot.txt")
+        handler.snapshot(file_handler)
+        file_handler.close()
+        self.assertEqual(os.path.getsize("snapshot.txt"), handler._bytes)
+        self.assertLessEqual(handler._bytes, 200)
+
+    def test_reader_reads_logs_from_memory(self):
+        handler = RingBufferHandler(capacity=50)
+        handler.save_batch([LogEntry(msg=f"message {number}", level="error" if number % 2 else "info",
+                                     date=datetime.datetime(2021, 1, 1, 0, number)) for number in range(60)])
+        my_reader = ProfilLoggerReader(handler=handler)
+        self.assertEqual(my_reader.count_by_level(), {"error": 25, "info": 25})
+        self.assertEqual([log.msg for log in my_reader.find_by_text("message 5")],
+                         [f"message {number}" for number in range(50, 60)])
+        self.assertEqual(my_reader.query().level("error").between(start_date="2021-01-01T00:55:00").count(), 3)
+
+    def test_cached_results_are_computed_again_after_logs_were_removed(self):
+        handler = RingBufferHandler(capacity=3)
+        cache = ResultCache()
+        my_reader = ProfilLoggerReader(handler=handler, cache=cache)
+        handler.save(LogEntry(msg="first message", level="info"))
+        self.assertEqual(my_reader.count_by_level(), {"info": 1})
+        handler.save(LogEntry(msg="second message", level="error"))
+        self.assertEqual(my_reader.count_by_level(), {"info": 1, "error": 1})
+        self.assertEqual(cache.top_ups, 1)
+        handler.save_batch([LogEntry(msg="next message", level="error")] * 2)
+        self.assertEqual(my_reader.count_by_level(), {"error": 3})
+
+    def test_snapshot_saves_logs_to_persistent_handler(self):
+        handler = RingBufferHandler()
+        handler.save_batch([LogEntry(msg=f"message {number}", level="info") for number in range(3)])
+        self.assertEqual(handler.snapshot(CSVHandler("snapshot.csv")), 3)
+        self.assertEqual([log.msg for log in CSVHandler("snapshot.csv").read()], [log.msg for log in handler.read()])
+        with self.assertRaises(TypeError):
+            handler.snapshot("snapshot.csv")
+
+
+
+
+class HandlerProtocolTest(unittest.TestCase):
+
+    class ListHandler(Handler):
+
+        def __init__(self):
+            self.logs = []
+
+        def save(self, log_entry):
+            self.logs.append((log_entry.formatted_date(), log_entry.level, log_entry.msg))
+
+        def read_raw(self):
+            yield from self.logs
+
+    def setUp(self):
+        register_handler(self.ListHandler)
+
+    def test_built_in_handlers_are_registered(self):
+        for handler_class in [FileHandler, CSVHandler, JsonHandler, SQLLiteHandler, BufferingHandler,
+                              RingBufferHandler]:
+            self.assertIn(handler_class, HANDLERS)
+
+    def test_register_handler_requires_Handler_subclass(self):
+        with self.assertRaises(TypeError):
+            register_handler(object)
+        with self.assertRaises(TypeError):
+            register_handler(FileHandler("file.txt"))
+
+    def test_unregistered_handler_is_not_accepted(self):
+        class OtherHandler(Handler):
+            def save(self, log_entry):
+                pass
+
+        with self.assertRaises(TypeError):
+            ProfilLogger(handlers=[OtherHandler()])
+
+    def test_handler_without_read_cannot_be_read(self):
+        @register_handler
+        class WriteOnlyHandler(Handler):
+            def save(self, log_entry):
+                pass
+
+        ProfilLogger(handlers=[WriteOnlyHandler()])
+        with self.assertRaises(TypeError):
+            ProfilLoggerReader(handler=WriteOnlyHandler())
+        HANDLERS.remove(WriteOnlyHandler)
+
+    def test_capabilities_are_discovered(self):
+        self.assertEqual(handler_capabilities(self.ListHandler()), {"read"})
+        self.assertEqual(handler_capabilities(FileHandler("file.txt")),
+                         {"read", "save_batch", "read_range", "seek_date", "version", "serialize"})
+        self.assertEqual(handler_capabilities(SQLLiteHandler("file.sqlite")),
+                         {"read", "save_batch", "read_range", "seek_date", "version", "count", "serialize",
+                          "supports_pushdown"})
+
+    def test_overridden_save_of_file_handler_subclass_is_called(self):
+        class UpperCaseHandler(FileHandler):
+            def save(self, log_entry):
+                super().save(LogEntry(msg=log_entry.msg.upper(), level=log_entry.level, date=log_entry.date))
+
+            def save_batch(self, log_entries):
+                for log_entry in log_entries:
+                    self.save(log_entry)
+
+        handler = UpperCaseHandler("upper.txt")
+        self.assertNotIn("serialize", handler_capabilities(handler))
+        my_logger = ProfilLogger(handlers=[handler, FileHandler("lower.txt")])
+        my_logger.error("first message")
+        my_logger.log_many([("error", "second message")])
+        try:
+            self.assertEqual([log.msg for log in handler.read()], ["FIRST MESSAGE", "SECOND MESSAGE"])
+            self.assertEqual([log.msg for log in FileHandler("lower.txt").read()], ["first message", "second message"])
+        finally:
+            handler.close()
+            for file_name in ["upper.txt", "lower.txt"]:
+                os.remove(file_name)
+
+    def test_custom_handler_works_with_logger_and_reader(self):
+        handler = self.ListHandler()
+        my_logger = ProfilLogger(handlers=[handler])
+        my_logger.set_log_level("info")
+        my_logger.log_many([("info", "first message"), ("error", "second message"), ("debug", "third message")])
+        my_logger.error("last message")
+        my_reader = ProfilLoggerReader(handler=handler, cache=ResultCache())
+        self.assertEqual([log.msg for log in my_reader.find_by_text("message")],
+                         ["first message", "second message", "last message"])
+        self.assertEqual(my_reader.count_by_level(), {"info": 1, "error": 2})
+        self.assertEqual(my_reader.groupby_level()["error"][0].msg, "second message")
+        self.assertEqual(my_reader.query().level("error").count(), 2)
+
+
+
+
+class AsyncProfilLoggerTest(unittest.IsolatedAsyncioTestCase):
+
+    def tearDown(self):
+        for file_name in ["async.txt", "async.sqlite"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    async def test_logs_are_saved_by_writer_task(self):
+        handlers = [FileHandler("async.txt"), SQLLiteHandler("async.sqlite")]
+        my_logger = AsyncProfilLogger(handlers=handlers, max_batch=2)
+        my_logger.set_log_level("info")
+        await my_logger.adebug("debug message")
+        await my_logger.ainfo("message {}", 1)
+        await my_logger.awarning(lambda: "message 2")
+        await my_logger.alog_many([("error", "message 3"), ("debug", "message 4"), ("critical", "message 5")])
+        await my_logger.aflush()
+        self.assertEqual(len(my_logger), 0)
+        for handler in handlers:
+            self.assertEqual([log.msg for log in handler.read()], ["message 1", "message 2", "message 3", "message 5"])
+        await my_logger.aclose()
+
+    async def test_coroutines_do_not_save_logs(self):
+        saving_threads = []
+
+        class ThreadRecordingHandler(RingBufferHandler):
+            def save_batch(self, log_entries):
+                saving_threads.append(threading.current_thread())
+                super().save_batch(log_entries)
+
+        handler = ThreadRecordingHandler()
+        my_logger = AsyncProfilLogger(handlers=[handler])
+        for number in range(10):
+            await my_logger.aerror(f"message {number}")
+        self.assertEqual(len(handler), 0, "Logs were saved by the coroutine")
+        self.assertEqual(len(my_logger), 10)
+        await my_logger.aclose()
+        self.assertEqual(len(handler), 10)
+        self.assertNotIn(threading.current_thread(), saving_threads)
+
+    async def test_aclose_saves_queued_logs_and_flushes_buffering_handlers(self):
+        handler = FileHandler("async.txt")
+        async with AsyncProfilLogger(handlers=[BufferingHandler(handler)]) as my_logger:
+            await my_logger.aerror("first message")
+            await my_logger.acritical("second message")
+            await my_logger.aerror("third message")
+        self.assertEqual([log.msg for log in handler.read()], ["first message", "second message", "third message"])
+        with self.assertRaises(ValueError):
+            await my_logger.aerror("message after close")
+
+    async def test_handler_exception_is_raised_by_aflush(self):
+        class FailingHandler(RingBufferHandler):
+            def save_batch(self, log_entries):
+                raise OSError("disk is full")
+
+        my_logger = AsyncProfilLogger(handlers=[FailingHandler()])
+        await my_logger.aerror("message")
+        with self.assertRaises(OSError):
+            await my_logger.aflush()
+        await my_logger.aerror("message")
+        with self.assertRaises(OSError):
+            await my_logger.aclose()
+
+    def test_wrong_arguments_raise_errors(self):
+        with self.assertRaises(TypeError):
+            AsyncProfilLogger(handlers=["async.txt"])
+        with self.assertRaises(ValueError):
+            AsyncProfilLogger(handlers=[RingBufferHandler()], max_batch=0)
+        with self.assertRaises(TypeError):
+            AsyncProfilLogger(handlers=[RingBufferHandler()], executor="executor")
+        with self.assertRaises(ValueError):
+            AsyncProfilLogger(handlers=[RingBufferHandler()], max_queue=0)
+        with self.assertRaises(ValueError):
+            AsyncProfilLogger(handlers=[RingBufferHandler()], overload="drop_all")
+
+    @staticmethod
+    def _blocked_handler(release):
+        class BlockedHandler(RingBufferHandler):
+            def save_batch(self, log_entries):
+                release.wait(5)
+                super().save_batch(log_entries)
+
+        return BlockedHandler()
+
+    async def test_coroutines_are_rate_limited(self):
+        handler = RingBufferHandler()
+        my_logger = AsyncProfilLogger(handlers=[handler], rate_limiter=RateLimiter(rate=20, burst=1))
+        for number in range(10):
+            await my_logger.aerror("timeout {}", number)
+        await my_logger.alog_many([("error", "timeout {}")] * 10)
+        await asyncio.sleep(0.06)
+        await my_logger.aerror("timeout {}", 10)
+        await my_logger.aclose()
+        self.assertEqual([log.msg for log in handler.read()],
+                         ["timeout 0", "suppressed 19 similar messages", "timeout 10"])
+
+    async def test_block_policy_waits_for_space_in_queue(self):
+        release = threading.Event()
+        handler = self._blocked_handler(release)
+        my_logger = AsyncProfilLogger(handlers=[handler], max_batch=2, max_queue=2)
+        await my_logger.aerror("message 0")
+        await asyncio.sleep(0.01)
+        await my_logger.aerror("message 1")
+        await my_logger.aerror("message 2")
+        waiting = asyncio.create_task(my_logger.aerror("message 3"))
+        await asyncio.sleep(0.05)
+        self.assertFalse(waiting.done())
+        release.set()
+        await asyncio.wait_for(waiting, 5)
+        await my_logger.aclose()
+        self.assertEqual([log.msg for log in handler.read()], [f"message {number}" for number in range(4)])
+        self.assertEqual(my_logger.overload.dropped, 0)
+
+    async def test_dropped_logs_are_summarized(self):
+        release = threading.Event()
+        handler = self._blocked_handler(release)
+        my_logger = AsyncProfilLogger(handlers=[handler], max_queue=2, overload="block", block_timeout=0.01)
+        await my_logger.aerror("message 0")
+        await asyncio.sleep(0.01)
+        await my_logger.alog_many([("error", f"message {number}") for number in range(1, 4)])
+        await my_logger.acritical("message 4")
+        self.assertEqual(len(my_logger), 2)
+        release.set()
+        await my_logger.aclose()
+        self.assertEqual([log.msg for log in handler.read()],
+                         ["message 0", "message 1", "message 2",
+                          "dropped 2 logs because of overload (error: 1, critical: 1)"])
+        self.assertEqual(my_logger.overload.dropped_levels, {"error": 1, "critical": 1})
+
+
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    @staticmethod
+    def _logger(rate_limiter):
+        my_logger = ProfilLogger(handlers=[RingBufferHandler(capacity=10000)], rate_limiter=rate_limiter)
+        my_logger.set_log_level("info")
+        return my_logger
+
+    @staticmethod
+    def _messages(my_logger):
+        return [log.msg for log in my_logger.handlers[0].read()]
+
+    def test_repeated_template_is_limited_and_summarized_when_it_resumes(self):
+        my_logger = self._logger(RateLimiter(rate=20, burst=2))
+        for number in range(100):
+            my_logger.warning("disk {} is slow", number)
+        my_logger.error("database is down")
+        self.assertEqual(self._messages(my_logger), ["disk 0 is slow", "disk 1 is slow", "database is down"])
+        self.assertEqual(my_logger.rate_limiter.suppressed, 98)
+        time.sleep(0.06)
+        my_logger.warning("disk {} is slow", 100)
+        self.assertEqual(self._messages(my_logger)[3:], ["suppressed 98 similar messages", "disk 100 is slow"])
+        self.assertEqual([log.level for log in my_logger.handlers[0].read()][3:], ["warning", "warning"])
+
+    def test_level_rates_limit_all_templates_of_a_level(self):
+        my_logger = self._logger(RateLimiter(level_rates={"info": 20}))
+        for number in range(30):
+            my_logger.info(f"request {number}")
+            my_logger.error(f"failure {number}")
+        self.assertEqual(len(self._messages(my_logger)), 50)
+        time.sleep(0.06)
+        my_logger.info("request 30")
+        self.assertEqual(self._messages(my_logger)[-2:], ["suppressed 10 info messages", "request 30"])
+
+    def test_callable_templates_are_identified_by_code(self):
+        my_logger = self._logger(RateLimiter(rate=0.01, burst=1))
+        for number in range(10):
+            my_logger.warning(lambda: f"cache miss {number}")
+            my_logger.warning(lambda: f"cache hit {number}")
+        self.assertEqual(self._messages(my_logger), ["cache miss 0", "cache hit 0"])
+
+    def test_unhashable_messages_are_limited_by_type(self):
+        my_logger = self._logger(RateLimiter(rate=0.01, burst=2))
+        for number in range(5):
+            my_logger.error({"user": number})
+            my_logger.error(["user", number])
+        self.assertEqual(self._messages(my_logger), [{"user": 0}, ["user", 0], {"user": 1}, ["user", 1]])
+        self.assertEqual(my_logger.rate_limiter.suppressed, 6)
+
+    def test_sampling_keeps_part_of_logs_over_the_limit(self):
+        random.seed(5)
+        my_logger = self._logger(RateLimiter(sample=0.25))
+        for number in range(2000):
+            my_logger.warning("retrying request {}", number)
+        messages = self._messages(my_logger)
+        kept = [message for message in messages if message.startswith("retrying")]
+        self.assertEqual(kept[0], "retrying request 0")
+        self.assertTrue(400 < len(kept) < 600, len(kept))
+        self.assertEqual(len(kept) + my_logger.rate_limiter.suppressed, 2000)
+        reported = sum(int(message.split()[1]) for message in messages if message.startswith("suppressed"))
+        not_resumed = 1999 - int(kept[-1].split()[-1])
+        self.assertEqual(reported + not_resumed, my_logger.rate_limiter.suppressed)
+
+    def test_log_many_is_limited(self):
+        my_logger = self._logger(RateLimiter(rate={"info": 0.01}, burst=2))
+        my_logger.log_many([("info", "same message")] * 5 + [("error", "same message")] * 5)
+        self.assertEqual(self._messages(my_logger), ["same message"] * 7)
+
+    def test_suppressed_templates_are_remembered(self):
+        my_logger = self._logger(RateLimiter(rate=20, burst=1, max_templates=4))
+        my_logger.warning("first message")
+        my_logger.warning("first message")
+        for number in range(10):
+            my_logger.warning(f"other message {number}")
+        self.assertLessEqual(len(my_logger.rate_limiter._templates), 4)
+        time.sleep(0.06)
+        my_logger.warning("first message")
+        self.assertEqual(self._messages(my_logger)[-2:], ["suppressed 1 similar messages", "first message"])
+
+    def test_wrong_arguments_raise_errors(self):
+        with self.assertRaises(ValueError):
+            RateLimiter()
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=-1)
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(rate={"info": 0})
+        with self.assertRaises(ValueError):
+            RateLimiter(level_rates={"debug": 0})
+        with self.assertRaises(ValueError):
+            RateLimiter(rate={"info": "10"})
+        with self.assertRaises(TypeError):
+            RateLimiter(level_rates=[10])
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=10, burst=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(sample=2)
+        with self.assertRaises(TypeError):
+            ProfilLogger(handlers=[RingBufferHandler()], rate_limiter=10)
+
+
+class OverloadPolicyTest(unittest.TestCase):
+
+    @staticmethod
+    def _admit(policy, queued, log_entries, capacity=4):
+        overload = OverloadPolicy(capacity, policy)
+        logs = collections.deque(LogEntry(msg=msg, level=level) for level, msg in queued)
+        admitted = overload.admit(logs, [LogEntry(msg=msg, level=level) for level, msg in log_entries])
+        return [log.msg for log in logs], [log.msg for log in admitted], overload
+
+    def test_logs_fitting_in_queue_are_admitted(self):
+        for policy in OVERLOAD_POLICIES:
+            self.assertEqual(self._admit(policy, [("info", "a")], [("info", "b")])[:2], (["a"], ["b"]))
+        self.assertEqual(self._admit("drop_newest", [("info", "a")], [("info", "b")] * 9, None)[1], ["b"] * 9)
+
+    def test_drop_newest_drops_logs_which_do_not_fit(self):
+        queued, admitted, overload = self._admit("drop_newest", [("info", "a"), ("info", "b"), ("info", "c")],
+                                                 [("info", "d"), ("error", "e")])
+        self.assertEqual((queued, admitted), (["a", "b", "c"], ["d"]))
+        self.assertEqual(overload.dropped_levels, {"error": 1})
+
+    def test_drop_oldest_removes_logs_from_queue(self):
+        queued, admitted, overload = self._admit("drop_oldest", [("info", "a"), ("info", "b"), ("info", "c")],
+                                                 [("info", "d"), ("info", "e")])
+        self.assertEqual((queued, admitted), (["b", "c"], ["d", "e"]))
+        queued, admitted, overload = self._admit("drop_oldest", [("info", "a")], [("info", str(n)) for n in range(6)])
+        self.assertEqual((queued, admitted), ([], ["2", "3", "4", "5"]))
+        self.assertEqual(overload.dropped, 3)
+
+    def test_shed_levels_drops_the_lowest_levels_first(self):
+        queued, admitted, overload = self._admit("shed_levels", [("debug", "a"), ("error", "b"), ("info", "c")],
+                                                 [("critical", "d"), ("debug", "e")])
+        self.assertEqual((queued, admitted), (["b", "c", "d", "e"], []))
+        queued, admitted, overload = self._admit("shed_levels", [("info", str(n)) for n in range(32)]
+                                                 + [("error", "e")], [("debug", "d")], 33)
+        self.assertEqual(queued, [str(n) for n in range(1, 32)] + ["e"])
+        self.assertEqual(overload.dropped_levels, {"debug": 1, "info": 1})
+
+    def test_summary_counts_logs_dropped_since_last_report(self):
+        overload = OverloadPolicy(10)
+        self.assertIsNone(overload.summary())
+        overload.drop([LogEntry(msg="a", level="info"), LogEntry(msg="b", level="info"),
+                       LogEntry(msg="c", level="debug")])
+        summary = overload.summary()
+        self.assertEqual((summary.level, summary.msg),
+                         ("warning", "dropped 3 logs because of overload (info: 2, debug: 1)"))
+        overload.reported()
+        self.assertIsNone(overload.summary())
+        overload.drop([LogEntry(msg="d", level="error")])
+        self.assertEqual(overload.summary().msg, "dropped 1 logs because of overload (error: 1)")
+        self.assertEqual(overload.dropped, 4)
+
+    def test_wrong_arguments_raise_errors(self):
+        with self.assertRaises(ValueError):
+            OverloadPolicy(0)
+        with self.assertRaises(ValueError):
+            OverloadPolicy(10, "drop_all")
+        with self.assertRaises(ValueError):
+            OverloadPolicy(10, block_timeout=-1)
+
+
+class ProfilLoggerReaderAsyncTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.handlers = [FileHandler("async_read.txt"), SQLLiteHandler("async_read.sqlite")]
+        my_logger = ProfilLogger(handlers=self.handlers)
+        my_logger.set_log_level("info")
+        my_logger.log_many([("error" if number % 2 else "info", f"message {number}",
+                             datetime.datetime(2021, 1, 1) + datetime.timedelta(minutes=number))
+                            for number in range(250)])
+
+    def tearDown(self):
+        for file_name in ["async_read.txt", "async_read.sqlite"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    async def test_async_queries_return_same_logs_as_sync_queries(self):
+        for handler in self.handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            chunks = [chunk async for chunk in my_reader.afind_by_text("message 1", chunk_size=40)]
+            self.assertEqual([len(chunk) for chunk in chunks], [40, 40, 31])
+            self.assertEqual([log.msg for chunk in chunks for log in chunk],
+                             [log.msg for log in my_reader.find_by_text("message 1")])
+            logs = [log async for chunk in my_reader.afind_by_regex(r"7$", end_date="2021-01-01T02:00:00")
+                    for log in chunk]
+            self.assertEqual([log.msg for log in logs],
+                             [log.msg for log in my_reader.find_by_regex(r"7$", end_date="2021-01-01T02:00:00")])
+            logs = [log async for chunk in my_reader.afind(text="message 2", level="error") for log in chunk]
+            self.assertEqual(len(logs), my_reader.count_by_text("message 2", level="error"))
+            logs = [log async for chunk in my_reader.query().level("info").regex("^message 1").afind() for log in chunk]
+            self.assertEqual(len(logs), my_reader.query().level("info").regex("^message 1").count())
+
+    async def test_cancelled_query_releases_semaphore(self):
+        my_reader = ProfilLoggerReader(handler=self.handlers[0])
+        my_reader.max_concurrent_reads = 1
+        first_chunk = asyncio.Event()
+
+        async def read_slowly():
+            async for chunk in my_reader.afind_by_text("message", chunk_size=10):
+                first_chunk.set()
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(read_slowly())
+        await first_chunk.wait()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        chunks = await asyncio.wait_for(self._read_all(my_reader.afind_by_text("message 24")), 5)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 11)
+
+    async def test_concurrent_queries_are_limited(self):
+        my_reader = ProfilLoggerReader(handler=self.handlers[1])
+        my_reader.max_concurrent_reads = 2
+        results = await asyncio.gather(*[self._read_all(my_reader.afind_by_text("message 1")) for _ in range(5)])
+        self.assertEqual([sum(len(chunk) for chunk in chunks) for chunks in results], [111] * 5)
+
+    async def test_interleaved_queries_above_limit_do_not_deadlock(self):
+        my_reader = ProfilLoggerReader(handler=self.handlers[0])
+        iterators = [my_reader.afind_by_text("message", chunk_size=50).__aiter__() for _ in range(6)]
+        for _ in range(5):
+            for iterator in iterators:
+                chunk = await asyncio.wait_for(iterator.__anext__(), 5)
+                self.assertEqual(len(chunk), 50)
+        for iterator in iterators:
+            await iterator.aclose()
+
+    async def test_abandoned_queries_do_not_block_other_queries(self):
+        my_reader = ProfilLoggerReader(handler=self.handlers[1])
+        my_reader.max_concurrent_reads = 2
+        abandoned = []
+        for _ in range(4):
+            chunks = my_reader.afind_by_text("message", chunk_size=10)
+            async for chunk in chunks:
+                break
+            abandoned.append(chunks)
+        chunks = await asyncio.wait_for(self._read_all(my_reader.afind_by_text("message 24")), 5)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 11)
+
+    def test_wrong_arguments_raise_errors(self):
+        my_reader = ProfilLoggerReader(handler=self.handlers[0])
+        with self.assertRaises(TypeError):
+            my_reader.afind_by_text(1)
+        with self.assertRaises(ValueError):
+            my_reader.afind_by_text("message", chunk_size=0)
+        with self.assertRaises(TypeError):
+            my_reader.afind_by_regex(None)
+        with self.assertRaises(TypeError):
+            my_reader.afind(level=1)
+
+    @staticmethod
+    async def _read_all(chunks):
+        return [chunk async for chunk in chunks]
+
+
+
+
+def log_from_worker(handler, number):
+    my_logger = ProfilLogger(handlers=[handler])
+    for message_number in range(50):
+        my_logger.error(f"worker {number} message {message_number}")
+    my_logger.log_many([("critical", f"worker {number} batch message {message_number}")
+                        for message_number in range(50)])
+
+
+def flush_in_child(handler):
+    handler.flush()
+
+
+class LogCollectorTest(unittest.TestCase):
+
+    def tearDown(self):
+        for file_name in ["collected.txt", "collected.sqlite", "forked.txt"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    def _collect_from_workers(self, start_method):
+        handlers = [FileHandler("collected.txt"), SQLLiteHandler("collected.sqlite")]
+        context = multiprocessing.get_context(start_method)
+        with LogCollector(handlers, max_batch=64, start_method=start_method) as collector:
+            workers = [context.Process(target=log_from_worker, args=(collector.handler(), number))
+                       for number in range(3)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        self.assertFalse(collector.process.is_alive())
+        for handler in handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            self.assertEqual(my_reader.count_by_level(), {"error": 150, "critical": 150})
+            messages = [log.msg for log in my_reader.find_by_text("worker 1 ")]
+            self.assertEqual(messages, [f"worker 1 message {number}" for number in range(50)]
+                             + [f"worker 1 batch message {number}" for number in range(50)])
+            os.remove(handler.file_name)
+
+    def test_logs_of_spawned_workers_are_saved_by_collector(self):
+        self._collect_from_workers("spawn")
+
+    @unittest.skipUnless(hasattr(os, "fork"), "fork is not available")
+    def test_logs_of_forked_workers_are_saved_by_collector(self):
+        self._collect_from_workers("fork")
+
+    def test_queue_handler_sends_compact_records(self):
+        records = queue.Queue()
+        handler = QueueHandler(records)
+        date = datetime.datetime(2021, 1, 1)
+        handler.save(LogEntry(msg="first message", level="error", date=date))
+        handler.save_batch([LogEntry(msg="second message", level="info", date=date),
+                            LogEntry(msg="third message", level="debug", date=date)])
+        self.assertEqual(records.get_nowait(), ((date, "error", "first message"),))
+        self.assertEqual(records.get_nowait(), ((date, "info", "second message"), (date, "debug", "third message")))
+        with self.assertRaises(TypeError):
+            ProfilLoggerReader(handler=handler)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "fork is not available")
+    def test_forked_child_does_not_save_logs_buffered_by_parent(self):
+        handler = BufferingHandler(FileHandler("forked.txt"))
+        handler.save(LogEntry(msg="parent message", level="info"))
+        child = multiprocessing.get_context("fork").Process(target=flush_in_child, args=(handler,))
+        child.start()
+        child.join()
+        handler.close()
+        self.assertEqual([log.msg for log in FileHandler("forked.txt").read()], ["parent message"])
+
+    def test_wrong_arguments_raise_errors(self):
+        with self.assertRaises(TypeError):
+            LogCollector([])
+        with self.assertRaises(TypeError):
+            LogCollector([QueueHandler(queue.Queue())])
+        with self.assertRaises(ValueError):
+            LogCollector([FileHandler("collected.txt")], max_batch=0)
+        with self.assertRaises(TypeError):
+            QueueHandler("collected.txt")
+        with self.assertRaises(ValueError):
+            QueueHandler(queue.Queue(), overload="drop_oldest")
+        with self.assertRaises(ValueError):
+            LogCollector([FileHandler("collected.txt")], max_queue=0)
+
+    def test_queue_handler_drops_logs_when_queue_is_full(self):
+        records = queue.Queue(maxsize=1)
+        date = datetime.datetime(2021, 1, 1)
+        for overload, block_timeout in [("drop_newest", None), ("block", 0.01)]:
+            handler = QueueHandler(records, overload=overload, block_timeout=block_timeout)
+            handler.save(LogEntry(msg="first message", level="error", date=date))
+            handler.save_batch([LogEntry(msg="second message", level="info", date=date),
+                                LogEntry(msg="third message", level="info", date=date)])
+            self.assertEqual(records.get_nowait(), ((date, "error", "first message"),))
+            self.assertEqual(handler.overload.dropped, 2)
+            handler.save(LogEntry(msg="fourth message", level="error", date=date))
+            (record, summary), = [records.get_nowait()]
+            self.assertEqual(record, (date, "error", "fourth message"))
+            self.assertEqual(summary[1:], ("warning", "dropped 2 logs because of overload (info: 2)"))
+
+
+
+
+class LogServerTest(unittest.IsolatedAsyncioTestCase):
+
+    def tearDown(self):
+        for file_name in ["served.txt", "served.sqlite", "served.sock"]:
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _log_with_client(handler, number):
+        my_logger = ProfilLogger(handlers=[handler])
+        for message_number in range(120):
+            my_logger.error(f"client {number} message {message_number}")
+        my_logger.log_many([("critical", f"client {number} batch message")])
+        handler.close()
+
+    async def _wait_for_logs(self, server, count):
+        for _ in range(500):
+            if server.received >= count:
+                return
+            await asyncio.sleep(0.01)
+        self.fail(f"Server received {server.received} of {count} logs")
+
+    async def _serve_clients(self, server, client):
+        handlers = server.handlers
+        async with server:
+            await asyncio.gather(*[asyncio.to_thread(self._log_with_client, client(server), number)
+                                   for number in range(3)])
+            await self._wait_for_logs(server, 363)
+        for handler in handlers:
+            my_reader = ProfilLoggerReader(handler=handler)
+            self.assertEqual(my_reader.count_by_level(), {"error": 360, "critical": 3})
+            self.assertEqual([log.msg for log in my_reader.find_by_text("client 2 ")],
+                             [f"client 2 message {number}" for number in range(120)] + ["client 2 batch message"])
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix domain sockets are not available")
+    async def test_logs_sent_through_unix_socket_are_saved(self):
+        server = LogServer([FileHandler("served.txt"), SQLLiteHandler("served.sqlite")], path="served.sock")
+        await self._serve_clients(server, lambda server: SocketHandler(path="served.sock", batch_size=50))
+        self.assertFalse(os.path.exists("served.sock"))
+
+    async def test_logs_sent_through_tcp_are_saved(self):
+        server = LogServer([FileHandler("served.txt")], port=0, max_batch=20)
+        await self._serve_clients(server, lambda server: SocketHandler(port=server.port, batch_size=7))
+
+    async def test_logs_are_kept_until_server_is_running(self):
+        server = LogServer([FileHandler("served.txt")], port=0)
+        await server.start()
+        port = server.port
+        await server.aclose()
+        handler = SocketHandler(port=port, batch_size=10, capacity=30, flush_interval=0.02, retry_interval=0.02)
+        my_logger = ProfilLogger(handlers=[handler])
+        my_logger.log_many([("error", f"message {number}") for number in range(40)])
+        self.assertEqual(len(handler), 30)
+        self.assertEqual(handler.dropped, 10)
+        async with LogServer([FileHandler("served.txt")], port=port) as server:
+            await self._wait_for_logs(server, 30)
+            await asyncio.to_thread(handler.close)
+        self.assertEqual([log.msg for log in FileHandler("served.txt").read()],
+                         [f"message {number}" for number in range(10, 40)]
+                         + ["dropped 10 logs because of overload (error: 10)"])
+
+    async def test_malformed_frame_closes_only_its_connection(self):
+        async with LogServer([FileHandler("served.txt")], port=0) as server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(b"\x05\x00\x00\x00\x01\x00\x00\x00wrong")
+            self.assertEqual(await asyncio.wait_for(reader.read(), 5), b"")
+            writer.close()
+            await asyncio.to_thread(self._log_with_client, SocketHandler(port=server.port), 1)
+            await self._wait_for_logs(server, 121)
+        self.assertEqual(len(list(FileHandler("served.txt").read())), 121)
+
+    async def test_frame_with_unknown_level_closes_only_its_connection(self):
+        level, msg = "bogus\nlevel".encode(), b"message"
+        record = struct.pack("<qBI", 0, len(level), len(msg)) + level + msg
+        async with LogServer([FileHandler("served.txt")], port=0) as server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(struct.pack("<II", len(record), 1) + record)
+            self.assertEqual(await asyncio.wait_for(reader.read(), 5), b"")
+            writer.close()
+            await asyncio.to_thread(self._log_with_client, SocketHandler(port=server.port), 1)
+            await self._wait_for_logs(server, 121)
+        self.assertEqual([log.level for log in FileHandler("served.txt").read()], ["error"] * 120 + ["critical"])
+
+    async def test_block_policy_waits_for_server(self):
+        server = LogServer([FileHandler("served.txt")], port=0)
+        await server.start()
+        port = server.port
+        await server.aclose()
+        handler = SocketHandler(port=port, batch_size=10, capacity=10, retry_interval=0.02, overload="block")
+        client = asyncio.create_task(asyncio.to_thread(self._log_with_client, handler, 0))
+        await asyncio.sleep(0.1)
+        self.assertFalse(client.done())
+        async with LogServer([FileHandler("served.txt")], port=port) as server:
+            await asyncio.wait_for(client, 5)
+            await self._wait_for_logs(server, 121)
+        self.assertEqual(len(list(FileHandler("served.txt").read())), 121)
+        self.assertEqual(handler.dropped, 0)
+
+    def test_block_policy_drops_logs_after_timeout(self):
+        handler = SocketHandler(port=self._free_port(), capacity=5, retry_interval=0.01, overload="block",
+                                block_timeout=0.05)
+        my_logger = ProfilLogger(handlers=[handler])
+        my_logger.log_many([("error", f"message {number}") for number in range(5)])
+        start = time.monotonic()
+        my_logger.log_many([("error", f"message {number}") for number in range(5, 8)])
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertEqual((len(handler), handler.dropped), (5, 3))
+        handler.close()
+
+    def test_saving_logs_does_not_wait_for_connection(self):
+        handler = SocketHandler(port=self._free_port(), batch_size=1, retry_interval=0.01)
+        attempts = []
+        handler._connect = lambda: attempts.append(1) or time.sleep(0.2) or False
+        my_logger = ProfilLogger(handlers=[handler])
+        start = time.monotonic()
+        for number in range(5):
+            my_logger.error(f"message {number}")
+        self.assertLess(time.monotonic() - start, 0.1, "Logs were sent by the thread saving them")
+        self.assertEqual(len(handler), 5)
+        time.sleep(0.1)
+        self.assertTrue(attempts, "Timer thread didn't try to send logs")
+        handler.close()
+
+    @staticmethod
+    def _free_port():
+        with socket.socket() as free:
+            free.bind(("127.0.0.1", 0))
+            return free.getsockname()[1]
+
+    async def test_full_server_queue_stops_reading_from_clients(self):
+        release = threading.Event()
+        handler = AsyncProfilLoggerTest._blocked_handler(release)
+        async with LogServer([handler], port=0, max_batch=10, max_queue=20) as server:
+            client = SocketHandler(port=server.port, batch_size=10, capacity=1000)
+            await asyncio.to_thread(ProfilLogger(handlers=[client]).log_many,
+                                    [("error", f"message {number}") for number in range(500)])
+            await asyncio.to_thread(client.flush)
+            await asyncio.sleep(0.1)
+            self.assertLessEqual(len(server.logger), 20)
+            self.assertLess(server.received, 500)
+            release.set()
+            await asyncio.to_thread(client.close)
+            await self._wait_for_logs(server, 500)
+        self.assertEqual([log.msg for log in handler.read()], [f"message {number}" for number in range(500)])
+
+    def test_wrong_arguments_raise_errors(self):
+        with self.assertRaises(TypeError):
+            SocketHandler()
+        with self.assertRaises(ValueError):
+            SocketHandler(port=9000, overload="drop_all")
+        with self.assertRaises(ValueError):
+            SocketHandler(port=9000, batch_size=0)
+        with self.assertRaises(ValueError):
+            SocketHandler(port=9000, flush_interval=-1)
+        with self.assertRaises(TypeError):
+            LogServer([FileHandler("served.txt")], port="9000")
+        with self.assertRaises(TypeError):
+            LogServer([])
+
+
 if __name__ == '__main__':
     unittest.main(warnings='ignore')